@@ -0,0 +1,397 @@
+"""
+Ligne de commande de Learning Planner (sans interface graphique).
+Pour les serveurs sans affichage et les tâches planifiées (cron) :
+n'importe jamais customtkinter, tkinter ni plyer.
+
+Utilisation:
+    python -m cli generate --week 2024-03-25 --weeks 4
+    python -m cli generate --range 2024-03-25 2024-04-22 --learner alice --learner bob
+    python -m cli stats --json
+    python -m cli export --output sauvegarde.jsonl
+    python -m cli import sauvegarde.jsonl --replace
+    python -m cli notify-once
+"""
+
+import argparse
+import json
+import sys
+from contextlib import ExitStack, redirect_stdout
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+from config import STREAM_CONFIG
+from database.db_manager import DatabaseManager
+
+# Tables exportées et colonnes acceptées à l'import (ordre du schéma)
+EXPORT_TABLES = {
+    'learning_subjects': ('id', 'name', 'priority', 'last_studied', 'total_hours'),
+    'courses': ('id', 'name', 'day_of_week', 'start_time', 'end_time', 'week_date',
+                'needs_revision'),
+    'homework': ('id', 'subject', 'description', 'due_date', 'due_time', 'preparation_days',
+                 'estimated_sessions', 'status'),
+    'schedule_slots': ('id', 'date', 'start_time', 'end_time', 'activity_type', 'subject',
+                       'description', 'notified')
+}
+
+def _json_default(value):
+    """Sérialise les types renvoyés par les pilotes de base de données"""
+    if isinstance(value, timedelta):
+        # TIME MySQL : pymysql renvoie un timedelta
+        seconds = int(value.total_seconds())
+        return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+def _parse_date(value):
+    """Type argparse : date au format YYYY-MM-DD"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide: {value!r} (format YYYY-MM-DD attendu)")
+
+def _monday(day):
+    """Lundi de la semaine d'une date"""
+    return day - timedelta(days=day.weekday())
+
+def _next_monday():
+    """Lundi de la semaine suivante (comme le bouton 'Générer Planning')"""
+    return _monday(date.today()) + timedelta(days=7)
+
+# ============================================
+# Sous-commandes
+# ============================================
+
+def cmd_generate(args):
+    """
+    Génère le planning d'une ou plusieurs semaines.
+    Avec plusieurs apprenants, la génération passe par BatchPlanner
+    (calcul réparti sur plusieurs processus).
+
+    Returns:
+        dict: Période générée et nombre d'activités (par apprenant)
+    """
+    if args.range:
+        start_date = _monday(args.range[0])
+        weeks = max(1, -(-(args.range[1] - start_date).days // 7))
+    else:
+        start_date = _monday(args.week) if args.week else _next_monday()
+        weeks = args.weeks
+    if not 1 <= weeks <= 520:
+        raise ValueError("Le nombre de semaines doit être compris entre 1 et 520")
+
+    if len(args.learner) > 1:
+        from services.batch_planner import BatchPlanner
+        jobs = [
+            (learner, start_date + timedelta(days=7 * week))
+            for learner in args.learner
+            for week in range(weeks)
+        ]
+        report = BatchPlanner.run(jobs, workers=args.workers)
+        return {'start_date': start_date, 'weeks': weeks, 'batch': report}
+
+    from services.scheduler import Scheduler
+    with ExitStack() as stack:
+        if args.learner:
+            stack.enter_context(DatabaseManager.use_learner(args.learner[0]))
+        count = Scheduler.generate_schedule_range(start_date, weeks=weeks)
+    return {
+        'learner': args.learner[0] if args.learner else None,
+        'start_date': start_date,
+        'weeks': weeks,
+        'entries': count
+    }
+
+def cmd_stats(args):
+    """
+    Rassemble les statistiques des devoirs, de l'apprentissage et du
+    planning de la semaine.
+
+    Returns:
+        dict: Statistiques par domaine
+    """
+    from models.homework import Homework
+    from models.learning import LearningSubject
+    from models.plan_cache import PlanCache
+    from services.scheduler import Scheduler
+
+    week_start = _monday(args.week) if args.week else _monday(date.today())
+    stats = {
+        'homework': Homework.get_statistics(),
+        'learning': LearningSubject.get_statistics(),
+        'week': {'start_date': week_start, 'summary': Scheduler.get_weekly_summary(week_start)},
+        'plan_cache': PlanCache.stats()
+    }
+    if args.queries:
+        stats['queries'] = DatabaseManager.stats()
+
+    if not args.json:
+        print(f"\n📊 Statistiques")
+        homework = stats['homework']
+        print(f"   ✏️  Devoirs: {homework['total']} au total, {homework['pending']} à faire, "
+              f"{homework['in_progress']} en cours, {homework['completed']} terminés, "
+              f"{homework['overdue']} en retard")
+        learning = stats['learning']
+        print(f"   📖 Matières: {learning['total_subjects']}, {learning['total_hours']:.1f}h étudiées, "
+              f"{learning['never_studied']} jamais étudiées")
+        print(f"   📅 Semaine du {week_start}:")
+        for activity_type, values in stats['week']['summary'].items():
+            print(f"      {activity_type}: {values['count']} ({values['hours']}h)")
+        print()
+    return stats
+
+def cmd_export(args):
+    """
+    Exporte les tables en JSON Lines, une ligne par enregistrement :
+    {"table": ..., "row": {...}}. Les lignes sont lues en flux
+    (DatabaseManager.stream_query) : la mémoire reste constante.
+
+    Returns:
+        dict: Nombre de lignes exportées par table
+    """
+    tables = args.tables or list(EXPORT_TABLES)
+    counts = {}
+    if args.json and args.output in (None, '-'):
+        raise ValueError("export --json nécessite --output (la sortie standard reçoit le résumé)")
+
+    with ExitStack() as stack:
+        if args.output and args.output != '-':
+            output = stack.enter_context(open(args.output, 'w', encoding='utf-8'))
+        else:
+            output = sys.__stdout__
+
+        for table in tables:
+            query = f"SELECT {', '.join(EXPORT_TABLES[table])} FROM {table} ORDER BY id"
+            counts[table] = 0
+            for row in DatabaseManager.stream_query(query):
+                output.write(json.dumps(
+                    {'table': table, 'row': row},
+                    default=_json_default, ensure_ascii=False
+                ))
+                output.write('\n')
+                counts[table] += 1
+        output.flush()
+
+    print(f"📤 Export: " + ", ".join(f"{table} {count}" for table, count in counts.items()),
+          file=sys.stderr)
+    return {'output': args.output or '-', 'rows': counts}
+
+def _flush_import(table, columns, rows):
+    """Insère un lot de lignes d'une même table (une requête par lot)"""
+    placeholders = ", ".join(["%s"] * len(columns))
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    DatabaseManager.execute_many(query, rows)
+
+def cmd_import(args):
+    """
+    Importe un fichier produit par export, par lots et dans une seule
+    transaction.
+
+    Sans --replace, les lignes sont ajoutées avec de nouveaux id et les
+    matières déjà présentes (même nom) sont ignorées. Avec --replace,
+    les tables présentes dans le fichier sont vidées au préalable et les
+    id d'origine sont conservés.
+
+    Returns:
+        dict: Lignes importées et ignorées par table
+    """
+    batch_size = STREAM_CONFIG['batch_size']
+    imported = {}
+    skipped = {}
+    pending = {}
+    cleared = set()
+    known_subjects = None
+
+    input_file = open(args.file, encoding='utf-8') if args.file != '-' else sys.stdin
+    try:
+        with DatabaseManager.transaction():
+            for line_number, line in enumerate(input_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    table, row = record['table'], record['row']
+                except (ValueError, KeyError, TypeError):
+                    raise ValueError(f"Ligne {line_number}: enregistrement invalide")
+                if table not in EXPORT_TABLES:
+                    raise ValueError(f"Ligne {line_number}: table inconnue {table!r}")
+
+                if args.replace and table not in cleared:
+                    DatabaseManager.execute_query(f"DELETE FROM {table}")
+                    cleared.add(table)
+
+                if table == 'learning_subjects' and not args.replace:
+                    if known_subjects is None:
+                        known_subjects = {
+                            subject['name'] for subject in DatabaseManager.execute_query(
+                                "SELECT name FROM learning_subjects", fetch=True, cache=False
+                            )
+                        }
+                    if row.get('name') in known_subjects:
+                        skipped[table] = skipped.get(table, 0) + 1
+                        continue
+                    known_subjects.add(row.get('name'))
+
+                columns = tuple(
+                    column for column in EXPORT_TABLES[table]
+                    if column in row and (args.replace or column != 'id')
+                )
+                batch = pending.setdefault((table, columns), [])
+                batch.append(tuple(row[column] for column in columns))
+                imported[table] = imported.get(table, 0) + 1
+                if len(batch) >= batch_size:
+                    _flush_import(table, columns, batch)
+                    pending[(table, columns)] = []
+
+            for (table, columns), batch in pending.items():
+                if batch:
+                    _flush_import(table, columns, batch)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+    print(f"📥 Import: " + (", ".join(f"{table} {count}" for table, count in imported.items())
+                            or "aucune ligne"))
+    if skipped:
+        print(f"   ⏭️  Ignorées (déjà présentes): "
+              + ", ".join(f"{table} {count}" for table, count in skipped.items()))
+    return {'imported': imported, 'skipped': skipped, 'replaced': sorted(cleared)}
+
+def cmd_notify_once(args):
+    """
+    Fait une seule vérification des rappels à envoyer, sans thread ni
+    notification desktop : les rappels sont affichés sur la console
+    (ou renvoyés en JSON) et marqués comme notifiés.
+
+    Returns:
+        dict: Activités rappelées et notifications émises (les activités
+              commençant à la même minute partagent une notification)
+    """
+    from services.notification import NotificationService
+
+    toasts = []
+
+    def console_notify(title, message, timeout):
+        toasts.append({'title': title, 'message': message})
+
+    # --sinks : destinations de NOTIFICATION_CONFIG (fichier, HTTP...)
+    service = NotificationService(notifier=None if args.sinks else console_notify)
+    activities = service.check_once()
+    reminders = [
+        {
+            'id': activity['id'],
+            'date': activity['date'],
+            'start_time': activity['start_time'],
+            'activity_type': activity['activity_type'],
+            'subject': activity['subject']
+        }
+        for activity in activities
+    ]
+    if not activities:
+        print("🔕 Aucun rappel à envoyer")
+    result = {'reminders': reminders, 'notifications': toasts}
+    if args.sinks:
+        result['sinks'] = service.sink_stats()
+    return result
+
+COMMANDS = {
+    'generate': cmd_generate,
+    'stats': cmd_stats,
+    'export': cmd_export,
+    'import': cmd_import,
+    'notify-once': cmd_notify_once
+}
+
+def build_parser():
+    """
+    Construit l'analyseur des arguments de la ligne de commande.
+
+    Returns:
+        argparse.ArgumentParser: Analyseur avec une sous-commande par action
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description="Learning Planner en ligne de commande (sans interface graphique)"
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true',
+                        help="Résultat en JSON sur la sortie standard (messages sur stderr)")
+    common.add_argument('--learner', action='append', default=[],
+                        help="Base de l'apprenant (LEARNER_CONFIG) ; répétable pour generate")
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', parents=[common],
+                                     help="Générer le planning")
+    period = generate.add_mutually_exclusive_group()
+    period.add_argument('--week', type=_parse_date, metavar='DATE',
+                        help="Semaine contenant DATE (défaut: semaine suivante)")
+    period.add_argument('--range', type=_parse_date, nargs=2, metavar=('DEBUT', 'FIN'),
+                        help="Toutes les semaines de DEBUT (inclus) à FIN (exclu)")
+    generate.add_argument('--weeks', type=int, default=1,
+                          help="Nombre de semaines à partir de --week (défaut: 1)")
+    generate.add_argument('--workers', type=int,
+                          help="Processus de calcul avec plusieurs apprenants (défaut: BATCH_CONFIG)")
+
+    stats = subparsers.add_parser('stats', parents=[common], help="Afficher les statistiques")
+    stats.add_argument('--week', type=_parse_date, metavar='DATE',
+                       help="Semaine résumée (défaut: semaine en cours)")
+    stats.add_argument('--queries', action='store_true',
+                       help="Inclure les statistiques des requêtes SQL")
+
+    export = subparsers.add_parser('export', parents=[common],
+                                   help="Exporter les données en JSON Lines")
+    export.add_argument('--output', '-o', metavar='FICHIER',
+                        help="Fichier de sortie (défaut: sortie standard)")
+    export.add_argument('--tables', nargs='+', choices=list(EXPORT_TABLES),
+                        help="Tables à exporter (défaut: toutes)")
+
+    import_parser = subparsers.add_parser('import', parents=[common],
+                                          help="Importer un fichier produit par export")
+    import_parser.add_argument('file', metavar='FICHIER', help="Fichier JSON Lines ('-' = stdin)")
+    import_parser.add_argument('--replace', action='store_true',
+                               help="Vider les tables importées et conserver les id")
+
+    notify = subparsers.add_parser('notify-once', parents=[common],
+                                   help="Envoyer une fois les rappels dus (console)")
+    notify.add_argument('--sinks', action='store_true',
+                        help="Envoyer vers NOTIFICATION_CONFIG['sinks'] au lieu de la console")
+    return parser
+
+def main(argv=None):
+    """
+    Point d'entrée de la ligne de commande.
+
+    Args:
+        argv (list, optional): Arguments (défaut: sys.argv[1:])
+
+    Returns:
+        int: Code de sortie (0 = succès, 1 = erreur)
+    """
+    args = build_parser().parse_args(argv)
+    if args.command != 'generate' and len(args.learner) > 1:
+        print("❌ --learner ne peut être répété qu'avec generate", file=sys.stderr)
+        return 1
+
+    try:
+        with ExitStack() as stack:
+            # En JSON, la sortie standard est réservée au résultat
+            if args.json or args.command == 'export':
+                stack.enter_context(redirect_stdout(sys.stderr))
+            if args.learner and args.command != 'generate':
+                stack.enter_context(DatabaseManager.use_learner(args.learner[0]))
+            result = COMMANDS[args.command](args)
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        DatabaseManager.close_pool()
+
+    if args.json:
+        json.dump(result, sys.stdout, default=_json_default, ensure_ascii=False, indent=2)
+        sys.stdout.write('\n')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
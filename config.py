@@ -1,5 +1,8 @@
 """Configuration de la base de données et paramètres globaux"""
 
+# Backend de stockage : 'mysql' (serveur) ou 'sqlite' (fichier local, sans serveur)
+DB_BACKEND = 'mysql'
+
 # Configuration de la base de données MySQL
 DB_CONFIG = {
     'host': 'localhost',
@@ -9,6 +12,52 @@ DB_CONFIG = {
     'charset': 'utf8mb4'
 }
 
+# Configuration du backend SQLite embarqué (DB_BACKEND = 'sqlite')
+SQLITE_CONFIG = {
+    'path': 'learning_planner.db',  # ':memory:' pour une base temporaire
+    'timeout': 5                    # Attente maximale d'un verrou (secondes)
+}
+
+# Lecture en flux des grandes requêtes (DatabaseManager.stream_query)
+STREAM_CONFIG = {
+    'batch_size': 500  # Lignes récupérées par aller-retour serveur
+}
+
+# Instrumentation des requêtes (DatabaseManager.stats())
+QUERY_STATS_CONFIG = {
+    'enabled': True,
+    'slow_query_ms': 200,   # Journaliser les requêtes plus lentes que X ms
+    'samples': 1000,        # Latences conservées par requête pour p50/p95
+    'log_params': True      # Afficher les paramètres des requêtes lentes
+}
+
+# Cache des résultats de SELECT, invalidé à chaque écriture sur les tables lues
+QUERY_CACHE_CONFIG = {
+    'enabled': True,
+    'max_entries': 256,   # Résultats conservés (les moins utilisés sont évincés)
+    'ttl_seconds': 30     # Durée de vie d'un résultat (écritures externes, CURDATE)
+}
+
+# Pool de connexions partagé (interface + service de notifications)
+POOL_CONFIG = {
+    'min_size': 1,           # Connexions gardées ouvertes en permanence
+    'max_size': 5,           # Connexions simultanées maximum
+    'idle_timeout': 300,     # Fermer une connexion inactive après X secondes
+    'acquire_timeout': 10,   # Attente maximale d'une connexion libre (secondes)
+    'ping_interval': 5       # Vérifier (ping) une connexion inactive depuis X secondes
+}
+
+# Apprenants : une base de données par apprenant (BatchPlanner, DatabaseManager.use_learner)
+LEARNER_CONFIG = {
+    'mysql_database': 'learning_planner_{learner}',   # Base MySQL (schéma à créer)
+    'sqlite_path': 'learners/{learner}.db'            # Fichier SQLite (créé si absent)
+}
+
+# Planification par lots (services/batch_planner.py)
+BATCH_CONFIG = {
+    'workers': None     # Processus de calcul (None = nombre de cœurs)
+}
+
 # Matières d'apprentissage
 LEARNING_SUBJECTS = [
     'Python',
@@ -30,7 +79,10 @@ PLANNING_CONFIG = {
     'session_duration': 90,          # Durée d'une session en minutes
     'break_duration': 15,            # Durée d'une pause en minutes
     'homework_preparation_days': 3,  # Jours avant un devoir pour commencer
-    'revision_threshold_days': 7     # Jours avant de réviser un cours
+    'revision_threshold_days': 7,    # Jours avant de réviser un cours
+    # Surcharges par jour, ex: {'Samedi': {'day_start': '08:00'},
+    #                           'Dimanche': {'day_start': '08:00', 'dinner_break': None}}
+    'weekday_overrides': {}
 }
 
 # Paramètres de notification
@@ -38,5 +90,48 @@ NOTIFICATION_CONFIG = {
     'enabled': True,
     'advance_minutes': 15,  # Notifier X minutes avant
     'sound': True,
-    'timeout': 10  # Durée d'affichage en secondes
-}
\ No newline at end of file
+    'timeout': 10,  # Durée d'affichage en secondes
+    'queue_size': 100,  # Notifications en attente d'envoi au maximum
+    # Destinations des notifications, chacune avec sa limitation de débit :
+    # rate = lots par seconde (None = illimité), burst = lots d'affilée,
+    # batch_size = notifications regroupées en un lot (une seule notification
+    # desktop récapitulative), batch_window_ms = attente pour compléter un lot
+    'sinks': [
+        {'type': 'plyer', 'rate': 0.2, 'burst': 3, 'batch_size': 5, 'batch_window_ms': 500},
+        # Sans affichage (serveur, tests de charge) :
+        # {'type': 'jsonl', 'path': 'notifications.jsonl', 'batch_size': 100, 'batch_window_ms': 50},
+        # {'type': 'http', 'url': 'http://127.0.0.1:8765/notifications', 'timeout': 2,
+        #  'rate': 50, 'burst': 50, 'batch_size': 50, 'batch_window_ms': 20},
+    ],
+    # Suivi des rappels (retard d'envoi, rappels manqués, échecs) :
+    # histogrammes sur les window_seconds dernières secondes, au plus
+    # `samples` mesures ; détail des `traces` derniers créneaux ; fichier
+    # écrit par la tâche de fond notification_stats_dump
+    'stats': {
+        'window_seconds': 3600,
+        'samples': 1000,
+        'traces': 200,
+        'dump_path': 'notification_stats.json'
+    }
+}
+
+# Vue « Planning Semaine » (gui/schedule_viewer.py)
+SCHEDULE_VIEW_CONFIG = {
+    'cache_weeks': 12,     # Semaines mises en forme gardées en mémoire
+    'prefetch_weeks': 1    # Semaines voisines préchargées de chaque côté
+}
+
+# Tâches de fond (services/jobs.py), lancées avec l'application.
+# 'cron' : 'minute heure jour mois jour-de-semaine' ; 'interval' : secondes ;
+# 'jitter' : décalage aléatoire maximal (secondes) ; 'initial_delay' : première
+# exécution X secondes après le lancement
+JOBS_CONFIG = {
+    'enabled': True,
+    'jobs': {
+        'daily_summary': {'cron': '30 7 * * *'},                        # Résumé du jour à 7h30
+        'next_week_generation': {'cron': '0 2 * * *', 'jitter': 600},   # Semaine suivante, chaque nuit
+        'overdue_sweep': {'interval': 3600, 'jitter': 60, 'initial_delay': 30},
+        'cache_warmup': {'cron': '20 2 * * *', 'initial_delay': 5},     # Au lancement et après la génération nocturne
+        'notification_stats_dump': {'interval': 300}                     # Statistiques des rappels en JSON
+    }
+}
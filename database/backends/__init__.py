@@ -0,0 +1,31 @@
+"""Backends de stockage utilisables par DatabaseManager"""
+
+# Colonnes ajoutées après la création de bases existantes : (table, colonne,
+# définition). Chaque backend les ajoute au démarrage si elles manquent.
+ADDED_COLUMNS = (
+    ('homework', 'estimated_sessions', 'INT DEFAULT 1'),
+)
+
+def create_backend(name, database=None):
+    """
+    Instancie le backend demandé dans config.py.
+    L'import est fait à la demande pour ne charger que le pilote utile
+    (pymysql n'est pas nécessaire avec SQLite).
+
+    Args:
+        name (str): 'mysql' ou 'sqlite'
+        database (str, optional): Base à utiliser à la place de celle de
+                                  config.py (nom MySQL ou chemin SQLite)
+
+    Returns:
+        Backend prêt à fournir des connexions
+    """
+    if name == 'mysql':
+        from .mysql import MySQLBackend
+        return MySQLBackend(database)
+    if name == 'sqlite':
+        from .sqlite import SQLiteBackend
+        return SQLiteBackend(database)
+    raise ValueError(f"Backend de base de données inconnu: {name}")
+
+__all__ = ['create_backend', 'ADDED_COLUMNS']
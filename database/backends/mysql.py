@@ -0,0 +1,105 @@
+"""Backend MySQL (serveur) basé sur pymysql et le pool de connexions"""
+
+import pymysql
+from config import DB_CONFIG, POOL_CONFIG
+from database.pool import ConnectionPool
+
+def _ping(conn):
+    """
+    Vérifie qu'une connexion du pool est toujours vivante.
+
+    Returns:
+        bool: True si une reconnexion a été nécessaire
+    """
+    try:
+        conn.ping(reconnect=False)
+        return False
+    except pymysql.Error:
+        conn.ping(reconnect=True)
+        return True
+
+class MySQLBackend:
+    """
+    Fournit des connexions MySQL issues d'un pool partagé entre les threads.
+    Les requêtes sont écrites en dialecte MySQL : aucune traduction.
+    """
+
+    name = 'mysql'
+    Error = pymysql.Error
+
+    def __init__(self, database=None):
+        """
+        Args:
+            database (str, optional): Base à utiliser (défaut: DB_CONFIG['database'])
+        """
+        settings = dict(DB_CONFIG)
+        if database:
+            settings['database'] = database
+        self.pool = ConnectionPool(
+            lambda: pymysql.connect(**settings),
+            validate=_ping,
+            **POOL_CONFIG
+        )
+        self._add_missing_columns()
+
+    def _add_missing_columns(self):
+        """
+        Met à niveau une base créée avant l'ajout de colonnes (ADDED_COLUMNS).
+        Une table absente est ignorée : la base n'a pas encore été créée
+        avec schema.sql.
+        """
+        from database.backends import ADDED_COLUMNS
+        conn = self.pool.acquire()
+        discard = False
+        try:
+            cursor = conn.cursor()
+            for table, column, definition in ADDED_COLUMNS:
+                cursor.execute(
+                    """
+                    SELECT COLUMN_NAME FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                    """,
+                    (table,)
+                )
+                columns = [row[0] for row in cursor.fetchall()]
+                if columns and column not in columns:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                    print(f"🔧 Base mise à niveau: colonne {table}.{column} ajoutée")
+            conn.commit()
+        except pymysql.Error:
+            discard = True
+            raise
+        finally:
+            self.pool.release(conn, discard=discard)
+
+    def acquire(self):
+        """Emprunte une connexion au pool"""
+        return self.pool.acquire()
+
+    def release(self, conn, discard=False):
+        """Rend une connexion au pool (fermée si discard=True)"""
+        self.pool.release(conn, discard=discard)
+
+    def translate(self, query):
+        """Les requêtes sont déjà en dialecte MySQL"""
+        return query
+
+    def cursor(self, conn):
+        """Curseur renvoyant des tuples"""
+        return conn.cursor()
+
+    def dict_cursor(self, conn):
+        """Curseur renvoyant des dictionnaires"""
+        return conn.cursor(pymysql.cursors.DictCursor)
+
+    def stream_cursor(self, conn):
+        """Curseur côté serveur (non bufferisé) renvoyant des dictionnaires"""
+        return conn.cursor(pymysql.cursors.SSDictCursor)
+
+    def close(self):
+        """Ferme toutes les connexions du pool"""
+        self.pool.close_all()
+
+    def stats(self):
+        """Métriques du pool de connexions"""
+        return self.pool.stats()
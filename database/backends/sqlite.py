@@ -0,0 +1,240 @@
+"""Backend SQLite embarqué, sans serveur, avec le même dialecte que MySQL"""
+
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, date, time, timedelta
+from config import SQLITE_CONFIG
+from database.memo import BoundedMemo
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'schema_sqlite.sql')
+
+# ============================================
+# Conversion des types Python <-> SQLite
+# ============================================
+
+def _adapt_timedelta(value):
+    """Convertit un TIME MySQL (timedelta) en 'HH:MM:SS'"""
+    total_seconds = int(value.total_seconds())
+    return f"{total_seconds // 3600:02d}:{(total_seconds % 3600) // 60:02d}:{total_seconds % 60:02d}"
+
+def _parse_time(value):
+    """Parse 'HH:MM' ou 'HH:MM:SS' en objet time"""
+    parts = [int(p) for p in value.split(':')]
+    return time(*parts[:3])
+
+def _parse_date(value):
+    """Parse 'YYYY-MM-DD' (éventuellement suivi d'une heure) en objet date"""
+    return date.fromisoformat(value[:10])
+
+def _parse_datetime(value):
+    """Parse une date/heure ISO en objet datetime"""
+    return datetime.fromisoformat(value)
+
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(' ', 'seconds'))
+sqlite3.register_adapter(time, lambda t: t.isoformat('seconds'))
+sqlite3.register_adapter(timedelta, _adapt_timedelta)
+
+sqlite3.register_converter('DATE', lambda b: _parse_date(b.decode()))
+sqlite3.register_converter('TIME', lambda b: _parse_time(b.decode()))
+sqlite3.register_converter('DATETIME', lambda b: _parse_datetime(b.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda b: _parse_datetime(b.decode()))
+sqlite3.register_converter('BOOLEAN', lambda b: bool(int(b)))
+
+# ============================================
+# Équivalents des fonctions MySQL utilisées par les requêtes
+# ============================================
+
+def _to_datetime(value):
+    """Interprète une date, une heure ou une date/heure stockée en texte"""
+    if value is None:
+        return None
+    value = str(value)
+    if len(value) <= 8 and ':' in value:  # TIME
+        return datetime.combine(date.min, _parse_time(value))
+    if len(value) == 10:  # DATE
+        return datetime.combine(_parse_date(value), time())
+    return _parse_datetime(value)
+
+def _date_add(value, days):
+    """DATE_ADD(date, INTERVAL n DAY)"""
+    if value is None:
+        return None
+    return (_parse_date(str(value)) + timedelta(days=int(days))).isoformat()
+
+def _datediff(first, second):
+    """DATEDIFF(a, b) : nombre de jours entre deux dates"""
+    if first is None or second is None:
+        return None
+    return (_parse_date(str(first)) - _parse_date(str(second))).days
+
+def _curdate():
+    """CURDATE()"""
+    return date.today().isoformat()
+
+def _now():
+    """NOW()"""
+    return datetime.now().isoformat(' ', 'seconds')
+
+_TIMESTAMPDIFF_UNITS = {
+    'SECOND': 1,
+    'MINUTE': 60,
+    'HOUR': 3600,
+    'DAY': 86400
+}
+
+def _timestampdiff(unit, start, end):
+    """TIMESTAMPDIFF(unit, début, fin)"""
+    start, end = _to_datetime(start), _to_datetime(end)
+    if start is None or end is None:
+        return None
+    return int((end - start).total_seconds() // _TIMESTAMPDIFF_UNITS[unit.upper()])
+
+# Réécritures syntaxiques que SQLite ne sait pas analyser
+_INTERVAL_RE = re.compile(r'INTERVAL\s+(\S+)\s+DAY', re.IGNORECASE)
+_TIMESTAMPDIFF_RE = re.compile(r'TIMESTAMPDIFF\(\s*(SECOND|MINUTE|HOUR|DAY)\s*,', re.IGNORECASE)
+
+def _translate(query):
+    """Réécrit une requête MySQL pour SQLite (voir SQLiteBackend.translate)"""
+    translated = query.replace('%s', '?')
+    translated = _INTERVAL_RE.sub(r'\1', translated)
+    return _TIMESTAMPDIFF_RE.sub(r"TIMESTAMPDIFF('\1',", translated)
+
+class SQLiteBackend:
+    """
+    Fournit une connexion SQLite partagée par thread (mode WAL).
+    Traduit les requêtes MySQL de l'application : placeholders %s,
+    DATE_ADD, DATEDIFF, CURDATE, NOW et TIMESTAMPDIFF.
+    """
+
+    name = 'sqlite'
+    Error = sqlite3.Error
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): Fichier de la base (défaut: SQLITE_CONFIG['path'])
+        """
+        path = path or SQLITE_CONFIG['path']
+        self.uri = False
+        if path == ':memory:':
+            # Base en mémoire partagée entre les connexions des threads
+            path = f"file:planner-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self.uri = True
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.timeout = SQLITE_CONFIG.get('timeout', 5)
+
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._translations = BoundedMemo(_translate)
+
+        # Connexion du thread courant : crée le schéma si nécessaire
+        # (et garde la base en mémoire vivante)
+        conn = self.acquire()
+        with open(SCHEMA_PATH, encoding='utf-8') as f:
+            conn.executescript(f.read())
+        self._add_missing_columns(conn)
+        conn.commit()
+
+    @staticmethod
+    def _add_missing_columns(conn):
+        """Met à niveau une base créée avant l'ajout de colonnes (ADDED_COLUMNS)"""
+        from database.backends import ADDED_COLUMNS
+        for table, column, definition in ADDED_COLUMNS:
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            if columns and column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                print(f"🔧 Base mise à niveau: colonne {table}.{column} ajoutée")
+
+    def _connect(self):
+        """Ouvre et configure une nouvelle connexion"""
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            uri=self.uri
+        )
+        if not self.uri:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.create_function('DATE_ADD', 2, _date_add, deterministic=True)
+        conn.create_function('DATEDIFF', 2, _datediff, deterministic=True)
+        conn.create_function('TIMESTAMPDIFF', 3, _timestampdiff, deterministic=True)
+        conn.create_function('CURDATE', 0, _curdate)
+        conn.create_function('NOW', 0, _now)
+        return conn
+
+    def acquire(self):
+        """Retourne la connexion du thread courant (créée au premier appel)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def release(self, conn, discard=False):
+        """La connexion reste attachée au thread sauf si elle est invalide"""
+        if not discard:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def translate(self, query):
+        """
+        Traduit une requête MySQL en SQLite (résultat mis en cache).
+
+        Args:
+            query (str): Requête utilisant %s et les fonctions MySQL
+
+        Returns:
+            str: Requête exécutable par SQLite
+        """
+        return self._translations(query)
+
+    def cursor(self, conn):
+        """Curseur renvoyant des tuples"""
+        return conn.cursor()
+
+    def dict_cursor(self, conn):
+        """Curseur renvoyant des dictionnaires (comme DictCursor)"""
+        cursor = conn.cursor()
+        cursor.row_factory = lambda cur, row: {
+            column[0]: value for column, value in zip(cur.description, row)
+        }
+        return cursor
+
+    def stream_cursor(self, conn):
+        """Les curseurs SQLite lisent déjà les lignes au fur et à mesure"""
+        return self.dict_cursor(conn)
+
+    def close(self):
+        """Ferme toutes les connexions ouvertes par les threads"""
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def stats(self):
+        """Nombre de connexions ouvertes (une par thread)"""
+        with self._lock:
+            return {'connections': len(self._connections), 'path': self.path}
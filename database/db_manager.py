@@ -1,61 +1,435 @@
-"""Gestionnaire de connexion à la base de données MySQL"""
+"""Gestionnaire de connexion à la base de données (MySQL ou SQLite)"""
 
-import pymysql
+import os
+import re
+import threading
+import time
 from contextlib import contextmanager
-from config import DB_CONFIG
+from config import (
+    DB_BACKEND, DB_CONFIG, SQLITE_CONFIG, STREAM_CONFIG, QUERY_STATS_CONFIG, QUERY_CACHE_CONFIG, LEARNER_CONFIG
+)
+from database.backends import create_backend
+from database.query_stats import QueryStats
+from database.query_cache import QueryCache, tables_read, tables_written, is_select
+
+_LEARNER_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
 
 class DatabaseManager:
     """
-    Gère les connexions et opérations avec la base de données MySQL.
+    Gère les connexions et opérations avec la base de données.
     Utilise des context managers pour une gestion sûre des connexions.
+    Le stockage est délégué à un backend choisi dans config.py
+    (DB_BACKEND) : MySQL avec pool de connexions, ou SQLite embarqué.
     """
     
+    _backend = None
+    _backend_lock = threading.Lock()
+    _learner_backends = {}  # Apprenant -> backend de sa base
+    _local = threading.local()  # Connexion de la transaction du thread courant
+    _stats = QueryStats(
+        slow_query_ms=QUERY_STATS_CONFIG['slow_query_ms'],
+        samples=QUERY_STATS_CONFIG['samples'],
+        log_params=QUERY_STATS_CONFIG['log_params']
+    ) if QUERY_STATS_CONFIG['enabled'] else None
+    _cache = QueryCache(
+        max_entries=QUERY_CACHE_CONFIG['max_entries'],
+        ttl=QUERY_CACHE_CONFIG['ttl_seconds']
+    ) if QUERY_CACHE_CONFIG['enabled'] else None
+    
+    @staticmethod
+    def get_backend():
+        """
+        Retourne le backend de stockage, créé au premier appel.
+        
+        Returns:
+            Backend configuré (MySQLBackend ou SQLiteBackend)
+        """
+        backend = getattr(DatabaseManager._local, 'backend', None)
+        if backend is not None:
+            return backend
+        if DatabaseManager._backend is None:
+            with DatabaseManager._backend_lock:
+                if DatabaseManager._backend is None:
+                    DatabaseManager._backend = create_backend(DB_BACKEND)
+        return DatabaseManager._backend
+    
+    @staticmethod
+    def learner_backend(learner):
+        """
+        Retourne le backend de la base d'un apprenant, créé au premier appel
+        à partir des modèles de LEARNER_CONFIG.
+        
+        Args:
+            learner (str): Identifiant de l'apprenant (lettres, chiffres, - et _)
+        
+        Returns:
+            Backend dédié à cet apprenant
+        """
+        learner = str(learner)
+        backend = DatabaseManager._learner_backends.get(learner)
+        if backend is None:
+            database = DatabaseManager._learner_database(learner)
+            with DatabaseManager._backend_lock:
+                backend = DatabaseManager._learner_backends.get(learner)
+                if backend is None:
+                    backend = create_backend(DB_BACKEND, database)
+                    DatabaseManager._learner_backends[learner] = backend
+        return backend
+    
+    @staticmethod
+    def _learner_database(learner):
+        """Base d'un apprenant d'après LEARNER_CONFIG (nom MySQL ou chemin SQLite)"""
+        learner = str(learner)
+        if not _LEARNER_RE.match(learner):
+            raise ValueError(f"Identifiant d'apprenant invalide: {learner!r}")
+        key = 'sqlite_path' if DB_BACKEND == 'sqlite' else 'mysql_database'
+        return LEARNER_CONFIG[key].format(learner=learner)
+    
+    @staticmethod
+    def is_default_database(learner):
+        """
+        Indique si la base d'un apprenant est la base par défaut, celle que
+        lisent l'interface et le service de notifications.
+        
+        Args:
+            learner (str): Identifiant de l'apprenant
+        
+        Returns:
+            bool: True si les deux bases sont les mêmes
+        """
+        database = DatabaseManager._learner_database(learner)
+        if DB_BACKEND == 'sqlite':
+            default = SQLITE_CONFIG['path']
+            return default != ':memory:' and os.path.abspath(database) == os.path.abspath(default)
+        return database == DB_CONFIG['database']
+    
+    @staticmethod
+    @contextmanager
+    def use_learner(learner):
+        """
+        Dirige toutes les requêtes du thread courant vers la base d'un
+        apprenant, le temps du bloc. Les modèles et services s'utilisent
+        sans modification. Le cache de requêtes est contourné (il est
+        commun à toutes les bases).
+        
+        Utilisation:
+            with DatabaseManager.use_learner('alice'):
+                Scheduler.generate_weekly_schedule(monday)
+        """
+        local = DatabaseManager._local
+        if getattr(local, 'conn', None) is not None:
+            raise RuntimeError("Impossible de changer d'apprenant pendant une transaction")
+        backend = DatabaseManager.learner_backend(learner)
+        previous = getattr(local, 'backend', None)
+        local.backend = backend
+        try:
+            yield backend
+        finally:
+            local.backend = previous
+    
+    @staticmethod
+    def close_pool():
+        """Ferme toutes les connexions du backend (à la fermeture de l'application)"""
+        with DatabaseManager._backend_lock:
+            backends = list(DatabaseManager._learner_backends.values())
+            if DatabaseManager._backend:
+                backends.append(DatabaseManager._backend)
+            DatabaseManager._backend = None
+            DatabaseManager._learner_backends = {}
+        for backend in backends:
+            backend.close()
+    
+    @staticmethod
+    def pool_stats():
+        """
+        Retourne les métriques de connexion (taille du pool, attentes, reconnexions).
+        
+        Returns:
+            dict: Métriques du backend, vide s'il n'a pas encore été créé
+        """
+        backend = DatabaseManager._backend
+        return backend.stats() if backend else {}
+    
+    @staticmethod
+    def stats():
+        """
+        Retourne les statistiques d'exécution des requêtes depuis le
+        démarrage (ou le dernier reset_stats) ainsi que celles du pool.
+        
+        Returns:
+            dict: Appels, latences p50/p95/max, lignes et requêtes lentes
+                  par empreinte de requête
+        """
+        stats = DatabaseManager._stats.snapshot() if DatabaseManager._stats else {}
+        stats['connections'] = DatabaseManager.pool_stats()
+        stats['cache'] = DatabaseManager.cache_stats()
+        return stats
+    
+    @staticmethod
+    def cache_stats():
+        """
+        Retourne les compteurs du cache de requêtes.
+        
+        Returns:
+            dict: Succès, échecs, évictions et invalidations (vide si désactivé)
+        """
+        return DatabaseManager._cache.stats() if DatabaseManager._cache else {}
+    
+    @staticmethod
+    def clear_cache():
+        """Vide le cache de requêtes (ex: après une modification externe)"""
+        if DatabaseManager._cache:
+            DatabaseManager._cache.clear()
+    
+    @staticmethod
+    def _invalidate(tables):
+        """
+        Évince du cache les résultats lisant les tables modifiées.
+        Dans une transaction, l'éviction est répétée à sa fin pour écarter
+        les lectures faites par d'autres threads avant le commit.
+        """
+        if not DatabaseManager._cache or not tables:
+            return
+        DatabaseManager._cache.invalidate(tables)
+        written = getattr(DatabaseManager._local, 'written', None)
+        if written is not None:
+            written.update(tables)
+    
+    @staticmethod
+    def dump_stats(path):
+        """
+        Écrit les statistiques des requêtes dans un fichier JSON.
+        
+        Args:
+            path (str): Chemin du fichier à écrire
+        """
+        if DatabaseManager._stats:
+            DatabaseManager._stats.dump_json(path)
+    
+    @staticmethod
+    def reset_stats():
+        """Remet à zéro les statistiques des requêtes"""
+        if DatabaseManager._stats:
+            DatabaseManager._stats.reset()
+    
+    @staticmethod
+    def _record(query, params, started, acquired, rows, error=False):
+        """Transmet la mesure d'une requête à l'instrumentation si active"""
+        if DatabaseManager._stats:
+            DatabaseManager._stats.record(
+                query, params,
+                elapsed=time.perf_counter() - acquired,
+                rows=rows,
+                acquire=acquired - started,
+                error=error
+            )
+    
     @staticmethod
     @contextmanager
     def get_connection():
         """
-        Context manager pour gérer automatiquement les connexions MySQL.
-        Gère commit/rollback automatiquement.
+        Context manager pour emprunter une connexion au backend.
+        Gère commit/rollback automatiquement puis rend la connexion.
+        Dans un bloc transaction(), la connexion de la transaction est
+        réutilisée et le commit est laissé à la transaction.
         
         Utilisation:
             with DatabaseManager.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM table")
         """
-        conn = None
+        conn = getattr(DatabaseManager._local, 'conn', None)
+        if conn is not None:
+            try:
+                yield conn
+            except DatabaseManager.get_backend().Error as e:
+                raise Exception(f"Erreur base de données: {e}")
+            return
+        
+        with DatabaseManager.transaction() as conn:
+            yield conn
+    
+    @staticmethod
+    @contextmanager
+    def transaction():
+        """
+        Ouvre une unité de travail : toutes les requêtes exécutées dans le
+        bloc (y compris par les méthodes des modèles) partagent une seule
+        connexion et un seul commit. En cas d'erreur, tout est annulé.
+        Les blocs imbriqués rejoignent la transaction englobante.
+        
+        Utilisation:
+            with DatabaseManager.transaction():
+                Course.mark_as_revised(1)
+                LearningSubject.update_study_time('Python', 1.5)
+        """
+        local = DatabaseManager._local
+        if getattr(local, 'conn', None) is not None:
+            yield local.conn
+            return
+        
+        backend = DatabaseManager.get_backend()
+        try:
+            conn = backend.acquire()
+        except backend.Error as e:
+            raise Exception(f"Erreur base de données: {e}")
+        
+        local.conn = conn
+        local.written = set()
+        discard = False
         try:
-            conn = pymysql.connect(**DB_CONFIG)
             yield conn
             conn.commit()
-        except pymysql.Error as e:
-            if conn:
-                conn.rollback()
+        except backend.Error as e:
+            discard = not DatabaseManager._safe_rollback(conn)
             raise Exception(f"Erreur base de données: {e}")
+        except BaseException:
+            discard = not DatabaseManager._safe_rollback(conn)
+            raise
         finally:
-            if conn:
-                conn.close()
+            local.conn = None
+            backend.release(conn, discard=discard)
+            if DatabaseManager._cache and local.written:
+                DatabaseManager._cache.invalidate(local.written)
+            local.written = None
+    
+    @staticmethod
+    def in_transaction():
+        """
+        Indique si le thread courant est dans un bloc transaction().
+        
+        Returns:
+            bool: True si une transaction est active
+        """
+        return getattr(DatabaseManager._local, 'conn', None) is not None
     
     @staticmethod
-    def execute_query(query, params=None, fetch=False):
+    def _safe_rollback(conn):
+        """
+        Annule la transaction en cours sans masquer l'erreur d'origine.
+        
+        Returns:
+            bool: True si la connexion est réutilisable
+        """
+        try:
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def execute_query(query, params=None, fetch=False, cache=True):
         """
         Exécute une requête SQL avec paramètres.
+        Les SELECT sont servis par le cache de requêtes quand c'est possible
+        (hors transaction) et toute écriture évince les résultats des
+        tables concernées.
         
         Args:
             query (str): Requête SQL à exécuter
             params (tuple): Paramètres de la requête (optionnel)
             fetch (bool): Si True, retourne les résultats (SELECT)
+            cache (bool): Si False, ne jamais lire ni remplir le cache
         
         Returns:
             list: Résultats si fetch=True
             int: ID de la dernière ligne insérée si fetch=False
         """
+        cache_key = None
+        if (fetch and cache and DatabaseManager._cache
+                and not DatabaseManager.in_transaction()
+                and getattr(DatabaseManager._local, 'backend', None) is None
+                and is_select(query)):
+            cache_key = QueryCache.make_key(query, params)
+            cached = DatabaseManager._cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = DatabaseManager._cache.generation()
+        
+        backend = DatabaseManager.get_backend()
+        started = time.perf_counter()
         with DatabaseManager.get_connection() as conn:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
-            cursor.execute(query, params or ())
-            
-            if fetch:
-                return cursor.fetchall()
-            return cursor.lastrowid
+            acquired = time.perf_counter()
+            try:
+                cursor = backend.dict_cursor(conn)
+                cursor.execute(backend.translate(query), params or ())
+                
+                if fetch:
+                    results = cursor.fetchall()
+                    DatabaseManager._record(query, params, started, acquired, len(results))
+                    if cache_key is not None:
+                        DatabaseManager._cache.put(
+                            cache_key, results, tables_read(query), generation
+                        )
+                    return results
+                DatabaseManager._record(query, params, started, acquired, cursor.rowcount)
+                DatabaseManager._invalidate(tables_written(query))
+                return cursor.lastrowid
+            except Exception:
+                DatabaseManager._record(query, params, started, acquired, 0, error=True)
+                raise
+    
+    @staticmethod
+    def stream_query(query, params=None, batch_size=None):
+        """
+        Exécute un SELECT et renvoie ses lignes au fur et à mesure, via un
+        curseur non bufferisé : la mémoire reste constante quelle que soit
+        la taille de la table.
+        
+        La lecture se fait sur une connexion dédiée, empruntée au backend
+        et rendue quand le générateur est épuisé ou fermé : elle n'est pas
+        celle de la transaction du thread, si bien que les requêtes lancées
+        pendant la lecture restent indépendantes (cache, transactions,
+        use_learner). Avec MySQL, la lecture ne voit donc que les données
+        validées.
+        
+        Args:
+            query (str): Requête SELECT à exécuter
+            params (tuple): Paramètres de la requête (optionnel)
+            batch_size (int): Lignes lues par lot (défaut: STREAM_CONFIG)
+        
+        Yields:
+            dict: Une ligne de résultat
+        """
+        backend = DatabaseManager.get_backend()
+        batch_size = batch_size or STREAM_CONFIG['batch_size']
+        
+        started = time.perf_counter()
+        try:
+            conn = backend.acquire()
+        except backend.Error as e:
+            raise Exception(f"Erreur base de données: {e}")
+        acquired = time.perf_counter()
+        cursor = None
+        count = 0
+        error = False
+        try:
+            cursor = backend.stream_cursor(conn)
+            cursor.execute(backend.translate(query), params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                count += len(rows)
+                yield from rows
+        except backend.Error as e:
+            error = True
+            raise Exception(f"Erreur base de données: {e}")
+        finally:
+            discard = False
+            try:
+                if cursor is not None:
+                    cursor.close()
+            except backend.Error:
+                discard = True
+            # SQLite : une seule connexion par thread, peut-être celle d'une
+            # transaction ouverte pendant la lecture (qu'il ne faut pas annuler)
+            if conn is not getattr(DatabaseManager._local, 'conn', None):
+                # Termine la lecture (instantané MySQL) avant de rendre la connexion
+                discard = not DatabaseManager._safe_rollback(conn) or discard
+            backend.release(conn, discard=discard)
+            # La durée inclut le temps de consommation des lignes
+            DatabaseManager._record(query, params, started, acquired, count, error=error)
     
     @staticmethod
     def execute_many(query, params_list):
@@ -69,9 +443,18 @@ class DatabaseManager:
         Returns:
             int: Nombre de lignes affectées
         """
+        backend = DatabaseManager.get_backend()
+        started = time.perf_counter()
         with DatabaseManager.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.executemany(query, params_list)
+            acquired = time.perf_counter()
+            try:
+                cursor = backend.cursor(conn)
+                cursor.executemany(backend.translate(query), params_list)
+            except Exception:
+                DatabaseManager._record(query, params_list, started, acquired, 0, error=True)
+                raise
+            DatabaseManager._record(query, params_list, started, acquired, cursor.rowcount)
+            DatabaseManager._invalidate(tables_written(query))
             return cursor.rowcount
     
     @staticmethod
@@ -83,8 +466,9 @@ class DatabaseManager:
             bool: True si la connexion réussit
         """
         try:
+            backend = DatabaseManager.get_backend()
             with DatabaseManager.get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = backend.cursor(conn)
                 cursor.execute("SELECT 1")
                 return True
         except Exception as e:
@@ -99,8 +483,9 @@ class DatabaseManager:
         """
         from config import LEARNING_SUBJECTS
         
+        backend = DatabaseManager.get_backend()
         with DatabaseManager.get_connection() as conn:
-            cursor = conn.cursor()
+            cursor = backend.cursor(conn)
             
             # Vérifier si les matières existent déjà
             cursor.execute("SELECT COUNT(*) as count FROM learning_subjects")
@@ -108,7 +493,9 @@ class DatabaseManager:
             
             if result[0] == 0:
                 # Insérer les matières par défaut
-                query = "INSERT INTO learning_subjects (name, priority) VALUES (%s, 1)"
+                query = backend.translate(
+                    "INSERT INTO learning_subjects (name, priority) VALUES (%s, 1)"
+                )
                 for subject in LEARNING_SUBJECTS:
                     cursor.execute(query, (subject,))
                 print(f"✅ {len(LEARNING_SUBJECTS)} matières initialisées")
\ No newline at end of file
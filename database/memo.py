@@ -0,0 +1,33 @@
+"""Mémoïsation bornée des calculs faits sur le texte des requêtes"""
+
+class BoundedMemo:
+    """
+    Mémorise le résultat d'une fonction à un argument (texte d'une
+    requête). Les requêtes des modèles sont constantes, mais celles
+    construites dynamiquement (listes IN, VALUES multiples) sont toutes
+    différentes : la table est vidée entièrement quand elle atteint
+    max_entries, ce qui évite une croissance sans fin sans coût de
+    gestion LRU sur le chemin chaud.
+    """
+
+    def __init__(self, func, max_entries=1024):
+        """
+        Args:
+            func (callable): Fonction pure à mémoriser
+            max_entries (int): Résultats conservés avant de tout vider
+        """
+        self.func = func
+        self.max_entries = max_entries
+        self._values = {}
+
+    def __call__(self, key):
+        value = self._values.get(key)
+        if value is None:
+            value = self.func(key)
+            if len(self._values) >= self.max_entries:
+                self._values.clear()
+            self._values[key] = value
+        return value
+
+    def __len__(self):
+        return len(self._values)
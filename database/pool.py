@@ -0,0 +1,211 @@
+"""Pool de connexions thread-safe partagé par l'interface et les services"""
+
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """Levée quand aucune connexion ne se libère dans le délai imparti"""
+
+
+class ConnectionPool:
+    """
+    Pool borné de connexions réutilisables.
+    Les connexions sont créées à la demande jusqu'à max_size, vérifiées
+    (ping) à la sortie du pool et fermées après une période d'inactivité
+    tant que le pool reste au-dessus de min_size.
+    """
+
+    def __init__(self, factory, min_size=1, max_size=5, idle_timeout=300,
+                 acquire_timeout=10, ping_interval=5, validate=None):
+        """
+        Args:
+            factory (callable): Crée une nouvelle connexion
+            min_size (int): Nombre de connexions conservées en permanence
+            max_size (int): Nombre maximal de connexions ouvertes
+            idle_timeout (float): Secondes d'inactivité avant fermeture
+            acquire_timeout (float): Attente maximale d'une connexion libre
+            ping_interval (float): Inactivité au-delà de laquelle on ping
+            validate (callable): Vérifie/reconnecte une connexion (ping)
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Taille de pool invalide")
+
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.ping_interval = ping_interval
+        self.validate = validate
+
+        self._idle = deque()  # (connexion, instant de retour au pool)
+        self._size = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._metrics = {
+            'acquired': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'reconnects': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0
+        }
+
+        for _ in range(min_size):
+            self._idle.append((self._create(), time.monotonic()))
+            self._size += 1
+
+    def _create(self):
+        """Ouvre une nouvelle connexion physique"""
+        conn = self.factory()
+        with self._cond:
+            self._metrics['created'] += 1
+        return conn
+
+    def _close(self, conn):
+        """Ferme une connexion physique en ignorant les erreurs"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._metrics['closed'] += 1
+
+    def _prune_idle(self, now):
+        """
+        Ferme les connexions inactives depuis trop longtemps.
+        Doit être appelée avec le verrou acquis.
+        """
+        expired = []
+        while (self._idle and self._size > self.min_size
+               and now - self._idle[0][1] > self.idle_timeout):
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            expired.append(conn)
+        return expired
+
+    def acquire(self):
+        """
+        Sort une connexion du pool en attendant si nécessaire.
+
+        Returns:
+            Connexion prête à l'emploi
+
+        Raises:
+            PoolTimeout: Si aucune connexion ne se libère à temps
+        """
+        start = time.monotonic()
+        deadline = start + self.acquire_timeout
+        waited = False
+        conn = None
+        last_used = None
+        expired = []
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise Exception("Le pool de connexions est fermé")
+
+                expired.extend(self._prune_idle(time.monotonic()))
+
+                if self._idle:
+                    # LIFO : la connexion la plus récente est la plus sûre
+                    conn, last_used = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeout(
+                        f"Aucune connexion disponible après {self.acquire_timeout}s "
+                        f"({self.max_size} connexions utilisées)"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+        for old in expired:
+            self._close(old)
+
+        try:
+            if conn is None:
+                conn = self._create()
+            elif (self.validate
+                  and time.monotonic() - last_used >= self.ping_interval):
+                if self.validate(conn):
+                    with self._cond:
+                        self._metrics['reconnects'] += 1
+        except Exception:
+            if conn is not None:
+                self._close(conn)
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        wait = time.monotonic() - start
+        with self._cond:
+            self._metrics['acquired'] += 1
+            self._metrics['wait_total'] += wait
+            self._metrics['wait_max'] = max(self._metrics['wait_max'], wait)
+            if waited:
+                self._metrics['waits'] += 1
+
+        return conn
+
+    def release(self, conn, discard=False):
+        """
+        Remet une connexion dans le pool.
+
+        Args:
+            conn: Connexion obtenue par acquire()
+            discard (bool): Si True, la connexion est fermée (état douteux)
+        """
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+
+        if conn is not None:
+            self._close(conn)
+
+    def close_all(self):
+        """Ferme toutes les connexions inactives et refuse les nouvelles demandes"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for conn in idle:
+            self._close(conn)
+
+    def stats(self):
+        """
+        Retourne l'état et les métriques du pool.
+
+        Returns:
+            dict: Taille, connexions libres et temps d'attente
+        """
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics['size'] = self._size
+            metrics['idle'] = len(self._idle)
+            metrics['in_use'] = self._size - len(self._idle)
+            metrics['max_size'] = self.max_size
+
+        acquired = metrics['acquired']
+        metrics['wait_avg'] = metrics['wait_total'] / acquired if acquired else 0.0
+        return metrics
@@ -0,0 +1,174 @@
+"""Cache LRU + TTL des résultats de SELECT, invalidé par table"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_READ_RE = re.compile(r'\b(?:FROM|JOIN)\s+`?(\w+)`?', re.IGNORECASE)
+_WRITE_RE = re.compile(
+    r'^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE\s+(?:TABLE\s+)?)\s*`?(\w+)`?',
+    re.IGNORECASE
+)
+
+def tables_read(query):
+    """
+    Tables lues par une requête (clauses FROM et JOIN).
+
+    Returns:
+        frozenset: Noms des tables en minuscules
+    """
+    return frozenset(name.lower() for name in _READ_RE.findall(query))
+
+def tables_written(query):
+    """
+    Table modifiée par une requête INSERT/UPDATE/DELETE.
+
+    Returns:
+        frozenset: Nom de la table (vide pour un SELECT)
+    """
+    match = _WRITE_RE.match(query)
+    return frozenset([match.group(1).lower()]) if match else frozenset()
+
+def is_select(query):
+    """Indique si la requête est un SELECT (seul type mis en cache)"""
+    return query.lstrip().upper().startswith('SELECT')
+
+class QueryCache:
+    """
+    Cache des résultats de SELECT indexé par (requête, paramètres).
+    Chaque entrée mémorise les tables lues : une écriture sur l'une de
+    ces tables évince l'entrée. Les entrées expirent après ttl secondes
+    et les moins récemment utilisées sont évincées au-delà de max_entries.
+    """
+
+    def __init__(self, max_entries=256, ttl=30):
+        """
+        Args:
+            max_entries (int): Nombre maximal de résultats conservés
+            ttl (float): Durée de vie d'un résultat en secondes
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # clé -> (expiration, lignes, tables)
+        self._by_table = {}            # table -> ensemble de clés
+        self._generation = 0           # Incrémenté à chaque invalidation
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    @staticmethod
+    def make_key(query, params):
+        """Construit une clé hashable à partir de la requête et des paramètres"""
+        if params is None:
+            params = ()
+        elif isinstance(params, list):
+            params = tuple(params)
+        elif not isinstance(params, tuple):
+            params = (params,)
+        return (query, params)
+
+    def _remove(self, key):
+        """Retire une entrée et ses références (verrou acquis)"""
+        _, _, tables = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def get(self, key):
+        """
+        Cherche un résultat en cache.
+
+        Returns:
+            list: Copie des lignes, ou None si absent/expiré
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            rows = entry[1]
+        return [dict(row) for row in rows]
+
+    def generation(self):
+        """
+        Jeton à prendre avant d'exécuter un SELECT et à passer à put() :
+        un résultat lu pendant une invalidation concurrente n'est pas gardé.
+        """
+        return self._generation
+
+    def put(self, key, rows, tables, generation=None):
+        """
+        Mémorise le résultat d'un SELECT.
+
+        Args:
+            key (tuple): Clé construite par make_key
+            rows (list): Lignes renvoyées
+            tables (frozenset): Tables lues par la requête
+            generation (int): Jeton obtenu par generation() avant la lecture
+        """
+        if not tables:
+            return
+        rows = [dict(row) for row in rows]
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, rows, tables)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, tables):
+        """
+        Évince toutes les entrées qui lisent l'une des tables données.
+
+        Args:
+            tables (iterable): Tables modifiées
+        """
+        with self._lock:
+            self._generation += 1
+            for table in tables:
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+                    self._counters['invalidations'] += 1
+
+    def clear(self):
+        """Vide entièrement le cache"""
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._generation += 1
+
+    def stats(self):
+        """
+        Compteurs du cache.
+
+        Returns:
+            dict: Succès, échecs, évictions, expirations, invalidations et taille
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
@@ -0,0 +1,204 @@
+"""Instrumentation des requêtes SQL : latences par empreinte et requêtes lentes"""
+
+import json
+import os
+import re
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from database.memo import BoundedMemo
+
+# Normalisation des requêtes en empreintes (valeurs littérales retirées)
+_COMMENT_RE = re.compile(r'--[^\n]*')
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|\?')
+_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_CASE_RE = re.compile(r'(WHEN \? THEN \?)(?:\s+WHEN \? THEN \?)+', re.IGNORECASE)
+_VALUES_RE = re.compile(r'(VALUES\s*\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+', re.IGNORECASE)
+_SPACES_RE = re.compile(r'\s+')
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def fingerprint(query):
+    """
+    Normalise une requête pour regrouper ses exécutions : commentaires,
+    littéraux et placeholders sont remplacés, les listes IN (...) et
+    VALUES multiples sont repliées, les espaces sont compactés.
+
+    Args:
+        query (str): Requête SQL
+
+    Returns:
+        str: Empreinte de la requête
+    """
+    normalized = _COMMENT_RE.sub('', query)
+    normalized = _STRING_RE.sub('?', normalized)
+    normalized = _NUMBER_RE.sub('?', normalized)
+    normalized = _PLACEHOLDER_RE.sub('?', normalized)
+    normalized = _LIST_RE.sub('(...)', normalized)
+    normalized = _VALUES_RE.sub(r'\1', normalized)
+    normalized = _CASE_RE.sub(r'\1 ...', normalized)
+    return _SPACES_RE.sub(' ', normalized).strip()
+
+def percentile(sorted_values, ratio):
+    """Percentile par rang le plus proche sur une liste triée"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(ratio * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def find_caller():
+    """
+    Retrouve la méthode (hors package database) à l'origine de la requête.
+
+    Returns:
+        str: Nom qualifié de l'appelant, ex: 'Course.get_all_courses'
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(_PACKAGE_DIR) and 'contextlib' not in filename:
+            code = frame.f_code
+            return getattr(code, 'co_qualname', code.co_name)
+        frame = frame.f_back
+    return '?'
+
+class QueryStats:
+    """
+    Agrège les mesures de chaque requête par empreinte : nombre d'appels,
+    latences (total, p50, p95, max), lignes, temps d'obtention de la
+    connexion et erreurs. Journalise les requêtes dépassant le seuil.
+    """
+
+    def __init__(self, slow_query_ms=200, samples=1000, log_params=True):
+        """
+        Args:
+            slow_query_ms (float): Seuil de requête lente en millisecondes
+            samples (int): Nombre de latences conservées par empreinte
+            log_params (bool): Inclure les paramètres dans le journal
+        """
+        self.slow_query_ms = slow_query_ms
+        self.samples = samples
+        self.log_params = log_params
+        self._lock = threading.Lock()
+        self._entries = {}
+        # Empreintes mémorisées (les requêtes des modèles sont constantes)
+        self._fingerprint = BoundedMemo(fingerprint)
+        self._slow_count = 0
+        self._started_at = datetime.now()
+
+    def record(self, query, params, elapsed, rows=0, acquire=0.0, error=False):
+        """
+        Enregistre une exécution.
+
+        Args:
+            query (str): Requête exécutée
+            params: Paramètres (pour le journal des requêtes lentes)
+            elapsed (float): Durée d'exécution en secondes
+            rows (int): Lignes renvoyées ou affectées
+            acquire (float): Temps d'obtention de la connexion en secondes
+            error (bool): True si la requête a échoué
+        """
+        fp = self._fingerprint(query)
+
+        with self._lock:
+            entry = self._entries.get(fp)
+            if entry is None:
+                entry = {
+                    'calls': 0,
+                    'errors': 0,
+                    'rows': 0,
+                    'total': 0.0,
+                    'max': 0.0,
+                    'acquire_total': 0.0,
+                    'acquire_max': 0.0,
+                    'samples': deque(maxlen=self.samples)
+                }
+                self._entries[fp] = entry
+
+            entry['calls'] += 1
+            entry['rows'] += rows or 0
+            entry['total'] += elapsed
+            entry['max'] = max(entry['max'], elapsed)
+            entry['acquire_total'] += acquire
+            entry['acquire_max'] = max(entry['acquire_max'], acquire)
+            entry['samples'].append(elapsed)
+            if error:
+                entry['errors'] += 1
+
+            slow = elapsed * 1000 >= self.slow_query_ms
+            if slow:
+                self._slow_count += 1
+
+        if slow:
+            self._log_slow(fp, query, params, elapsed)
+
+    def _log_slow(self, fp, query, params, elapsed):
+        """Affiche une requête lente avec ses paramètres et son appelant"""
+        message = f"🐢 Requête lente ({elapsed * 1000:.1f} ms) depuis {find_caller()}: {fp}"
+        if self.log_params and params is not None:
+            if isinstance(params, list):
+                message += f" [{len(params)} lignes de paramètres]"
+            else:
+                message += f" {params!r}"
+        print(message)
+
+    def snapshot(self):
+        """
+        Retourne les statistiques par empreinte, triées par temps total.
+
+        Returns:
+            dict: Résumé global et détail par requête (durées en ms)
+        """
+        with self._lock:
+            items = [
+                (fp, dict(entry, samples=sorted(entry['samples'])))
+                for fp, entry in self._entries.items()
+            ]
+            slow_count = self._slow_count
+
+        queries = []
+        for fp, entry in items:
+            calls = entry['calls']
+            queries.append({
+                'query': fp,
+                'calls': calls,
+                'errors': entry['errors'],
+                'rows': entry['rows'],
+                'total_ms': round(entry['total'] * 1000, 3),
+                'avg_ms': round(entry['total'] * 1000 / calls, 3),
+                'p50_ms': round(percentile(entry['samples'], 0.50) * 1000, 3),
+                'p95_ms': round(percentile(entry['samples'], 0.95) * 1000, 3),
+                'max_ms': round(entry['max'] * 1000, 3),
+                'acquire_avg_ms': round(entry['acquire_total'] * 1000 / calls, 3),
+                'acquire_max_ms': round(entry['acquire_max'] * 1000, 3)
+            })
+        queries.sort(key=lambda q: q['total_ms'], reverse=True)
+
+        return {
+            'since': self._started_at.isoformat(' ', 'seconds'),
+            'total_calls': sum(q['calls'] for q in queries),
+            'total_ms': round(sum(q['total_ms'] for q in queries), 3),
+            'slow_queries': slow_count,
+            'slow_query_ms': self.slow_query_ms,
+            'queries': queries
+        }
+
+    def reset(self):
+        """Efface toutes les mesures"""
+        with self._lock:
+            self._entries.clear()
+            self._slow_count = 0
+            self._started_at = datetime.now()
+
+    def dump_json(self, path):
+        """
+        Écrit les statistiques dans un fichier JSON (pour comparer des exécutions).
+
+        Args:
+            path (str): Chemin du fichier à écrire
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
@@ -33,6 +33,8 @@ CREATE TABLE IF NOT EXISTS homework (
     due_date DATE NOT NULL COMMENT 'Date limite',
     due_time TIME NOT NULL COMMENT 'Heure limite',
     preparation_days INT DEFAULT 3 COMMENT 'Nombre de jours pour préparer',
+    -- Ajoutée au démarrage sur une base existante (database/backends, ADDED_COLUMNS)
+    estimated_sessions INT DEFAULT 1 COMMENT 'Sessions de préparation estimées',
     status ENUM('pending', 'in_progress', 'completed') DEFAULT 'pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_due_date (due_date),
@@ -71,6 +73,19 @@ CREATE TABLE IF NOT EXISTS schedule_slots (
     INDEX idx_notified (notified)
 ) ENGINE=InnoDB COMMENT='Planning détaillé par créneau horaire';
 
+-- ============================================
+-- Empreinte du dernier planning généré par période
+-- (base existante : ré-exécuter ce fichier, la table est créée si absente)
+-- ============================================
+CREATE TABLE IF NOT EXISTS plan_cache (
+    start_date DATE NOT NULL COMMENT 'Lundi de la première semaine',
+    weeks INT NOT NULL COMMENT 'Nombre de semaines planifiées',
+    fingerprint CHAR(64) NOT NULL COMMENT 'SHA-256 des données de planification',
+    entries INT NOT NULL COMMENT 'Nombre d\'activités planifiées',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (start_date, weeks)
+) ENGINE=InnoDB COMMENT='Mémorisation des plannings déjà générés';
+
 -- ============================================
 -- Insertion des matières d'apprentissage par défaut
 -- ============================================
@@ -0,0 +1,113 @@
+-- Schéma SQLite équivalent à schema.sql (backend embarqué)
+-- Appliqué automatiquement par database/backends/sqlite.py à la première connexion.
+-- Les types déclarés (DATE, TIME, DATETIME, BOOLEAN) pilotent la conversion
+-- des valeurs en objets Python, comme avec pymysql.
+
+-- ============================================
+-- Table des cours
+-- ============================================
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL,
+    day_of_week VARCHAR(20) NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    week_date DATE NOT NULL,
+    needs_revision BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_courses_week_date ON courses (week_date);
+CREATE INDEX IF NOT EXISTS idx_courses_day ON courses (day_of_week);
+
+-- ============================================
+-- Table des devoirs
+-- ============================================
+CREATE TABLE IF NOT EXISTS homework (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject VARCHAR(255) NOT NULL,
+    description TEXT,
+    due_date DATE NOT NULL,
+    due_time TIME NOT NULL,
+    preparation_days INT DEFAULT 3,
+    -- Ajoutée au démarrage sur une base existante (database/backends, ADDED_COLUMNS)
+    estimated_sessions INT DEFAULT 1,
+    status VARCHAR(20) DEFAULT 'pending'
+        CHECK (status IN ('pending', 'in_progress', 'completed')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_homework_due_date ON homework (due_date);
+CREATE INDEX IF NOT EXISTS idx_homework_status ON homework (status);
+
+-- ============================================
+-- Table des matières d'apprentissage
+-- ============================================
+CREATE TABLE IF NOT EXISTS learning_subjects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    priority INT DEFAULT 1,
+    last_studied DATETIME,
+    total_hours FLOAT DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_subjects_last_studied ON learning_subjects (last_studied);
+CREATE INDEX IF NOT EXISTS idx_subjects_priority ON learning_subjects (priority);
+
+-- Matières d'apprentissage par défaut (comme schema.sql), insérées
+-- seulement dans une base neuve : le schéma est rejoué à chaque démarrage
+INSERT INTO learning_subjects (name, priority)
+SELECT name, priority FROM (
+    SELECT 'Python' AS name, 1 AS priority
+    UNION ALL SELECT 'HTML', 1
+    UNION ALL SELECT 'CSS', 1
+    UNION ALL SELECT 'PHP', 1
+    UNION ALL SELECT 'MySQL', 1
+    UNION ALL SELECT 'PostgreSQL', 1
+    UNION ALL SELECT 'Math_General', 1
+    UNION ALL SELECT 'Lire_la_Bible', 1
+)
+WHERE NOT EXISTS (SELECT 1 FROM learning_subjects);
+
+-- ============================================
+-- Table des créneaux planifiés
+-- ============================================
+CREATE TABLE IF NOT EXISTS schedule_slots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    activity_type VARCHAR(20) NOT NULL
+        CHECK (activity_type IN ('course', 'homework', 'learning', 'revision')),
+    subject VARCHAR(255) NOT NULL,
+    description TEXT,
+    notified BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_slots_date_time ON schedule_slots (date, start_time);
+CREATE INDEX IF NOT EXISTS idx_slots_activity ON schedule_slots (activity_type);
+CREATE INDEX IF NOT EXISTS idx_slots_notified ON schedule_slots (notified);
+
+-- ============================================
+-- Empreinte du dernier planning généré par période
+-- ============================================
+CREATE TABLE IF NOT EXISTS plan_cache (
+    start_date DATE NOT NULL,
+    weeks INT NOT NULL,
+    fingerprint CHAR(64) NOT NULL,
+    entries INT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (start_date, weeks)
+);
+
+-- ============================================
+-- Table d'historique (optionnel, pour statistiques)
+-- ============================================
+CREATE TABLE IF NOT EXISTS study_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject_name VARCHAR(100) NOT NULL,
+    study_date DATE NOT NULL,
+    duration_minutes INT NOT NULL,
+    activity_type VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_history_date ON study_history (study_date);
+CREATE INDEX IF NOT EXISTS idx_history_subject ON study_history (subject_name);
@@ -0,0 +1,44 @@
+"""Exécution de travaux longs hors du thread de l'interface"""
+
+import queue
+import threading
+
+# Intervalle de lecture du résultat (ms)
+POLL_INTERVAL_MS = 50
+
+def run_in_background(widget, func, on_done=None, on_error=None):
+    """
+    Exécute func dans un thread de travail, puis appelle on_done (ou
+    on_error) dans le thread de l'interface, comme GenerationDialog : le
+    thread ne touche jamais aux widgets, le résultat est lu via after().
+
+    La lecture passe par la fenêtre principale : elle continue même si
+    `widget` est détruit entre-temps (changement de vue).
+
+    Args:
+        widget: Widget appelant
+        func (callable): Travail à exécuter (sans argument)
+        on_done (callable, optional): Appelée avec le résultat de func
+        on_error (callable, optional): Appelée avec l'exception levée
+    """
+    root = widget.winfo_toplevel()
+    results = queue.Queue()
+
+    def work():
+        try:
+            results.put((True, func()))
+        except Exception as e:
+            results.put((False, e))
+
+    def poll():
+        try:
+            succeeded, value = results.get_nowait()
+        except queue.Empty:
+            root.after(POLL_INTERVAL_MS, poll)
+            return
+        callback = on_done if succeeded else on_error
+        if callback is not None:
+            callback(value)
+
+    threading.Thread(target=work, daemon=True).start()
+    root.after(POLL_INTERVAL_MS, poll)
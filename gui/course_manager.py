@@ -4,6 +4,8 @@ import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime, timedelta
 from models.course import Course
+from services.scheduler import Scheduler
+from gui.background import run_in_background
 
 class CourseManager(ctk.CTkFrame):
     """
@@ -251,6 +253,17 @@ class CourseManager(ctk.CTkFrame):
             # Ajouter dans la base de données
             Course.add_course(name, day, start_time, end_time, week_date)
             
+            # Mettre à jour le planning du jour concerné, s'il existe déjà
+            # (en arrière-plan : l'interface reste disponible)
+            dates = Scheduler.affected_dates_for_course(
+                {'week_date': week_date, 'day_of_week': day}
+            )
+            run_in_background(
+                self,
+                lambda: Scheduler.regenerate_days(dates),
+                on_error=self._show_regeneration_error
+            )
+            
             messagebox.showinfo(
                 "✅ Succès",
                 f"Le cours '{name}' a été ajouté avec succès!"
@@ -268,6 +281,14 @@ class CourseManager(ctk.CTkFrame):
                 f"Erreur lors de l'ajout du cours:\n\n{str(e)}"
             )
     
+    def _show_regeneration_error(self, error):
+        """Signale l'échec de la mise à jour du planning après un ajout"""
+        messagebox.showwarning(
+            "⚠️ Planning non mis à jour",
+            f"Le cours est enregistré, mais le planning n'a pas pu être mis à jour:\n\n{error}\n\n"
+            "Regénérez le planning de la semaine concernée."
+        )
+    
     def load_courses(self):
         """Charge et affiche les cours de la semaine"""
         try:
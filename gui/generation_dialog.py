@@ -0,0 +1,130 @@
+"""Fenêtre de progression de la génération du planning"""
+
+import queue
+import threading
+import customtkinter as ctk
+from services.scheduler import Scheduler, GenerationCancelled
+
+# Intervalle de lecture de la file de progression (~60 images/s)
+POLL_INTERVAL_MS = 16
+
+class GenerationDialog(ctk.CTkToplevel):
+    """
+    Lance Scheduler.generate_schedule_range dans un thread de travail et
+    affiche sa progression (barre + jour en cours) sans bloquer l'interface.
+
+    Le thread ne touche jamais aux widgets : il dépose ses messages dans une
+    file que la fenêtre lit toutes les POLL_INTERVAL_MS via after().
+    Le bouton Annuler interrompt la génération entre deux jours, avant toute
+    écriture (la transaction est annulée).
+    """
+
+    def __init__(self, parent, start_date, weeks, on_done, on_error=None, on_cancel=None):
+        """
+        Args:
+            parent: Fenêtre parente
+            start_date (date): Lundi de la première semaine
+            weeks (int): Nombre de semaines à générer
+            on_done (callable): Appelée avec le nombre d'activités planifiées
+            on_error (callable, optional): Appelée avec l'exception en cas d'échec
+            on_cancel (callable, optional): Appelée si l'utilisateur annule
+        """
+        super().__init__(parent)
+
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+
+        self.title("Génération du planning")
+        self.geometry("460x200")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        period = f"Semaine du {start_date.strftime('%d/%m/%Y')}"
+        if weeks > 1:
+            period += f" (+{weeks - 1} semaines suivantes)"
+        ctk.CTkLabel(
+            self,
+            text=f"📅 {period}",
+            font=("Arial", 16, "bold")
+        ).pack(pady=(20, 10), padx=20)
+
+        self.progress_bar = ctk.CTkProgressBar(self, width=400)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(pady=10, padx=20)
+
+        self.status_label = ctk.CTkLabel(self, text="Démarrage...", font=("Arial", 13))
+        self.status_label.pack(pady=5)
+
+        self.cancel_button = ctk.CTkButton(
+            self,
+            text="Annuler",
+            command=self.cancel,
+            fg_color="gray",
+            width=120
+        )
+        self.cancel_button.pack(pady=(5, 15))
+
+        self.worker = threading.Thread(
+            target=self._run, args=(start_date, weeks), daemon=True
+        )
+        self.worker.start()
+        self.after(POLL_INTERVAL_MS, self._poll)
+
+    def _run(self, start_date, weeks):
+        """Thread de travail : génère le planning et publie sa progression"""
+        try:
+            count = Scheduler.generate_schedule_range(
+                start_date, weeks=weeks,
+                progress=lambda step, total, label: self.messages.put(
+                    ('progress', step, total, label)
+                ),
+                cancel=self.cancel_event
+            )
+            self.messages.put(('done', count))
+        except GenerationCancelled:
+            self.messages.put(('cancelled',))
+        except Exception as e:
+            self.messages.put(('error', e))
+
+    def _poll(self):
+        """Applique les messages du thread (thread de l'interface uniquement)"""
+        last_progress = None
+        try:
+            while True:
+                message = self.messages.get_nowait()
+                if message[0] == 'progress':
+                    # Seul le dernier état compte pour l'affichage
+                    last_progress = message
+                else:
+                    self._finish(message)
+                    return
+        except queue.Empty:
+            pass
+
+        if last_progress is not None:
+            _, step, total, label = last_progress
+            self.progress_bar.set(step / total if total else 1)
+            self.status_label.configure(text=label)
+        self.after(POLL_INTERVAL_MS, self._poll)
+
+    def _finish(self, message):
+        """Ferme la fenêtre et prévient l'appelant"""
+        self.destroy()
+        if message[0] == 'done':
+            self.on_done(message[1])
+        elif message[0] == 'cancelled':
+            if self.on_cancel:
+                self.on_cancel()
+        elif self.on_error:
+            self.on_error(message[1])
+
+    def cancel(self):
+        """Demande l'annulation (prise en compte entre deux jours)"""
+        if not self.cancel_event.is_set():
+            self.cancel_event.set()
+            self.cancel_button.configure(state="disabled")
+            self.status_label.configure(text="Annulation en cours...")
@@ -4,6 +4,8 @@ import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime, timedelta
 from models.homework import Homework
+from services.scheduler import Scheduler
+from gui.background import run_in_background
 
 class HomeworkManager(ctk.CTkFrame):
     """
@@ -139,10 +141,26 @@ class HomeworkManager(ctk.CTkFrame):
         
         ctk.CTkLabel(
             prep_frame,
-            text="ℹ️ Nombre de jours avant la date limite pour commencer la préparation",
+            text="Sessions estimées:",
+            font=("Arial", 14)
+        ).grid(row=0, column=2, padx=(20, 10), sticky="w")
+        
+        self.sessions_entry = ctk.CTkEntry(
+            prep_frame,
+            placeholder_text="1",
+            height=40,
+            font=("Arial", 13),
+            width=100
+        )
+        self.sessions_entry.grid(row=0, column=3, sticky="w")
+        self.sessions_entry.insert(0, "1")
+        
+        ctk.CTkLabel(
+            prep_frame,
+            text="ℹ️ Jours avant la date limite pour commencer, et nombre de sessions de travail nécessaires",
             font=("Arial", 11),
             text_color="gray"
-        ).grid(row=0, column=2, sticky="w", padx=20)
+        ).grid(row=1, column=0, columnspan=4, sticky="w", pady=(5, 0))
         
         # Ligne 5: Boutons
         btn_frame = ctk.CTkFrame(form_frame, fg_color="transparent")
@@ -212,6 +230,8 @@ class HomeworkManager(ctk.CTkFrame):
         self.due_date_entry.insert(0, future_date.strftime("%Y-%m-%d"))
         self.due_time_entry.delete(0, 'end')
         self.due_time_entry.insert(0, "18:00")
+        self.sessions_entry.delete(0, 'end')
+        self.sessions_entry.insert(0, "1")
         self.subject_entry.focus()
     
     def add_homework(self):
@@ -223,6 +243,7 @@ class HomeworkManager(ctk.CTkFrame):
             due_date = self.due_date_entry.get().strip()
             due_time = self.due_time_entry.get().strip()
             prep_days_str = self.prep_days_entry.get().strip()
+            sessions_str = self.sessions_entry.get().strip() or "1"
             
             # Validation
             if not all([subject, due_date, due_time]):
@@ -244,6 +265,18 @@ class HomeworkManager(ctk.CTkFrame):
                 )
                 return
             
+            # Valider et convertir le nombre de sessions
+            try:
+                sessions = int(sessions_str)
+                if sessions < 1 or sessions > 20:
+                    raise ValueError("Doit être entre 1 et 20")
+            except ValueError:
+                messagebox.showerror(
+                    "Valeur invalide",
+                    "Le nombre de sessions doit être un nombre entre 1 et 20"
+                )
+                return
+            
             # Valider le format de la date
             try:
                 date_obj = datetime.strptime(due_date, "%Y-%m-%d").date()
@@ -277,14 +310,26 @@ class HomeworkManager(ctk.CTkFrame):
                 description if description else "Pas de description",
                 due_date, 
                 due_time, 
-                prep_days
+                prep_days,
+                sessions
+            )
+            
+            # Mettre à jour les jours de préparation déjà planifiés
+            # (en arrière-plan : l'interface reste disponible)
+            dates = Scheduler.affected_dates_for_homework(
+                {'due_date': due_date, 'preparation_days': prep_days}
+            )
+            run_in_background(
+                self,
+                lambda: Scheduler.regenerate_days(dates),
+                on_error=self._show_regeneration_error
             )
             
             messagebox.showinfo(
                 "✅ Succès",
                 f"Le devoir '{subject}' a été ajouté avec succès!\n\n"
                 f"📅 Date limite: {due_date} à {due_time}\n"
-                f"⏰ Préparation: {prep_days} jours avant"
+                f"⏰ Préparation: {prep_days} jours avant, {sessions} session(s)"
             )
             
             # Réinitialiser le formulaire
@@ -299,6 +344,14 @@ class HomeworkManager(ctk.CTkFrame):
                 f"Erreur lors de l'ajout du devoir:\n\n{str(e)}"
             )
     
+    def _show_regeneration_error(self, error):
+        """Signale l'échec de la mise à jour du planning après un ajout"""
+        messagebox.showwarning(
+            "⚠️ Planning non mis à jour",
+            f"Le devoir est enregistré, mais le planning n'a pas pu être mis à jour:\n\n{error}\n\n"
+            "Regénérez le planning de la semaine concernée."
+        )
+    
     def load_homework(self):
         """Charge et affiche les devoirs"""
         try:
@@ -355,7 +408,8 @@ class HomeworkManager(ctk.CTkFrame):
                 output += f"  📅 Date limite: {due_date.strftime('%d/%m/%Y')} à {due_time}\n"
                 output += f"  ⏳ Temps restant: {days_left} jour(s)\n"
                 output += f"  📝 Description: {hw['description']}\n"
-                output += f"  🔧 Préparation: Commencer {hw['preparation_days']} jours avant\n"
+                output += f"  🔧 Préparation: Commencer {hw['preparation_days']} jours avant"
+                output += f" ({hw.get('estimated_sessions') or 1} session(s))\n"
                 output += f"  📊 Statut: {hw['status'].upper()}\n"
                 output += "-" * 90 + "\n\n"
             
@@ -6,9 +6,10 @@ from datetime import datetime, timedelta
 from gui.course_manager import CourseManager
 from gui.homework_manager import HomeworkManager
 from gui.schedule_viewer import ScheduleViewer
-from services.scheduler import Scheduler
+from gui.generation_dialog import GenerationDialog
 from models.homework import Homework
 from models.learning import LearningSubject
+from services.planning_profile import PlanningProfile
 
 class MainWindow(ctk.CTk):
     """
@@ -32,6 +33,7 @@ class MainWindow(ctk.CTk):
         
         # Variables
         self.current_view = None
+        self.generation_dialog = None
         
         # Créer l'interface
         self.create_sidebar()
@@ -222,7 +224,13 @@ class MainWindow(ctk.CTk):
             font=("Arial", 20, "bold")
         ).grid(row=0, column=0, sticky="w", padx=20, pady=(20, 10))
         
-        guide_text = """
+        profile = PlanningProfile.default()
+        fmt = PlanningProfile.format_minutes
+        breaks_text = ", ".join(
+            f"{fmt(start)}-{fmt(end)}" for start, end in profile.day(0).breaks
+        ) or "aucune"
+
+        guide_text = f"""
 🎯 COMMENT UTILISER LE PLANIFICATEUR
 
 📅 Chaque samedi (pour la semaine suivante):
@@ -245,11 +253,11 @@ class MainWindow(ctk.CTk):
    ✓ Mathématiques        ✓ Lecture de la Bible
 
 ⚡ Fonctionnalités intelligentes:
-   • Priorisation automatique des devoirs urgents (≤3 jours)
-   • Révisions des cours anciens (>7 jours)
-   • Répartition équitable des 8 matières
-   • Respect des pauses repas (12h-13h, 19h-20h)
-   • Créneaux de 1h30 avec pauses de 15 minutes
+   • Priorisation automatique des devoirs urgents (≤{profile.homework_preparation_days} jours)
+   • Révisions des cours anciens (>{profile.revision_threshold_days} jours)
+   • Répartition équitable des matières selon leur priorité
+   • Respect des pauses repas ({breaks_text})
+   • Créneaux de {fmt(profile.session_duration)} avec pauses de {profile.break_duration} minutes
 
 💡 Astuce: Générez un nouveau planning chaque semaine pour rester organisé!
         """
@@ -285,44 +293,76 @@ class MainWindow(ctk.CTk):
         viewer.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
     
     def generate_schedule(self):
-        """Génère le planning de la semaine"""
+        """Génère le planning de la semaine suivante (ou de plusieurs semaines)"""
         self.highlight_button(4)
         
+        # Une seule génération à la fois
+        if self.generation_dialog is not None and self.generation_dialog.winfo_exists():
+            self.generation_dialog.focus()
+            return
+        
         # Calculer le prochain lundi
         today = datetime.now().date()
         days_until_monday = (7 - today.weekday()) % 7
         next_monday = today + timedelta(days=days_until_monday if days_until_monday > 0 else 7)
         
-        # Confirmer avec l'utilisateur
-        response = messagebox.askyesno(
-            "Générer le planning",
-            f"Générer le planning pour la semaine du {next_monday.strftime('%d/%m/%Y')} ?\n\n"
-            "Note: L'ancien planning de cette semaine sera remplacé."
+        # Demander l'horizon (1 = semaine suivante uniquement)
+        dialog = ctk.CTkInputDialog(
+            title="Générer le planning",
+            text=f"Nombre de semaines à générer à partir du {next_monday.strftime('%d/%m/%Y')} (1-52):\n\n"
+                 "Note: L'ancien planning de ces semaines sera remplacé."
         )
+        response = dialog.get_input()
         
-        if not response:
+        if response is None:
             return
         
         try:
-            # Générer le planning
-            count = Scheduler.generate_weekly_schedule(next_monday)
-            
+            weeks = int(response.strip() or "1")
+            if weeks < 1 or weeks > 52:
+                raise ValueError("Doit être entre 1 et 52")
+        except ValueError:
+            messagebox.showerror(
+                "Valeur invalide",
+                "Le nombre de semaines doit être un nombre entre 1 et 52"
+            )
+            return
+        
+        period = f"📅 Semaine du {next_monday.strftime('%d/%m/%Y')}"
+        if weeks > 1:
+            period += f" (+{weeks - 1} semaines suivantes)"
+        
+        def on_done(count):
+            self.generation_dialog = None
             messagebox.showinfo(
                 "✅ Succès",
                 f"Planning généré avec succès!\n\n"
-                f"📅 Semaine du {next_monday.strftime('%d/%m/%Y')}\n"
+                f"{period}\n"
                 f"📊 {count} activités planifiées\n\n"
                 "Consultez 'Planning Semaine' pour voir les détails."
             )
             
             # Afficher le planning
             self.show_schedule()
-            
-        except Exception as e:
+        
+        def on_error(error):
+            self.generation_dialog = None
             messagebox.showerror(
                 "❌ Erreur",
-                f"Erreur lors de la génération du planning:\n\n{str(e)}"
+                f"Erreur lors de la génération du planning:\n\n{str(error)}"
+            )
+        
+        def on_cancel():
+            self.generation_dialog = None
+            messagebox.showinfo(
+                "Génération annulée",
+                "La génération a été annulée.\nLe planning existant n'a pas été modifié."
             )
+        
+        # Générer le planning dans un thread : l'interface reste réactive
+        self.generation_dialog = GenerationDialog(
+            self, next_monday, weeks, on_done, on_error, on_cancel
+        )
     
     def show_statistics(self):
         """Affiche les statistiques détaillées"""
@@ -2,15 +2,43 @@
 
 import customtkinter as ctk
 from datetime import datetime, timedelta
+from config import SCHEDULE_VIEW_CONFIG
 from database.db_manager import DatabaseManager
 from services.scheduler import Scheduler
+from services.planning_profile import PlanningProfile
+from gui.week_cache import WeekCache
 
 class ScheduleViewer(ctk.CTkFrame):
     """
     Affichage détaillé du planning hebdomadaire.
     Permet de naviguer entre les semaines et voir toutes les activités.
+    
+    Les semaines mises en forme sont gardées dans un cache partagé par
+    toutes les vues (WeekCache) ; les semaines voisines de celle affichée
+    sont préchargées en arrière-plan et une semaine regénérée est retirée
+    du cache (Scheduler.subscribe).
     """
     
+    _week_cache = None
+    
+    @classmethod
+    def week_cache(cls):
+        """
+        Cache des semaines, créé et abonné aux changements du planning au
+        premier appel.
+        
+        Returns:
+            WeekCache: Cache partagé par les vues
+        """
+        if cls._week_cache is None:
+            cls._week_cache = WeekCache(
+                ScheduleViewer.build_week,
+                capacity=SCHEDULE_VIEW_CONFIG['cache_weeks'],
+                prefetch_weeks=SCHEDULE_VIEW_CONFIG['prefetch_weeks']
+            )
+            Scheduler.subscribe(cls._week_cache.invalidate)
+        return cls._week_cache
+    
     def __init__(self, parent):
         super().__init__(parent)
         
@@ -99,7 +127,7 @@ class ScheduleViewer(ctk.CTkFrame):
         ctk.CTkButton(
             btn_frame_right,
             text="🔄 Actualiser",
-            command=self.load_schedule,
+            command=self.refresh,
             width=140,
             height=40,
             font=("Arial", 13, "bold"),
@@ -162,55 +190,25 @@ class ScheduleViewer(ctk.CTkFrame):
                  f"au {week_end.strftime('%d/%m/%Y')}"
         )
     
-    def load_schedule(self):
-        """Charge et affiche le planning de la semaine"""
+    def refresh(self):
+        """Recharge la semaine affichée depuis la base (sans aucun cache)"""
+        self.load_schedule(fresh=True)
+    
+    def load_schedule(self, fresh=False):
+        """
+        Charge et affiche le planning de la semaine.
+        
+        Args:
+            fresh (bool): Relire la base sans le cache des semaines ni le
+                          cache de requêtes (bouton Actualiser)
+        """
+        cache = self.week_cache()
         try:
-            # Récupérer les activités de la semaine
-            query = """
-                SELECT * FROM schedule_slots
-                WHERE date >= %s AND date < DATE_ADD(%s, INTERVAL 7 DAY)
-                ORDER BY date, start_time
-            """
-            activities = DatabaseManager.execute_query(
-                query,
-                (self.current_week_start, self.current_week_start),
-                fetch=True
-            )
-            
-            # Effacer le contenu actuel
-            self.schedule_text.delete("1.0", "end")
-            
-            if not activities:
-                self.schedule_text.insert(
-                    "1.0",
-                    "📭 Aucune activité planifiée pour cette semaine.\n\n"
-                    "Pour générer un planning:\n"
-                    "1. Ajoutez vos cours dans 'Gestion des Cours'\n"
-                    "2. Ajoutez vos devoirs dans 'Gestion des Devoirs'\n"
-                    "3. Cliquez sur 'Générer Planning' dans le menu"
-                )
-                self.stats_label.configure(text="")
-                return
-            
-            # Organiser par jour
-            days_data = {}
-            for activity in activities:
-                date = activity['date']
-                if isinstance(date, str):
-                    date = datetime.strptime(date, '%Y-%m-%d').date()
-                
-                date_str = date.strftime('%Y-%m-%d')
-                if date_str not in days_data:
-                    days_data[date_str] = []
-                days_data[date_str].append(activity)
-            
-            # Générer l'affichage
-            output = self._generate_schedule_display(days_data, activities)
-            self.schedule_text.insert("1.0", output)
-            
-            # Mettre à jour les statistiques
-            self._update_statistics(activities)
-            
+            if fresh:
+                week = ScheduleViewer.build_week(self.current_week_start, cache=False)
+                cache.put(self.current_week_start, week)
+            else:
+                week = cache.get(self.current_week_start)
         except Exception as e:
             self.schedule_text.delete("1.0", "end")
             self.schedule_text.insert(
@@ -218,21 +216,88 @@ class ScheduleViewer(ctk.CTkFrame):
                 f"❌ Erreur lors du chargement du planning:\n\n{str(e)}"
             )
             self.stats_label.configure(text="")
+            return
+        
+        # Effacer le contenu actuel
+        self.schedule_text.delete("1.0", "end")
+        self.schedule_text.insert("1.0", week['text'])
+        self.stats_label.configure(text=week['stats'])
+        
+        # Semaines voisines prêtes avant le prochain clic
+        cache.prefetch(self.current_week_start)
     
-    def _generate_schedule_display(self, days_data, activities):
+    @staticmethod
+    def build_week(week_start, cache=True):
+        """
+        Lit et met en forme une semaine (sans toucher aux widgets : appelée
+        aussi par le thread de préchargement).
+        
+        Args:
+            week_start (date): Lundi de la semaine
+            cache (bool): Utiliser le cache de requêtes (QUERY_CACHE_CONFIG)
+        
+        Returns:
+            dict: 'text' (planning détaillé), 'stats' (ligne de statistiques)
+                  et 'count' (nombre d'activités)
+        """
+        # Récupérer les activités de la semaine
+        query = """
+            SELECT * FROM schedule_slots
+            WHERE date >= %s AND date < DATE_ADD(%s, INTERVAL 7 DAY)
+            ORDER BY date, start_time
+        """
+        activities = DatabaseManager.execute_query(
+            query,
+            (week_start, week_start),
+            fetch=True,
+            cache=cache
+        )
+        
+        if not activities:
+            return {
+                'text': "📭 Aucune activité planifiée pour cette semaine.\n\n"
+                        "Pour générer un planning:\n"
+                        "1. Ajoutez vos cours dans 'Gestion des Cours'\n"
+                        "2. Ajoutez vos devoirs dans 'Gestion des Devoirs'\n"
+                        "3. Cliquez sur 'Générer Planning' dans le menu",
+                'stats': "",
+                'count': 0
+            }
+        
+        # Organiser par jour
+        days_data = {}
+        for activity in activities:
+            date = activity['date']
+            if isinstance(date, str):
+                date = datetime.strptime(date, '%Y-%m-%d').date()
+            
+            date_str = date.strftime('%Y-%m-%d')
+            if date_str not in days_data:
+                days_data[date_str] = []
+            days_data[date_str].append(activity)
+        
+        return {
+            'text': ScheduleViewer._generate_schedule_display(week_start, days_data, activities),
+            'stats': ScheduleViewer._statistics_text(activities),
+            'count': len(activities)
+        }
+    
+    @staticmethod
+    def _generate_schedule_display(week_start, days_data, activities):
         """
         Génère l'affichage formaté du planning.
         
         Args:
+            week_start (date): Lundi de la semaine
             days_data (dict): Données organisées par jour
             activities (list): Liste complète des activités
         
         Returns:
             str: Texte formaté pour l'affichage
         """
-        week_end = self.current_week_start + timedelta(days=6)
+        week_end = week_start + timedelta(days=6)
         output = f"📅 PLANNING DÉTAILLÉ DE LA SEMAINE\n"
-        output += f"Du {self.current_week_start.strftime('%d/%m/%Y')} "
+        output += f"Du {week_start.strftime('%d/%m/%Y')} "
         output += f"au {week_end.strftime('%d/%m/%Y')}\n"
         output += "=" * 100 + "\n\n"
         
@@ -256,7 +321,7 @@ class ScheduleViewer(ctk.CTkFrame):
         
         # Afficher jour par jour
         for i in range(7):
-            current_date = self.current_week_start + timedelta(days=i)
+            current_date = week_start + timedelta(days=i)
             date_str = current_date.strftime('%Y-%m-%d')
             day_name = days_names[i]
             
@@ -322,18 +387,22 @@ class ScheduleViewer(ctk.CTkFrame):
         output += "\n" + "=" * 100 + "\n"
         output += "💡 RAPPELS:\n"
         output += "   • Les notifications vous alertent 15 minutes avant chaque activité\n"
-        output += "   • Prenez des pauses régulières de 15 minutes\n"
+        output += f"   • Prenez des pauses régulières de {PlanningProfile.default().break_duration} minutes\n"
         output += "   • Restez hydraté et bien reposé pour un apprentissage optimal\n"
         output += "=" * 100 + "\n"
         
         return output
     
-    def _update_statistics(self, activities):
+    @staticmethod
+    def _statistics_text(activities):
         """
-        Met à jour les statistiques affichées.
+        Construit la ligne de statistiques de la semaine.
         
         Args:
             activities (list): Liste des activités de la semaine
+        
+        Returns:
+            str: Texte des statistiques
         """
         # Compter par type
         counts = {
@@ -378,4 +447,4 @@ class ScheduleViewer(ctk.CTkFrame):
         stats_text = " • ".join(stats_parts)
         stats_text += f" • ⏱️ Total: {total_hours:.1f}h ({len(activities)} activités)"
         
-        self.stats_label.configure(text=stats_text)
\ No newline at end of file
+        return stats_text
\ No newline at end of file
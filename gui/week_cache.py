@@ -0,0 +1,155 @@
+"""Cache des semaines affichées par ScheduleViewer, avec préchargement"""
+
+import queue
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+class WeekCache:
+    """
+    Cache LRU borné des semaines déjà mises en forme, indexé par lundi.
+
+    Après chaque affichage, prefetch() confie les semaines voisines à un
+    thread de travail : passer à la semaine précédente ou suivante ne
+    fait alors plus aucune requête sur le thread de l'interface. Le thread
+    ne touche pas aux widgets, il ne fait qu'appeler `loader`.
+
+    invalidate() retire les semaines d'une période regénérée (abonnement
+    Scheduler) ; un préchargement en cours au moment de l'invalidation
+    est abandonné pour ne pas remettre en cache une semaine périmée.
+    """
+
+    def __init__(self, loader, capacity=12, prefetch_weeks=1):
+        """
+        Args:
+            loader (callable): Fonction (lundi) -> semaine mise en forme,
+                               appelable depuis n'importe quel thread
+            capacity (int): Semaines conservées au maximum
+            prefetch_weeks (int): Semaines préchargées de chaque côté
+        """
+        self.loader = loader
+        self.capacity = max(1, capacity)
+        self.prefetch_weeks = prefetch_weeks
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Incrémenté à chaque invalidation : un chargement commencé avant est ignoré
+        self._generation = 0
+        self._queue = queue.Queue()
+        self._queued = set()
+        self._thread = None
+        self._counters = {'hits': 0, 'misses': 0, 'prefetched': 0, 'invalidated': 0}
+
+    def get(self, week_start):
+        """
+        Renvoie une semaine, chargée immédiatement si elle n'est pas en cache.
+
+        Args:
+            week_start (date): Lundi de la semaine
+
+        Returns:
+            Semaine mise en forme (résultat de `loader`)
+        """
+        with self._lock:
+            if week_start in self._entries:
+                self._entries.move_to_end(week_start)
+                self._counters['hits'] += 1
+                return self._entries[week_start]
+            self._counters['misses'] += 1
+            generation = self._generation
+        week = self.loader(week_start)
+        self._store(week_start, week, generation)
+        return week
+
+    def put(self, week_start, week):
+        """
+        Remplace une semaine (relue par l'appelant, ex: Actualiser).
+
+        Args:
+            week_start (date): Lundi de la semaine
+            week: Semaine mise en forme
+        """
+        with self._lock:
+            generation = self._generation
+        self._store(week_start, week, generation)
+
+    def prefetch(self, week_start):
+        """
+        Précharge en arrière-plan les semaines voisines absentes du cache.
+
+        Args:
+            week_start (date): Lundi de la semaine affichée
+        """
+        with self._lock:
+            for offset in range(1, self.prefetch_weeks + 1):
+                for neighbour in (week_start + timedelta(days=7 * offset),
+                                  week_start - timedelta(days=7 * offset)):
+                    if neighbour in self._entries or neighbour in self._queued:
+                        continue
+                    self._queued.add(neighbour)
+                    self._queue.put(neighbour)
+            if self._thread is None and self._queued:
+                self._thread = threading.Thread(
+                    target=self._run, name="week-prefetch", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        """Thread de préchargement"""
+        while True:
+            week_start = self._queue.get()
+            with self._lock:
+                generation = self._generation
+                cached = week_start in self._entries
+            try:
+                if not cached:
+                    self._store(week_start, self.loader(week_start), generation, prefetched=True)
+            except Exception as e:
+                print(f"⚠️  Préchargement de la semaine du {week_start} impossible: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(week_start)
+
+    def _store(self, week_start, week, generation, prefetched=False):
+        """Ajoute une semaine si aucune invalidation n'a eu lieu pendant son chargement"""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[week_start] = week
+            self._entries.move_to_end(week_start)
+            if prefetched:
+                self._counters['prefetched'] += 1
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, start_date=None, end_date=None):
+        """
+        Retire les semaines qui recoupent une période (abonnement Scheduler).
+
+        Args:
+            start_date (date, optional): Premier jour modifié (défaut: tout)
+            end_date (date, optional): Fin de la période modifiée (exclue)
+        """
+        with self._lock:
+            self._generation += 1
+            if start_date is None or end_date is None:
+                stale = list(self._entries)
+            else:
+                stale = [
+                    week_start for week_start in self._entries
+                    if week_start < end_date and week_start + timedelta(days=7) > start_date
+                ]
+            for week_start in stale:
+                del self._entries[week_start]
+            self._counters['invalidated'] += len(stale)
+
+    def stats(self):
+        """
+        Compteurs du cache.
+
+        Returns:
+            dict: Succès, échecs, semaines préchargées, invalidées et en cache
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        return stats
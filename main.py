@@ -7,7 +7,10 @@ import sys
 import customtkinter as ctk
 from tkinter import messagebox
 from gui.main_window import MainWindow
+from gui.schedule_viewer import ScheduleViewer
 from services.notification import NotificationService
+from services.jobs import MaintenanceJobs
+from config import JOBS_CONFIG
 from database.db_manager import DatabaseManager
 
 def check_database_connection():
@@ -90,6 +93,14 @@ def main():
         else:
             print("⚠️ Les notifications ne fonctionnent pas correctement")
         
+        # Démarrer les tâches de fond (résumé du jour, génération nocturne...)
+        jobs = None
+        if JOBS_CONFIG['enabled']:
+            jobs = MaintenanceJobs.create_scheduler(
+                notification_service, week_cache=ScheduleViewer.week_cache()
+            )
+            jobs.start()
+        
         print()
         print("=" * 60)
         print("✅ Application lancée avec succès!")
@@ -109,10 +120,15 @@ def main():
         # Lancer la boucle principale de l'interface
         app.mainloop()
         
-        # Arrêter les notifications à la fermeture
+        # Arrêter les tâches de fond et les notifications à la fermeture
+        if jobs is not None:
+            jobs.stop()
         print("\n🔕 Arrêt du service de notifications...")
         notification_service.stop()
         
+        # Libérer les connexions du pool
+        DatabaseManager.close_pool()
+        
         print("👋 Application fermée. À bientôt!")
         
     except Exception as e:
@@ -3,5 +3,6 @@
 from .course import Course
 from .homework import Homework
 from .learning import LearningSubject
+from .plan_cache import PlanCache
 
-__all__ = ['Course', 'Homework', 'LearningSubject']
\ No newline at end of file
+__all__ = ['Course', 'Homework', 'LearningSubject', 'PlanCache']
\ No newline at end of file
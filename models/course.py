@@ -52,6 +52,27 @@ class Course:
             query, (week_start_date, week_start_date), fetch=True
         )
     
+    @staticmethod
+    def get_courses_between(start_date, end_date):
+        """
+        Récupère tous les cours d'une période en une seule requête.
+        
+        Args:
+            start_date (date): Premier jour de la période (inclus)
+            end_date (date): Fin de la période (exclue)
+        
+        Returns:
+            list: Liste des cours de la période
+        """
+        query = """
+            SELECT * FROM courses 
+            WHERE week_date >= %s AND week_date < %s
+            ORDER BY week_date, start_time
+        """
+        return DatabaseManager.execute_query(
+            query, (start_date, end_date), fetch=True
+        )
+    
     @staticmethod
     def get_all_courses():
         """
@@ -63,6 +84,20 @@ class Course:
         query = "SELECT * FROM courses ORDER BY week_date DESC, start_time"
         return DatabaseManager.execute_query(query, fetch=True)
     
+    @staticmethod
+    def stream_all_courses(batch_size=None):
+        """
+        Parcourt tous les cours sans les charger en mémoire d'un coup.
+        
+        Args:
+            batch_size (int, optional): Lignes lues par lot
+        
+        Yields:
+            dict: Un cours
+        """
+        query = "SELECT * FROM courses ORDER BY week_date DESC, start_time"
+        return DatabaseManager.stream_query(query, batch_size=batch_size)
+    
     @staticmethod
     def get_courses_for_revision():
         """
@@ -93,6 +128,20 @@ class Course:
         query = "UPDATE courses SET needs_revision = TRUE WHERE id = %s"
         DatabaseManager.execute_query(query, (course_id,))
     
+    @staticmethod
+    def mark_many_as_revised(course_ids):
+        """
+        Marque plusieurs cours comme révisés en une seule requête.
+        
+        Args:
+            course_ids (list): IDs des cours
+        """
+        if not course_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(course_ids))
+        query = f"UPDATE courses SET needs_revision = TRUE WHERE id IN ({placeholders})"
+        DatabaseManager.execute_query(query, tuple(course_ids))
+    
     @staticmethod
     def delete_course(course_id):
         """
@@ -10,7 +10,8 @@ class Homework:
     """
     
     @staticmethod
-    def add_homework(subject, description, due_date, due_time, preparation_days=3):
+    def add_homework(subject, description, due_date, due_time, preparation_days=3,
+                     estimated_sessions=1):
         """
         Ajoute un nouveau devoir dans la base de données.
         
@@ -20,17 +21,20 @@ class Homework:
             due_date (str): Date limite au format YYYY-MM-DD
             due_time (str): Heure limite au format HH:MM
             preparation_days (int): Nombre de jours pour préparer (défaut: 3)
+            estimated_sessions (int): Sessions de préparation estimées (défaut: 1)
         
         Returns:
             int: ID du devoir créé
         """
         query = """
             INSERT INTO homework 
-            (subject, description, due_date, due_time, preparation_days, status)
-            VALUES (%s, %s, %s, %s, %s, 'pending')
+            (subject, description, due_date, due_time, preparation_days,
+             estimated_sessions, status)
+            VALUES (%s, %s, %s, %s, %s, %s, 'pending')
         """
         return DatabaseManager.execute_query(
-            query, (subject, description, due_date, due_time, preparation_days)
+            query, (subject, description, due_date, due_time, preparation_days,
+                    estimated_sessions)
         )
     
     @staticmethod
@@ -62,6 +66,23 @@ class Homework:
         """
         return DatabaseManager.execute_query(query, fetch=True)
     
+    @staticmethod
+    def stream_all_homework(batch_size=None):
+        """
+        Parcourt tous les devoirs sans les charger en mémoire d'un coup.
+        
+        Args:
+            batch_size (int, optional): Lignes lues par lot
+        
+        Yields:
+            dict: Un devoir
+        """
+        query = """
+            SELECT * FROM homework 
+            ORDER BY due_date DESC, due_time DESC
+        """
+        return DatabaseManager.stream_query(query, batch_size=batch_size)
+    
     @staticmethod
     def get_urgent_homework(days_threshold=3):
         """
@@ -83,6 +104,31 @@ class Homework:
         """
         return DatabaseManager.execute_query(query, (days_threshold,), fetch=True)
     
+    @staticmethod
+    def get_homework_to_prepare_between(start_date, end_date, preparation_days):
+        """
+        Récupère les devoirs non terminés, dus à partir d'une date, dont
+        la fenêtre de préparation commence avant la fin d'une période.
+        
+        Args:
+            start_date (date): Première échéance retenue (incluse)
+            end_date (date): Fin de la période (exclue)
+            preparation_days (int): Fenêtre des devoirs sans preparation_days
+        
+        Returns:
+            list: Liste des devoirs à préparer pendant la période
+        """
+        query = """
+            SELECT * FROM homework 
+            WHERE status != 'completed' 
+            AND due_date >= %s AND due_date >= CURDATE()
+            AND DATEDIFF(due_date, %s) < COALESCE(preparation_days, %s)
+            ORDER BY due_date ASC, due_time ASC
+        """
+        return DatabaseManager.execute_query(
+            query, (start_date, end_date, preparation_days), fetch=True
+        )
+    
     @staticmethod
     def get_homework_needing_preparation():
         """
@@ -157,7 +203,8 @@ class Homework:
     
     @staticmethod
     def update_homework(homework_id, subject=None, description=None, 
-                       due_date=None, due_time=None, preparation_days=None):
+                       due_date=None, due_time=None, preparation_days=None,
+                       estimated_sessions=None):
         """
         Met à jour les informations d'un devoir.
         
@@ -168,6 +215,7 @@ class Homework:
             due_date (str, optional): Nouvelle date limite
             due_time (str, optional): Nouvelle heure limite
             preparation_days (int, optional): Nouveau nombre de jours de préparation
+            estimated_sessions (int, optional): Nouveau nombre de sessions estimées
         """
         updates = []
         params = []
@@ -187,6 +235,9 @@ class Homework:
         if preparation_days:
             updates.append("preparation_days = %s")
             params.append(preparation_days)
+        if estimated_sessions:
+            updates.append("estimated_sessions = %s")
+            params.append(estimated_sessions)
         
         if updates:
             params.append(homework_id)
@@ -19,10 +19,27 @@ class LearningSubject:
         """
         query = """
             SELECT * FROM learning_subjects 
-            ORDER BY priority DESC, last_studied ASC NULLS FIRST
+            ORDER BY priority DESC, last_studied IS NULL DESC, last_studied ASC
         """
         return DatabaseManager.execute_query(query, fetch=True)
     
+    @staticmethod
+    def stream_all_subjects(batch_size=None):
+        """
+        Parcourt toutes les matières sans les charger en mémoire d'un coup.
+        
+        Args:
+            batch_size (int, optional): Lignes lues par lot
+        
+        Yields:
+            dict: Une matière
+        """
+        query = """
+            SELECT * FROM learning_subjects 
+            ORDER BY priority DESC, last_studied IS NULL DESC, last_studied ASC
+        """
+        return DatabaseManager.stream_query(query, batch_size=batch_size)
+    
     @staticmethod
     def get_subject_by_name(name):
         """
@@ -56,6 +73,39 @@ class LearningSubject:
         """
         DatabaseManager.execute_query(query, (hours, subject_name))
     
+    @staticmethod
+    def add_study_time_bulk(hours_by_subject):
+        """
+        Ajoute du temps d'étude à plusieurs matières en une seule requête.
+        Équivaut à un update_study_time par matière, sans aller-retour
+        supplémentaire.
+        
+        Args:
+            hours_by_subject (dict): Heures à ajouter par nom de matière
+        
+        Returns:
+            int: Nombre de matières mises à jour
+        """
+        if not hours_by_subject:
+            return 0
+        
+        names = list(hours_by_subject)
+        cases = " ".join("WHEN %s THEN %s" for _ in names)
+        placeholders = ", ".join(["%s"] * len(names))
+        query = f"""
+            UPDATE learning_subjects 
+            SET last_studied = NOW(), 
+                total_hours = total_hours + CASE name {cases} ELSE 0 END
+            WHERE name IN ({placeholders})
+        """
+        params = []
+        for name in names:
+            params.extend((name, hours_by_subject[name]))
+        params.extend(names)
+        
+        DatabaseManager.execute_query(query, tuple(params))
+        return len(names)
+    
     @staticmethod
     def get_least_studied(limit=8):
         """
@@ -78,6 +128,22 @@ class LearningSubject:
         """
         return DatabaseManager.execute_query(query, (limit,), fetch=True)
     
+    @staticmethod
+    def get_subject_states():
+        """
+        Récupère l'état de toutes les matières pour la répartition des
+        sessions. Pas de tri ni de limite : le planificateur range les
+        matières dans un tas, ce qui évite un ORDER BY sur toute la table.
+        
+        Returns:
+            list: Matières (id, name, priority, total_hours, last_studied)
+        """
+        query = """
+            SELECT id, name, priority, total_hours, last_studied
+            FROM learning_subjects
+        """
+        return DatabaseManager.execute_query(query, fetch=True)
+    
     @staticmethod
     def get_most_studied(limit=5):
         """
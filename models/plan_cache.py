@@ -0,0 +1,127 @@
+"""Modèle pour la mémorisation des plannings déjà générés"""
+
+import hashlib
+import json
+import threading
+from database.db_manager import DatabaseManager
+
+class PlanCache:
+    """
+    Empreinte (SHA-256) des données ayant servi au dernier planning de
+    chaque période. Si les données n'ont pas changé, la génération peut
+    être court-circuitée sans toucher à schedule_slots.
+    """
+
+    _lock = threading.Lock()
+    _counters = {'hits': 0, 'misses': 0, 'stores': 0, 'errors': 0}
+
+    @staticmethod
+    def fingerprint(*parts):
+        """
+        Calcule l'empreinte d'un ensemble de données.
+
+        Args:
+            *parts: Listes de lignes (dict), valeurs ou objets sérialisables
+
+        Returns:
+            str: Empreinte hexadécimale sur 64 caractères
+        """
+        payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _count(name):
+        """Incrémente un compteur"""
+        with PlanCache._lock:
+            PlanCache._counters[name] += 1
+
+    @staticmethod
+    def lookup(start_date, weeks, fingerprint):
+        """
+        Cherche un planning déjà généré avec la même empreinte.
+
+        Args:
+            start_date (date): Lundi de la première semaine
+            weeks (int): Nombre de semaines
+            fingerprint (str): Empreinte des données actuelles
+
+        Returns:
+            int: Nombre d'activités du planning mémorisé, ou None si absent/différent
+        """
+        query = """
+            SELECT fingerprint, entries FROM plan_cache
+            WHERE start_date = %s AND weeks = %s
+        """
+        try:
+            results = DatabaseManager.execute_query(
+                query, (start_date, weeks), fetch=True, cache=False
+            )
+        except Exception as e:
+            # Table absente (base créée avant plan_cache) : simple échec de cache
+            print(f"⚠️  Cache de planning indisponible: {e}")
+            PlanCache._count('errors')
+            PlanCache._count('misses')
+            return None
+
+        if results and results[0]['fingerprint'] == fingerprint:
+            PlanCache._count('hits')
+            return results[0]['entries']
+        PlanCache._count('misses')
+        return None
+
+    @staticmethod
+    def store(start_date, weeks, fingerprint, entries):
+        """
+        Mémorise l'empreinte du planning qui vient d'être écrit.
+
+        Args:
+            start_date (date): Lundi de la première semaine
+            weeks (int): Nombre de semaines
+            fingerprint (str): Empreinte des données après écriture
+            entries (int): Nombre d'activités planifiées
+        """
+        query = """
+            REPLACE INTO plan_cache (start_date, weeks, fingerprint, entries)
+            VALUES (%s, %s, %s, %s)
+        """
+        try:
+            DatabaseManager.execute_query(query, (start_date, weeks, fingerprint, entries))
+            PlanCache._count('stores')
+        except Exception as e:
+            print(f"⚠️  Cache de planning indisponible: {e}")
+            PlanCache._count('errors')
+
+    @staticmethod
+    def invalidate(start_date=None, end_date=None):
+        """
+        Oublie les plannings mémorisés (tous, ou ceux qui commencent dans
+        une période).
+
+        Args:
+            start_date (date, optional): Premier lundi concerné (inclus)
+            end_date (date, optional): Fin de la période (exclue)
+        """
+        if start_date is None:
+            query, params = "DELETE FROM plan_cache", None
+        else:
+            query = "DELETE FROM plan_cache WHERE start_date >= %s AND start_date < %s"
+            params = (start_date, end_date)
+        try:
+            DatabaseManager.execute_query(query, params)
+        except Exception as e:
+            print(f"⚠️  Cache de planning indisponible: {e}")
+            PlanCache._count('errors')
+
+    @staticmethod
+    def stats():
+        """
+        Compteurs du cache de planning depuis le lancement.
+
+        Returns:
+            dict: Succès, échecs, écritures, erreurs et taux de succès
+        """
+        with PlanCache._lock:
+            stats = dict(PlanCache._counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
@@ -1,6 +1,6 @@
 """Package des services métier"""
 
-from .scheduler import Scheduler
+from .scheduler import Scheduler, GenerationCancelled
 from .notification import NotificationService
 
-__all__ = ['Scheduler', 'NotificationService']
\ No newline at end of file
+__all__ = ['Scheduler', 'GenerationCancelled', 'NotificationService']
\ No newline at end of file
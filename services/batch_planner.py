@@ -0,0 +1,254 @@
+"""Planification par lots pour plusieurs apprenants, répartie sur plusieurs processus"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from config import BATCH_CONFIG
+from database.db_manager import DatabaseManager
+from models.plan_cache import PlanCache
+from services import planner
+from services.planning_profile import PlanningProfile
+from services.scheduler import Scheduler
+
+def _plan_job(payload):
+    """
+    Planifie les semaines d'un apprenant dans un processus de calcul (aucune E/S).
+
+    Args:
+        payload (tuple): (index, suites (lundi, semaines), cours, devoirs,
+                         révisions, matières, profil)
+
+    Returns:
+        tuple: (index, un PlanResult par suite, durée du calcul en secondes)
+    """
+    index, runs, courses, homework, revisions, subjects, profile = payload
+    started = time.perf_counter()
+    plans = planner.plan_runs(runs, courses, homework, revisions, subjects, profile)
+    return index, plans, time.perf_counter() - started
+
+class BatchPlanner:
+    """
+    Génère le planning d'une liste de couples (apprenant, semaine).
+
+    1. Les données de chaque apprenant sont lues en une requête par table
+       couvrant toutes ses semaines.
+    2. Les semaines d'un même apprenant forment une tâche : ses suites de
+       semaines consécutives sont planifiées dans l'ordre avec un seul
+       état (planner.plan_runs : devoirs et équilibre des matières
+       continus d'une suite à l'autre), et les tâches sont réparties sur
+       un ProcessPoolExecutor.
+    3. Chaque résultat est écrit dès son arrivée dans la base de
+       l'apprenant (SlotWriter : insertions groupées, seules les
+       différences sont écrites), pendant que les autres tâches se
+       calculent, quel que soit l'ordre de fin des tâches. PlanCache est
+       invalidé sur ces semaines ; les abonnés de Scheduler (interface,
+       notifications) ne sont prévenus que si la base de l'apprenant est
+       la base par défaut, la seule qu'ils lisent.
+
+    Chaque apprenant a sa propre base (voir LEARNER_CONFIG et
+    DatabaseManager.use_learner). Le résultat d'une tâche est celui que
+    donnerait Scheduler.generate_schedule_range sur les mêmes semaines.
+
+    Utilisation:
+        report = BatchPlanner.run([('alice', monday), ('bob', monday)])
+    """
+
+    @staticmethod
+    def run(jobs, workers=None):
+        """
+        Exécute un lot de planifications.
+
+        Args:
+            jobs (list): Couples (apprenant, lundi de la semaine)
+            workers (int, optional): Processus de calcul (défaut: BATCH_CONFIG)
+
+        Returns:
+            dict: Durées globales et détail par suite de semaines (apprenant,
+                  première semaine, nombre de semaines, lecture, calcul et
+                  écriture en ms, lignes écrites)
+        """
+        workers = workers or BATCH_CONFIG['workers'] or os.cpu_count() or 1
+        profile = PlanningProfile.default()
+
+        # Normaliser et dédoublonner les tâches
+        normalized = []
+        for learner, week_start in jobs:
+            if isinstance(week_start, str):
+                week_start = datetime.strptime(week_start, '%Y-%m-%d').date()
+            normalized.append((str(learner), week_start))
+        jobs = list(dict.fromkeys(normalized))
+
+        started = time.perf_counter()
+        payloads, contexts = BatchPlanner._load(jobs, profile)
+        loaded = time.perf_counter()
+
+        print(f"\n📦 Planification par lots: {len(jobs)} semaines en {len(payloads)} tâches, "
+              f"{len({learner for learner, _ in jobs})} apprenants, {workers} processus")
+
+        results = []
+        if workers == 1 or len(payloads) <= 1:
+            # Pas de pool : utile pour déboguer et pour les petits lots
+            for result in map(_plan_job, payloads):
+                results.extend(BatchPlanner._write(result, contexts))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_plan_job, payload) for payload in payloads]
+                # Dans l'ordre de fin : une tâche lente ne retarde pas l'écriture des autres
+                for future in as_completed(futures):
+                    results.extend(BatchPlanner._write(future.result(), contexts))
+
+        finished = time.perf_counter()
+        report = {
+            'weeks': len(jobs),
+            'tasks': len(payloads),
+            'workers': workers,
+            'load_ms': round((loaded - started) * 1000, 3),
+            'total_ms': round((finished - started) * 1000, 3),
+            'weeks_per_second': round(len(jobs) / (finished - started), 2) if jobs else 0.0,
+            'results': results
+        }
+        print(f"✅ {len(jobs)} semaines planifiées en {report['total_ms']:.0f} ms "
+              f"({report['weeks_per_second']} semaines/s)\n")
+        return report
+
+    @staticmethod
+    def _load(jobs, profile):
+        """
+        Lit les données de toutes les tâches, une fois par apprenant.
+
+        Returns:
+            tuple: (charges utiles pour les processus, contexte d'écriture par tâche)
+        """
+        by_learner = {}
+        for learner, week_start in jobs:
+            by_learner.setdefault(learner, []).append(week_start)
+
+        payloads = []
+        contexts = {}
+
+        for learner, weeks in by_learner.items():
+            load_started = time.perf_counter()
+            weeks.sort()
+            start_date = weeks[0]
+            end_date = weeks[-1] + timedelta(days=7)
+
+            # Regrouper les semaines consécutives
+            runs = [[weeks[0], 1]]
+            for week_start in weeks[1:]:
+                if week_start == runs[-1][0] + timedelta(days=7 * runs[-1][1]):
+                    runs[-1][1] += 1
+                else:
+                    runs.append([week_start, 1])
+            runs = [(run_start, run_weeks) for run_start, run_weeks in runs]
+
+            def in_runs(day):
+                return any(
+                    run_start <= day < run_start + timedelta(days=7 * run_weeks)
+                    for run_start, run_weeks in runs
+                )
+
+            with DatabaseManager.use_learner(learner):
+                with DatabaseManager.transaction():
+                    existing, courses, homework_list, revisions, _ = Scheduler.load_inputs(
+                        start_date, end_date, profile
+                    )
+                    replanned = [slot for slot in existing if in_runs(slot['date'])]
+                    # Les heures des semaines entre deux suites ne sont pas replanifiées
+                    subjects = Scheduler._subjects_before(replanned)
+
+            course_index = planner.CourseIndex(courses)
+            run_courses = [
+                course for course in courses if in_runs(course_index.course_date(course))
+            ]
+
+            # Sessions de devoirs déjà placées entre deux suites : décomptées
+            placed_slots = sorted(
+                (slot for slot in existing if slot['activity_type'] == 'homework'),
+                key=lambda slot: (slot['date'], planner.time_to_minutes(slot['start_time']))
+            )
+            owners = planner.assign_placed_sessions(
+                [(slot['date'], slot['subject']) for slot in placed_slots], homework_list,
+                profile.homework_preparation_days
+            )
+            placed = {}
+            for slot, homework_id in zip(placed_slots, owners):
+                if homework_id is not None and not in_runs(slot['date']):
+                    placed[homework_id] = placed.get(homework_id, 0) + 1
+            run_homework = []
+            for hw in homework_list:
+                sessions = max(1, int(hw.get('estimated_sessions') or 1))
+                if sessions > placed.get(hw['id'], 0):
+                    run_homework.append(dict(hw, estimated_sessions=sessions - placed.get(hw['id'], 0)))
+
+            # Révisions déjà planifiées sur ces semaines, puis les nouveaux candidats
+            candidates = [course for course in revisions if 'not_before' not in course]
+            run_revisions = Scheduler.planned_revisions(replanned) + candidates
+
+            index = len(payloads)
+            payloads.append((
+                index, runs, run_courses, run_homework, run_revisions, subjects, profile
+            ))
+            contexts[index] = {
+                'learner': learner,
+                'runs': runs,
+                'existing': [
+                    [slot for slot in replanned
+                     if run_start <= slot['date'] < run_start + timedelta(days=7 * run_weeks)]
+                    for run_start, run_weeks in runs
+                ],
+                'load_ms': (time.perf_counter() - load_started) * 1000
+            }
+
+        return payloads, contexts
+
+    @staticmethod
+    def _write(result, contexts):
+        """
+        Écrit le planning d'une tâche dans la base de son apprenant, en une
+        transaction, et invalide PlanCache. Les abonnés de Scheduler ne
+        sont prévenus des suites modifiées que si cette base est la base
+        par défaut (les autres ne sont ni affichées ni rappelées).
+
+        Returns:
+            list: Mesures et lignes écrites pour chaque suite de semaines
+        """
+        index, plans, plan_seconds = result
+        context = contexts.pop(index)
+        runs = context['runs']
+        write_started = time.perf_counter()
+        with Scheduler.exclusive():
+            with DatabaseManager.use_learner(context['learner']):
+                with DatabaseManager.transaction():
+                    reports = [
+                        Scheduler.apply_plan(plan, existing)
+                        for plan, existing in zip(plans, context['existing'])
+                    ]
+                    PlanCache.invalidate(
+                        runs[0][0], runs[-1][0] + timedelta(days=7 * runs[-1][1])
+                    )
+            # Après le commit, comme generate_schedule_range
+            if DatabaseManager.is_default_database(context['learner']):
+                for (run_start, run_weeks), report in zip(runs, reports):
+                    if Scheduler._changed(report):
+                        Scheduler._notify_changed(
+                            run_start, run_start + timedelta(days=7 * run_weeks)
+                        )
+        write_ms = (time.perf_counter() - write_started) * 1000
+
+        jobs = []
+        for (run_start, run_weeks), plan, report in zip(runs, plans, reports):
+            job = {
+                'learner': context['learner'],
+                'week': run_start.isoformat(),
+                'weeks': run_weeks,
+                'entries': len(plan.entries),
+                'load_ms': round(context['load_ms'] / len(runs), 3),
+                'plan_ms': round(plan_seconds * 1000 / len(runs), 3),
+                'write_ms': round(write_ms / len(runs), 3)
+            }
+            job.update(report)
+            print(f"   👤 {job['learner']} · {job['week']} ({job['weeks']} sem.): "
+                  f"{job['entries']} activités (calcul {job['plan_ms']:.1f} ms, écriture {job['write_ms']:.1f} ms)")
+            jobs.append(job)
+        return jobs
@@ -0,0 +1,416 @@
+"""Tâches de fond périodiques (résumé du jour, génération nocturne, maintenance)"""
+
+import heapq
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from config import JOBS_CONFIG
+
+class CronSchedule:
+    """
+    Expression cron à 5 champs : minute heure jour-du-mois mois jour-de-semaine.
+    Chaque champ accepte *, une valeur, une liste (1,15), un intervalle
+    (1-5) et un pas (*/10, 0-30/5). Jour de semaine : 0 ou 7 = dimanche.
+
+    Exemple: '30 7 * * 1-5' = 7h30 du lundi au vendredi
+    """
+
+    FIELDS = (
+        ('minute', 0, 59),
+        ('heure', 0, 23),
+        ('jour', 1, 31),
+        ('mois', 1, 12),
+        ('jour de semaine', 0, 7)
+    )
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): Expression cron
+
+        Raises:
+            ValueError: Si l'expression est invalide
+        """
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Expression cron invalide (5 champs attendus): {expression!r}")
+        self.expression = expression
+        values = [
+            CronSchedule._parse_field(part, name, low, high)
+            for part, (name, low, high) in zip(parts, CronSchedule.FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        # Cron : 0 = dimanche ; Python : 0 = lundi
+        self.weekdays = set((day - 1) % 7 for day in weekdays)
+        self.any_day = parts[2] == '*'
+        self.any_weekday = parts[4] == '*'
+
+    @staticmethod
+    def _parse_field(field, name, low, high):
+        """Convertit un champ cron en ensemble de valeurs autorisées"""
+        values = set()
+        for item in field.split(','):
+            step = 1
+            if '/' in item:
+                item, step_text = item.split('/', 1)
+                step = int(step_text)
+            if item == '*':
+                start, end = low, high
+            elif '-' in item:
+                start, end = (int(value) for value in item.split('-', 1))
+            else:
+                start = end = int(item)
+            if step < 1 or start < low or end > high or start > end:
+                raise ValueError(f"Champ cron '{name}' invalide: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, day):
+        """Jour du mois et jour de semaine (OU si les deux sont restreints, comme cron)"""
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = day.weekday() in self.weekdays
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment):
+        """
+        Prochaine échéance strictement après un instant.
+
+        Args:
+            moment (datetime): Instant de référence
+
+        Returns:
+            datetime: Prochaine échéance (à la minute)
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(366 * 5):
+            if self._day_matches(candidate):
+                for hour in sorted(h for h in self.hours if h >= candidate.hour):
+                    first_minute = candidate.minute if hour == candidate.hour else 0
+                    minutes = [m for m in sorted(self.minutes) if m >= first_minute]
+                    if minutes:
+                        return candidate.replace(hour=hour, minute=minutes[0])
+            candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+        raise ValueError(f"Aucune échéance possible pour {self.expression!r}")
+
+class Job:
+    """
+    Tâche périodique : intervalle fixe ou expression cron, plus un
+    décalage aléatoire (jitter) pour étaler les exécutions.
+    """
+
+    def __init__(self, name, func, interval=None, cron=None, jitter=0, initial_delay=None):
+        """
+        Args:
+            name (str): Nom unique de la tâche
+            func (callable): Fonction sans argument à exécuter
+            interval (float, optional): Secondes entre deux exécutions
+            cron (str, optional): Expression cron (à la place de interval)
+            jitter (float): Décalage aléatoire maximal ajouté, en secondes
+            initial_delay (float, optional): Première exécution après X secondes
+                                             (défaut: selon interval ou cron)
+        """
+        if (interval is None) == (cron is None):
+            raise ValueError(f"Tâche {name}: indiquer soit interval, soit cron")
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Tâche {name}: interval doit être positif")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.cron = CronSchedule(cron) if cron else None
+        self.jitter = max(0, jitter or 0)
+        self.initial_delay = initial_delay
+        self.lock = threading.Lock()  # Exécution unique (single-flight)
+        self.next_run = None
+        self.metrics = {
+            'runs': 0, 'failures': 0, 'skipped': 0,
+            'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': None,
+            'last_run': None, 'last_error': None
+        }
+
+    def schedule_next(self, now, first=False):
+        """
+        Calcule la prochaine échéance.
+
+        Args:
+            now (datetime): Instant de référence
+            first (bool): Première planification (initial_delay)
+
+        Returns:
+            datetime: Prochaine échéance, décalage aléatoire inclus
+        """
+        if first and self.initial_delay is not None:
+            due = now + timedelta(seconds=self.initial_delay)
+        elif self.cron is not None:
+            due = self.cron.next_after(now)
+        else:
+            due = now + timedelta(seconds=self.interval)
+        if self.jitter:
+            due += timedelta(seconds=random.uniform(0, self.jitter))
+        self.next_run = due
+        return due
+
+class JobScheduler:
+    """
+    Exécute des tâches périodiques dans un seul thread.
+
+    Les échéances sont gardées dans un tas : le thread dort sur un
+    threading.Event jusqu'à la prochaine, sans réveil inutile, et stop()
+    le réveille immédiatement. Une tâche ne s'exécute jamais deux fois
+    en parallèle (run_now pendant une exécution planifiée est ignoré).
+
+    Utilisation:
+        jobs = JobScheduler()
+        jobs.add(Job('ménage', func, interval=3600, jitter=60))
+        jobs.start()
+        ...
+        jobs.stop()
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.running = False
+        self.thread = None
+        self._timers = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def add(self, job):
+        """
+        Ajoute une tâche (planifiée immédiatement si le planificateur tourne).
+
+        Args:
+            job (Job): Tâche à ajouter
+        """
+        with self._lock:
+            if job.name in self.jobs:
+                raise ValueError(f"Tâche déjà enregistrée: {job.name}")
+            self.jobs[job.name] = job
+            if self.running:
+                due = job.schedule_next(datetime.now(), first=True)
+                heapq.heappush(self._timers, (due, job.name))
+        self._wakeup.set()
+
+    def start(self):
+        """Démarre le thread des tâches"""
+        if self.running:
+            return
+        now = datetime.now()
+        with self._lock:
+            self.running = True
+            self._timers = [
+                (job.schedule_next(now, first=True), name) for name, job in self.jobs.items()
+            ]
+            heapq.heapify(self._timers)
+        self._wakeup.clear()
+        self.thread = threading.Thread(target=self._loop, name="jobs", daemon=True)
+        self.thread.start()
+        print(f"⏰ Tâches de fond démarrées: {', '.join(self.jobs) or 'aucune'}")
+
+    def stop(self, timeout=2):
+        """
+        Arrête le thread (une tâche en cours se termine en arrière-plan).
+
+        Args:
+            timeout (float): Attente maximale de la tâche en cours, en secondes
+        """
+        if not self.running:
+            return
+        self.running = False
+        self._wakeup.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        self.thread = None
+        print("⏰ Tâches de fond arrêtées")
+
+    def _loop(self):
+        """Boucle du thread : attend la prochaine échéance puis exécute la tâche"""
+        while self.running:
+            with self._lock:
+                timeout = None
+                due_name = None
+                if self._timers:
+                    due_at, name = self._timers[0]
+                    timeout = (due_at - datetime.now()).total_seconds()
+                    if timeout <= 0:
+                        heapq.heappop(self._timers)
+                        due_name = name
+            if due_name is not None:
+                job = self.jobs[due_name]
+                self._run(job)
+                with self._lock:
+                    if self.running:
+                        heapq.heappush(self._timers, (job.schedule_next(datetime.now()), due_name))
+                continue
+            # Plafond : recale l'attente après une mise en veille ou un changement d'heure
+            if self._wakeup.wait(min(timeout, 300) if timeout is not None else 300):
+                self._wakeup.clear()
+
+    def run_now(self, name):
+        """
+        Exécute une tâche immédiatement, dans le thread appelant.
+
+        Args:
+            name (str): Nom de la tâche
+
+        Returns:
+            bool: False si la tâche était déjà en cours (exécution ignorée)
+        """
+        return self._run(self.jobs[name])
+
+    def _run(self, job):
+        """Exécute une tâche si elle n'est pas déjà en cours et mesure sa durée"""
+        if not job.lock.acquire(blocking=False):
+            job.metrics['skipped'] += 1
+            print(f"⏭️  Tâche {job.name} déjà en cours, exécution ignorée")
+            return False
+        started = time.perf_counter()
+        try:
+            job.func()
+            error = None
+        except Exception as e:
+            error = str(e)
+            print(f"❌ Erreur dans la tâche {job.name}: {e}")
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            metrics = job.metrics
+            metrics['runs'] += 1
+            metrics['total_ms'] += elapsed_ms
+            metrics['max_ms'] = max(metrics['max_ms'], elapsed_ms)
+            metrics['last_ms'] = elapsed_ms
+            metrics['last_run'] = datetime.now()
+            if error is not None:
+                metrics['failures'] += 1
+                metrics['last_error'] = error
+            job.lock.release()
+        return True
+
+    def stats(self):
+        """
+        Mesures par tâche depuis le démarrage.
+
+        Returns:
+            dict: Par tâche : exécutions, échecs, exécutions ignorées,
+                  durées moyenne/max/dernière (ms), dernière et prochaine exécution
+        """
+        stats = {}
+        for name, job in self.jobs.items():
+            metrics = dict(job.metrics)
+            runs = metrics['runs']
+            metrics['avg_ms'] = round(metrics['total_ms'] / runs, 3) if runs else 0.0
+            metrics['total_ms'] = round(metrics['total_ms'], 3)
+            metrics['max_ms'] = round(metrics['max_ms'], 3)
+            if metrics['last_ms'] is not None:
+                metrics['last_ms'] = round(metrics['last_ms'], 3)
+            metrics['next_run'] = job.next_run
+            metrics['running'] = job.lock.locked()
+            stats[name] = metrics
+        return stats
+
+class MaintenanceJobs:
+    """
+    Tâches de fond de l'application, planifiées selon JOBS_CONFIG.
+    """
+
+    # Devoirs déjà signalés en retard (un seul rappel par devoir et par lancement)
+    _reported_overdue = set()
+
+    @staticmethod
+    def daily_summary(notification_service):
+        """Envoie le résumé du planning du jour"""
+        notification_service.send_daily_summary()
+
+    @staticmethod
+    def next_week_generation():
+        """
+        Génère le planning de la semaine suivante. Sans changement des
+        données, PlanCache court-circuite la génération (aucune écriture).
+        Si une autre écriture du planning est en cours (interface,
+        formulaires), ce passage est sauté : le suivant s'en chargera.
+        """
+        from services.scheduler import Scheduler
+        today = datetime.now().date()
+        next_monday = today + timedelta(days=7 - today.weekday())
+        with Scheduler.exclusive(blocking=False) as acquired:
+            if not acquired:
+                print("⏭️  Génération de la semaine suivante reportée (planning en cours d'écriture)")
+                return
+            Scheduler.generate_schedule_range(next_monday, weeks=1)
+
+    @staticmethod
+    def overdue_sweep(notification_service):
+        """
+        Signale les devoirs passés en retard depuis le dernier passage
+        (une notification regroupant les nouveaux retards).
+        """
+        from models.homework import Homework
+        overdue = Homework.get_overdue_homework()
+        new = [hw for hw in overdue if hw['id'] not in MaintenanceJobs._reported_overdue]
+        MaintenanceJobs._reported_overdue = set(hw['id'] for hw in overdue)
+        if not new:
+            return
+        message = "\n".join(f"{hw['subject']} (dû le {hw['due_date']})" for hw in new[:5])
+        if len(new) > 5:
+            message += f"\n... et {len(new) - 5} autre(s)"
+        notification_service.send_message(f"🔴 {len(new)} devoir(s) en retard", message, 15)
+        print(f"🔴 Devoirs en retard signalés: {len(new)}")
+
+    @staticmethod
+    def cache_warmup(week_cache):
+        """
+        Charge dans le cache des semaines affichées (WeekCache) la semaine
+        en cours et la suivante, si elles n'y sont pas : la première
+        ouverture du planning ne fait alors aucune requête. Sans interface
+        (week_cache None), il n'y a rien à préparer.
+
+        Args:
+            week_cache (WeekCache): Cache partagé par les vues du planning
+        """
+        if week_cache is None:
+            return
+        today = datetime.now().date()
+        monday = today - timedelta(days=today.weekday())
+        for week_start in (monday, monday + timedelta(days=7)):
+            week_cache.get(week_start)
+
+    @staticmethod
+    def notification_stats_dump(notification_service):
+        """Écrit les statistiques des rappels (NOTIFICATION_CONFIG['stats']['dump_path'])"""
+        notification_service.dump_stats()
+
+    @staticmethod
+    def create_scheduler(notification_service, week_cache=None):
+        """
+        Construit le planificateur avec les tâches activées dans JOBS_CONFIG.
+
+        Args:
+            notification_service (NotificationService): Service utilisé pour
+                                                        les résumés et alertes
+            week_cache (WeekCache, optional): Cache des semaines de l'interface
+                                              (ScheduleViewer.week_cache())
+
+        Returns:
+            JobScheduler: Planificateur prêt à démarrer
+        """
+        functions = {
+            'daily_summary': lambda: MaintenanceJobs.daily_summary(notification_service),
+            'next_week_generation': MaintenanceJobs.next_week_generation,
+            'overdue_sweep': lambda: MaintenanceJobs.overdue_sweep(notification_service),
+            'cache_warmup': lambda: MaintenanceJobs.cache_warmup(week_cache),
+            'notification_stats_dump': lambda: MaintenanceJobs.notification_stats_dump(notification_service)
+        }
+        scheduler = JobScheduler()
+        for name, settings in JOBS_CONFIG['jobs'].items():
+            if not settings.get('enabled', True):
+                continue
+            if name not in functions:
+                raise ValueError(f"Tâche inconnue dans JOBS_CONFIG: {name}")
+            options = {key: value for key, value in settings.items() if key != 'enabled'}
+            scheduler.add(Job(name, functions[name], **options))
+        return scheduler
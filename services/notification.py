@@ -1,35 +1,131 @@
-"""Service de notifications desktop Windows"""
+"""Service de notifications (desktop, fichier ou HTTP selon les sinks configurés)"""
 
-from plyer import notification
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time as dt_time
+import heapq
+import queue
 import threading
-import time
 from database.db_manager import DatabaseManager
 from config import NOTIFICATION_CONFIG
+from services.scheduler import Scheduler
+from services.notification_sinks import CallbackSink, create_sinks, make_notification
+from services.notification_stats import NotificationStats
 
 class NotificationService:
     """
     Gère les notifications desktop pour rappeler les activités.
     Fonctionne en arrière-plan pour surveiller le planning.
+    
+    Les créneaux non notifiés d'aujourd'hui et de demain sont chargés en
+    mémoire dans un tas trié par heure de rappel. Le thread dort sur un
+    threading.Event jusqu'au prochain rappel : aucune requête tant que
+    rien n'est dû. Le tas est rechargé quand le planning de ces deux
+    jours change (Scheduler.subscribe) et à minuit ; stop() réveille le
+    thread immédiatement.
+    
+    Une écriture faite par un autre processus (ligne de commande) n'est
+    vue qu'au rechargement suivant : appeler schedule_changed() pour la
+    prendre en compte plus tôt.
+    
+    L'envoi est confié à un second thread via une file bornée : un
+    notifieur lent ne retarde pas les rappels suivants. Les activités qui
+    commencent à la même minute forment une seule notification. Un rappel
+    n'est marqué notifié qu'au premier envoi réussi d'un sink (une
+    requête par lot envoyé) ; si tous les sinks échouent ou l'abandonnent
+    (arrêt pendant la limitation de débit), il reste à envoyer et repart
+    SEND_RETRY_DELAY secondes plus tard, ou est compté comme manqué si
+    l'activité a commencé entre-temps. Un acquittement que la base a
+    refusé est réécrit avant le rechargement suivant (pas de doublon).
+    
+    Les notifications partent vers les sinks de NOTIFICATION_CONFIG['sinks']
+    (desktop, fichier JSON Lines, HTTP), chacun avec sa limitation de
+    débit et son regroupement (services/notification_sinks.py).
+    
+    Chaque rappel est suivi (services/notification_stats.py) : heure
+    prévue, détection, remise aux sinks et résultat de chaque sink ;
+    stats() donne le retard d'envoi, les rappels manqués et les échecs.
     """
     
-    def __init__(self):
+    # Nouvel essai de chargement après une erreur (secondes)
+    RETRY_DELAY = 60
+    # Nouvel essai d'un rappel qu'aucun sink n'a pu envoyer (secondes)
+    SEND_RETRY_DELAY = 30
+    # Attente maximale sans requête : recale le réveil après une mise en
+    # veille ou un changement d'heure système (secondes)
+    MAX_SLEEP = 300
+    
+    def __init__(self, notifier=None, sinks=None):
+        """
+        Args:
+            notifier (callable, optional): Fonction (titre, message, durée)
+                                           à utiliser comme unique sink
+            sinks (list, optional): Sinks de notification
+                                    (défaut: NOTIFICATION_CONFIG['sinks'])
+        """
         self.running = False
         self.thread = None
         self.enabled = NOTIFICATION_CONFIG['enabled']
+        if sinks is None:
+            if notifier is not None:
+                sinks = [CallbackSink(notifier)]
+            else:
+                sinks = create_sinks(NOTIFICATION_CONFIG['sinks'])
+        self.sinks = sinks
+        stats_config = NOTIFICATION_CONFIG['stats']
+        self._stats = NotificationStats(
+            window_seconds=stats_config['window_seconds'],
+            samples=stats_config['samples'],
+            traces=stats_config['traces']
+        )
+        for sink in self.sinks:
+            sink.listener = self._on_sink_result
+        self._wakeup = threading.Event()
+        self._reload = True
+        self._timers = []
+        self._loaded_until = None
+        self._dispatch_queue = None
+        self._dispatcher = None
+        # Rappels transmis au thread d'envoi mais pas encore marqués en base
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        # Rappels envoyés dont le marquage a échoué (réécrits au rechargement)
+        self._unmarked = set()
+        # Rappels qu'aucun sink n'a envoyés : id -> heure du nouvel essai
+        self._retry_at = {}
+        # Notifications de rappels en attente du résultat des sinks :
+        # id(notification) -> {'notification', 'remaining', 'acked'}
+        self._outstanding = {}
     
     def start(self):
         """Démarre le service de notifications en arrière-plan"""
         if not self.running and self.enabled:
             self.running = True
+            self._reload = True
+            self._wakeup.clear()
+            with self._in_flight_lock:
+                self._in_flight.clear()
+            Scheduler.subscribe(self.schedule_changed)
+            self._dispatch_queue = queue.Queue(maxsize=NOTIFICATION_CONFIG['queue_size'])
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, args=(self._dispatch_queue,), daemon=True
+            )
+            self._dispatcher.start()
             self.thread = threading.Thread(target=self._notification_loop, daemon=True)
             self.thread.start()
             print("🔔 Service de notifications démarré")
     
     def stop(self):
-        """Arrête le service de notifications"""
+        """Arrête le service de notifications (sans attendre le prochain rappel)"""
         if self.running:
             self.running = False
+            Scheduler.unsubscribe(self.schedule_changed)
+            self._wakeup.set()
+            if self.thread is not None and self.thread is not threading.current_thread():
+                self.thread.join(timeout=5)
+            self.thread = None
+            # Le thread d'envoi termine les notifications déjà en file puis s'arrête
+            self._stop_dispatcher()
+            for sink in self.sinks:
+                sink.close(timeout=0.5)
             print("🔕 Service de notifications arrêté")
     
     def enable(self):
@@ -43,70 +139,395 @@ class NotificationService:
         self.enabled = False
         self.stop()
     
+    def schedule_changed(self, start_date=None, end_date=None):
+        """
+        Signale une modification du planning (abonnement Scheduler).
+        Ne recharge que si la période touche aujourd'hui ou demain.
+        
+        Args:
+            start_date (date, optional): Premier jour modifié (défaut: tout)
+            end_date (date, optional): Fin de la période modifiée (exclue)
+        """
+        today = datetime.now().date()
+        if start_date is not None and end_date is not None:
+            if end_date <= today or start_date > today + timedelta(days=1):
+                return
+        self._reload = True
+        self._wakeup.set()
+    
     def _notification_loop(self):
         """
-        Boucle principale qui vérifie les activités à venir.
-        S'exécute toutes les minutes.
+        Boucle principale : attend le prochain rappel (ou un réveil :
+        planning modifié, arrêt), puis envoie les rappels dus.
         """
         print("🔄 Boucle de notifications active")
         
         while self.running:
             try:
-                self._check_upcoming_activities()
-                time.sleep(60)  # Vérifier chaque minute
+                now = datetime.now()
+                if self._reload or now.date() >= self._loaded_until:
+                    self._reload = False
+                    self._load_timers(now)
+                
+                self._fire_due(datetime.now())
+                
+                # Dormir jusqu'au prochain rappel ou jusqu'à minuit
+                wake_at = datetime.combine(self._loaded_until, dt_time())
+                if self._timers and self._timers[0][0] < wake_at:
+                    wake_at = self._timers[0][0]
+                timeout = max(0.0, (wake_at - datetime.now()).total_seconds())
+                timeout = min(timeout, self.MAX_SLEEP)
             except Exception as e:
                 print(f"❌ Erreur dans la boucle de notification: {e}")
-                time.sleep(60)
+                self._reload = True
+                timeout = self.RETRY_DELAY
+            
+            if self._wakeup.wait(timeout):
+                self._wakeup.clear()
     
-    def _check_upcoming_activities(self):
-        """
-        Vérifie les activités qui commencent dans les X prochaines minutes
-        et envoie des notifications pour celles qui n'ont pas encore été notifiées.
+    def _upcoming_activities(self, now):
         """
-        now = datetime.now()
-        advance_minutes = NOTIFICATION_CONFIG['advance_minutes']
-        notification_window_start = now
-        notification_window_end = now + timedelta(minutes=advance_minutes + 1)
+        Charge les créneaux non notifiés d'aujourd'hui et de demain qui
+        n'ont pas encore commencé (la fenêtre peut passer minuit).
         
-        # Requête pour trouver les activités à notifier
+        Returns:
+            list: Tuples (heure du rappel, heure de début, activité), triés
+        """
         query = """
             SELECT * FROM schedule_slots 
-            WHERE date = %s 
-            AND start_time >= %s 
-            AND start_time <= %s
+            WHERE date >= %s AND date <= %s
             AND notified = FALSE
-            ORDER BY start_time
+            ORDER BY date, start_time
         """
-        
         activities = DatabaseManager.execute_query(
-            query, 
-            (
-                now.date(), 
-                notification_window_start.time(), 
-                notification_window_end.time()
-            ),
-            fetch=True
+            query,
+            (now.date(), now.date() + timedelta(days=1)),
+            fetch=True,
+            cache=False
         )
         
+        advance = timedelta(minutes=NOTIFICATION_CONFIG['advance_minutes'])
+        upcoming = []
         for activity in activities:
-            # Calculer le temps restant
-            activity_start = datetime.combine(
-                activity['date'], 
-                activity['start_time']
-            )
-            minutes_until = (activity_start - now).total_seconds() / 60
+            activity_start = self._start_datetime(activity)
+            if activity_start >= now.replace(second=0, microsecond=0):
+                upcoming.append((activity_start - advance, activity_start, activity))
+            else:
+                # Commencée sans rappel (application fermée, file pleine...)
+                self._stats.record_missed(activity['id'])
+        return upcoming
+    
+    @staticmethod
+    def _start_datetime(activity):
+        """Date et heure de début d'un créneau (TIME : time ou timedelta pymysql)"""
+        start_time = activity['start_time']
+        if isinstance(start_time, timedelta):
+            return datetime.combine(activity['date'], dt_time()) + start_time
+        return datetime.combine(activity['date'], start_time)
+    
+    def _load_timers(self, now):
+        """(Re)construit le tas des rappels d'aujourd'hui et de demain"""
+        with self._in_flight_lock:
+            unmarked = set(self._unmarked)
+            self._unmarked.clear()
+        if unmarked:
+            try:
+                self._mark_many_as_notified(sorted(unmarked))
+            except Exception:
+                with self._in_flight_lock:
+                    self._unmarked.update(unmarked)
+                raise
+        
+        with self._in_flight_lock:
+            in_flight = set(self._in_flight)
+            retry_at = dict(self._retry_at)
+        self._timers = []
+        upcoming = self._upcoming_activities(now)
+        for remind_at, activity_start, activity in upcoming:
+            if activity['id'] in in_flight:
+                continue
+            self._stats.record_detected(activity['id'], activity['subject'], remind_at, now)
+            remind_at = max(remind_at, retry_at.get(activity['id'], remind_at))
+            self._timers.append((remind_at, activity['id'], activity_start, activity))
+        heapq.heapify(self._timers)
+        # Oublier les nouveaux essais des créneaux commencés ou supprimés
+        ids = set(activity['id'] for _, _, activity in upcoming)
+        with self._in_flight_lock:
+            for slot_id in list(self._retry_at):
+                if slot_id not in ids:
+                    del self._retry_at[slot_id]
+        self._loaded_until = now.date() + timedelta(days=1)
+    
+    def _fire_due(self, now):
+        """
+        Transmet au thread d'envoi les rappels dont l'heure est passée,
+        regroupés par minute de début.
+        
+        Returns:
+            list: Activités transmises
+        """
+        due = []
+        while self._timers and self._timers[0][0] <= now and self.running:
+            _, _, activity_start, activity = heapq.heappop(self._timers)
+            if activity_start < now.replace(second=0, microsecond=0):
+                # Activité déjà commencée (rappel manqué)
+                self._stats.record_missed(activity['id'])
+                continue
+            due.append((activity_start, activity))
+        
+        # Les activités qui commencent à la même minute partent ensemble
+        minutes = set(activity_start.replace(second=0, microsecond=0) for activity_start, _ in due)
+        while (self._timers
+               and self._timers[0][2].replace(second=0, microsecond=0) in minutes):
+            _, _, activity_start, activity = heapq.heappop(self._timers)
+            due.append((activity_start, activity))
+        
+        for group in self._group_by_minute(due):
+            ids = [activity['id'] for _, activity in group]
+            with self._in_flight_lock:
+                self._in_flight.update(ids)
+            try:
+                self._dispatch_queue.put_nowait(group)
+            except queue.Full:
+                # Notifieur bloqué : le rappel reste non notifié en base
+                with self._in_flight_lock:
+                    self._in_flight.difference_update(ids)
+                self._stats.record_failure('queue_full', len(ids))
+                print(f"⚠️  File de notifications pleine, rappel ignoré: "
+                      f"{', '.join(activity['subject'] for _, activity in group)}")
+        return [activity for _, activity in due]
+    
+    @staticmethod
+    def _group_by_minute(due):
+        """
+        Regroupe les rappels des activités commençant à la même minute.
+        
+        Args:
+            due (list): Tuples (heure de début, activité), triés par heure
+        
+        Returns:
+            list: Groupes de tuples (heure de début, activité)
+        """
+        groups = {}
+        for activity_start, activity in due:
+            minute = activity_start.replace(second=0, microsecond=0)
+            groups.setdefault(minute, []).append((activity_start, activity))
+        return [groups[minute] for minute in sorted(groups)]
+    
+    def _dispatch_loop(self, dispatch_queue):
+        """
+        Thread d'envoi : remet aux sinks les notifications de la file (les
+        rappels sont marqués notifiés par _on_sink_result).
+        """
+        running = True
+        while running:
+            batch = [dispatch_queue.get()]
+            # Vider ce qui s'est accumulé pendant l'envoi précédent
+            while True:
+                try:
+                    batch.append(dispatch_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                batch = batch[:batch.index(None)]
+                running = False
             
-            # Ne notifier que si c'est dans la fenêtre de notification
-            if 0 <= minutes_until <= advance_minutes:
-                self._send_notification(activity, int(minutes_until))
-                self._mark_as_notified(activity['id'])
+            for group in batch:
+                self._send_group(group, datetime.now())
+    
+    def _stop_dispatcher(self):
+        """Demande l'arrêt du thread d'envoi sans l'attendre"""
+        if self._dispatch_queue is None:
+            return
+        try:
+            self._dispatch_queue.put_nowait(None)
+        except queue.Full:
+            # File pleine : le thread d'envoi est démon, il s'arrêtera avec l'application
+            pass
+        self._dispatch_queue = None
+        self._dispatcher = None
+    
+    def _send_group(self, group, now):
+        """Envoie une notification pour des activités commençant à la même minute"""
+        activity_start = group[0][0]
+        minutes_until = max(0, round((activity_start - now).total_seconds() / 60))
+        activities = [activity for _, activity in group]
+        advance = timedelta(minutes=NOTIFICATION_CONFIG['advance_minutes'])
+        dispatched = datetime.now()
+        for start, activity in group:
+            self._stats.record_dispatched(activity['id'], start - advance, dispatched)
+        self._send_notification(activities, minutes_until)
     
-    def _send_notification(self, activity, minutes_until):
+    def check_once(self):
         """
-        Envoie une notification desktop pour une activité.
+        Fait une seule vérification des activités à venir, sans thread
+        (utilisé par la ligne de commande).
+        
+        Returns:
+            list: Activités notifiées lors de cette vérification
+        """
+        now = datetime.now()
+        due = []
+        for remind_at, activity_start, activity in self._upcoming_activities(now):
+            if remind_at <= now:
+                self._stats.record_detected(activity['id'], activity['subject'], remind_at, now)
+                due.append((activity_start, activity))
+        for group in self._group_by_minute(due):
+            self._send_group(group, now)
+        # Les rappels sont marqués notifiés au fur et à mesure des envois
+        self.flush()
+        return [activity for _, activity in due]
+    
+    def _emit(self, title, message, timeout, activity_ids=()):
+        """
+        Remet une notification à tous les sinks (sans attendre l'envoi).
+        
+        Args:
+            title (str): Titre de la notification
+            message (str): Texte de la notification
+            timeout (int): Durée d'affichage en secondes
+            activity_ids (iterable): Créneaux concernés
+        """
+        notification = make_notification(title, message, timeout, activity_ids)
+        if notification['activity_ids']:
+            if not self.sinks:
+                self._mark_many_as_notified(notification['activity_ids'])
+                return
+            # Enregistrée avant l'envoi : un sink peut répondre aussitôt
+            with self._in_flight_lock:
+                self._outstanding[id(notification)] = {
+                    'notification': notification,
+                    'remaining': len(self.sinks),
+                    'acked': False
+                }
+        for sink in self.sinks:
+            if not sink.submit(notification):
+                print(f"⚠️  File du sink {sink.name} pleine, notification perdue")
+    
+    def _on_sink_result(self, notifications, sink_name, status, processed_at):
+        """
+        Résultat d'un sink pour un lot (listener des sinks) : statistiques,
+        puis marque notifiés, en une requête, les rappels envoyés pour la
+        première fois. Un rappel qu'aucun sink n'a envoyé est libéré et
+        replacé dans le tas, SEND_RETRY_DELAY secondes plus tard.
+        
+        Args:
+            notifications (list): Notifications du lot
+            sink_name (str): Nom du sink
+            status (str): 'sent', 'error' ou 'dropped'
+            processed_at (float): time.time() du traitement
+        """
+        for notification in notifications:
+            self._stats.record_delivery(notification, sink_name, status, processed_at)
+        
+        acked, resolved, failed = [], [], []
+        with self._in_flight_lock:
+            for notification in notifications:
+                entry = self._outstanding.get(id(notification))
+                if entry is None:
+                    continue
+                entry['remaining'] -= 1
+                if status == 'sent' and not entry['acked']:
+                    entry['acked'] = True
+                    acked.extend(notification['activity_ids'])
+                if entry['remaining'] <= 0:
+                    del self._outstanding[id(notification)]
+                    resolved.extend(notification['activity_ids'])
+                    if not entry['acked']:
+                        failed.extend(notification['activity_ids'])
+        
+        if acked:
+            with self._in_flight_lock:
+                for slot_id in acked:
+                    self._retry_at.pop(slot_id, None)
+            try:
+                self._mark_many_as_notified(acked)
+            except Exception as e:
+                print(f"❌ Erreur de mise à jour des notifications: {e}")
+                # Réécrits par _load_timers avant de relire le planning
+                with self._in_flight_lock:
+                    self._unmarked.update(acked)
+                self._reload = True
+                self._wakeup.set()
+        if resolved:
+            # Après l'écriture : un rechargement ne reprend pas un rappel acquitté
+            with self._in_flight_lock:
+                self._in_flight.difference_update(resolved)
+        if failed:
+            retry_at = datetime.now() + timedelta(seconds=self.SEND_RETRY_DELAY)
+            print(f"⚠️  {len(failed)} rappel(s) non envoyé(s), nouvel essai à {retry_at:%H:%M:%S}")
+            with self._in_flight_lock:
+                for slot_id in failed:
+                    self._retry_at[slot_id] = retry_at
+            # Réveille la boucle pour replacer ces rappels dans le tas
+            self._reload = True
+            self._wakeup.set()
+    
+    def send_message(self, title, message, timeout=10):
+        """
+        Envoie une notification libre (alertes des tâches de fond).
+        
+        Args:
+            title (str): Titre de la notification
+            message (str): Texte de la notification
+            timeout (int): Durée d'affichage en secondes
+        """
+        print(f"🔔 Notification: {title} - {message}")
+        self._emit(title, message, timeout)
+    
+    def flush(self, timeout=5):
+        """
+        Attend l'envoi des notifications en file dans tous les sinks.
+        
+        Args:
+            timeout (float): Attente maximale par sink en secondes
+        """
+        for sink in self.sinks:
+            sink.flush(timeout)
+    
+    def sink_stats(self):
+        """
+        Compteurs d'envoi de chaque sink.
+        
+        Returns:
+            dict: Statistiques par nom de sink
+        """
+        return {sink.name: sink.stats() for sink in self.sinks}
+    
+    def stats(self):
+        """
+        Statistiques des rappels : retard d'envoi et délai de livraison
+        (percentiles et histogrammes en ms), rappels manqués, échecs de
+        remise et compteurs de chaque sink.
+        
+        Returns:
+            dict: Voir NotificationStats.snapshot, plus 'sinks'
+        """
+        stats = self._stats.snapshot()
+        stats['sinks'] = self.sink_stats()
+        return stats
+    
+    def dump_stats(self, path=None):
+        """
+        Écrit les statistiques des rappels dans un fichier JSON.
+        
+        Args:
+            path (str, optional): Fichier (défaut: NOTIFICATION_CONFIG['stats']['dump_path'])
+        """
+        path = path or NOTIFICATION_CONFIG['stats']['dump_path']
+        self._stats.dump_json(path, extra={'sinks': self.sink_stats()})
+    
+    def reset_stats(self):
+        """Remet à zéro les statistiques des rappels"""
+        self._stats.reset()
+    
+    def _send_notification(self, activities, minutes_until):
+        """
+        Envoie une notification desktop pour une ou plusieurs activités
+        commençant à la même minute.
         
         Args:
-            activity (dict): Informations de l'activité
+            activities (list): Informations des activités
             minutes_until (int): Minutes avant le début
         """
         # Icônes selon le type d'activité
@@ -117,18 +538,21 @@ class NotificationService:
             'revision': '🔄'
         }
         
-        icon = icons.get(activity['activity_type'], '📌')
+        icon = icons.get(activities[0]['activity_type'], '📌') if len(activities) == 1 else '🔔'
         
         # Construire le message
+        verb = "commence" if len(activities) == 1 else "commencent"
         if minutes_until == 0:
             title = f"{icon} C'EST MAINTENANT !"
-            time_msg = "commence maintenant"
+            time_msg = f"{verb} maintenant"
         elif minutes_until == 1:
             title = f"{icon} Dans 1 minute"
-            time_msg = "commence dans 1 minute"
+            time_msg = f"{verb} dans 1 minute"
         else:
             title = f"{icon} Dans {minutes_until} minutes"
-            time_msg = f"commence dans {minutes_until} minutes"
+            time_msg = f"{verb} dans {minutes_until} minutes"
+        if len(activities) > 1:
+            title += f" ({len(activities)} activités)"
         
         # Type d'activité en français
         activity_types = {
@@ -137,23 +561,21 @@ class NotificationService:
             'learning': 'Apprentissage',
             'revision': 'Révision'
         }
-        activity_label = activity_types.get(activity['activity_type'], 'Activité')
+        lines = [
+            f"{activity_types.get(activity['activity_type'], 'Activité')}: {activity['subject']}"
+            for activity in activities
+        ]
         
-        message = f"{activity_label}: {activity['subject']}\n{time_msg}"
+        message = "\n".join(lines) + f"\n{time_msg}"
         
         # Afficher aussi dans la console
         print(f"🔔 Notification: {title} - {message}")
         
         # Envoyer la notification
-        try:
-            notification.notify(
-                title=title,
-                message=message,
-                app_name="📚 Learning Planner",
-                timeout=NOTIFICATION_CONFIG['timeout']
-            )
-        except Exception as e:
-            print(f"❌ Erreur envoi notification: {e}")
+        self._emit(
+            title, message, NOTIFICATION_CONFIG['timeout'],
+            [activity['id'] for activity in activities]
+        )
     
     def _mark_as_notified(self, schedule_id):
         """
@@ -162,18 +584,31 @@ class NotificationService:
         Args:
             schedule_id (int): ID du créneau dans schedule_slots
         """
-        query = "UPDATE schedule_slots SET notified = TRUE WHERE id = %s"
-        DatabaseManager.execute_query(query, (schedule_id,))
+        self._mark_many_as_notified([schedule_id])
+    
+    def _mark_many_as_notified(self, schedule_ids):
+        """
+        Marque plusieurs activités comme notifiées en une seule requête.
+        
+        Args:
+            schedule_ids (list): IDs des créneaux dans schedule_slots
+        """
+        if not schedule_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(schedule_ids))
+        query = f"UPDATE schedule_slots SET notified = TRUE WHERE id IN ({placeholders})"
+        DatabaseManager.execute_query(query, tuple(schedule_ids))
     
     def send_test_notification(self):
-        """Envoie une notification de test"""
+        """Envoie une notification de test à chaque sink (de façon synchrone)"""
+        notification = make_notification(
+            "🧪 Test de notification",
+            "Les notifications fonctionnent correctement !",
+            10
+        )
         try:
-            notification.notify(
-                title="🧪 Test de notification",
-                message="Les notifications fonctionnent correctement !",
-                app_name="📚 Learning Planner",
-                timeout=10
-            )
+            for sink in self.sinks:
+                sink.send([notification])
             print("✅ Notification de test envoyée")
             return True
         except Exception as e:
@@ -203,12 +638,7 @@ class NotificationService:
         activities = self.get_today_schedule()
         
         if not activities:
-            notification.notify(
-                title="📅 Planning du jour",
-                message="Aucune activité planifiée aujourd'hui",
-                app_name="📚 Learning Planner",
-                timeout=10
-            )
+            self._emit("📅 Planning du jour", "Aucune activité planifiée aujourd'hui", 10)
             return
         
         # Compter par type
@@ -232,11 +662,6 @@ class NotificationService:
         message = "\n".join(parts)
         message += f"\n\nTotal: {len(activities)} activités"
         
-        notification.notify(
-            title="📅 Votre planning d'aujourd'hui",
-            message=message,
-            app_name="📚 Learning Planner",
-            timeout=15
-        )
+        self._emit("📅 Votre planning d'aujourd'hui", message, 15)
         
         print(f"📊 Résumé du jour envoyé: {len(activities)} activités")
\ No newline at end of file
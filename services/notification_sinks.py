@@ -0,0 +1,394 @@
+"""Destinations des notifications (desktop, fichier, HTTP) avec limitation de débit"""
+
+import json
+import queue
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+# Marqueur de fin pour le thread d'un sink
+_STOP = object()
+
+class TokenBucket:
+    """
+    Seau à jetons : au plus `burst` envois d'affilée, puis `rate` envois
+    par seconde en moyenne.
+    """
+
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate (float): Jetons ajoutés par seconde (None ou 0 = illimité)
+            burst (int): Jetons au maximum (rafale autorisée)
+        """
+        self.rate = float(rate) if rate else None
+        self.burst = max(1.0, float(burst or 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def acquire(self, stop_event):
+        """
+        Prend un jeton, en attendant qu'il y en ait un si nécessaire.
+
+        Args:
+            stop_event (threading.Event): Interrompt l'attente s'il est positionné
+
+        Returns:
+            float: Secondes d'attente, ou None si l'attente a été interrompue
+        """
+        if self.rate is None:
+            return 0.0
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited
+            delay = (1 - self.tokens) / self.rate
+            if stop_event.wait(delay):
+                return None
+            waited += delay
+
+class NotificationSink:
+    """
+    Destination de notifications. Les sous-classes n'implémentent que
+    send(notifications), appelée avec un lot.
+
+    submit() dépose une notification dans la file (bornée) du sink ; un
+    thread propre à chaque sink regroupe les notifications arrivées dans
+    la fenêtre batch_window_ms (au plus batch_size), attend un jeton
+    (un jeton par lot) puis appelle send. Un sink lent ou limité ne
+    retarde donc pas les autres.
+
+    Une notification est un dict : title, message, timeout, activity_ids,
+    created_at (time.time() de sa création).
+
+    Si `listener` est défini, il est appelé pour chaque lot traité :
+    listener(notifications, nom_du_sink, statut, time.time()), avec
+    statut 'sent', 'error' ou 'dropped'.
+    """
+
+    name = 'sink'
+    listener = None
+
+    def __init__(self, rate=None, burst=1, batch_size=1, batch_window_ms=0, queue_size=100):
+        """
+        Args:
+            rate (float, optional): Lots envoyés par seconde (None = illimité)
+            burst (int): Lots envoyables d'affilée
+            batch_size (int): Notifications par lot au maximum
+            batch_window_ms (int): Attente d'autres notifications pour compléter un lot
+            queue_size (int): Notifications en attente au maximum
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.batch_size = max(1, int(batch_size))
+        self.batch_window = max(0, batch_window_ms) / 1000
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._stop_event = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._counters = {
+            'submitted': 0, 'sent': 0, 'batches': 0,
+            'errors': 0, 'dropped': 0, 'throttled_ms': 0.0
+        }
+
+    def send(self, notifications):
+        """
+        Envoie un lot de notifications (appel synchrone).
+
+        Args:
+            notifications (list): Notifications à envoyer
+        """
+        raise NotImplementedError
+
+    def submit(self, notification):
+        """
+        Met une notification en file d'envoi (sans bloquer).
+
+        Args:
+            notification (dict): Notification à envoyer
+
+        Returns:
+            bool: False si la file est pleine (notification perdue)
+        """
+        with self._lock:
+            if self._thread is None:
+                # Démarré au premier envoi, et de nouveau après close()
+                self._stop_event = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop_event,),
+                    name=f"sink-{self.name}", daemon=True
+                )
+                self._thread.start()
+            try:
+                self._queue.put_nowait(notification)
+                queued = True
+            except queue.Full:
+                self._counters['dropped'] += 1
+                queued = False
+            else:
+                self._pending += 1
+                self._counters['submitted'] += 1
+        if not queued and self.listener is not None:
+            self.listener([notification], self.name, 'dropped', time.time())
+        return queued
+
+    def _run(self, stop_event):
+        """Thread du sink : regroupe, limite le débit et envoie"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            waited = self.bucket.acquire(stop_event)
+            if waited is None:
+                # Fermeture pendant l'attente d'un jeton : file abandonnée
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+                self._done(batch, dropped=True)
+                return
+            try:
+                self.send(batch)
+                self._done(batch, waited=waited)
+            except Exception as e:
+                print(f"❌ Erreur d'envoi ({self.name}): {e}")
+                self._done(batch, error=True, waited=waited)
+            if stopping:
+                return
+
+    def _done(self, batch, waited=0.0, error=False, dropped=False):
+        """Met à jour les compteurs après le traitement d'un lot"""
+        if self.listener is not None:
+            status = 'dropped' if dropped else 'error' if error else 'sent'
+            try:
+                self.listener(batch, self.name, status, time.time())
+            except Exception as e:
+                print(f"⚠️ Erreur du suivi des envois ({self.name}): {e}")
+        with self._lock:
+            if dropped:
+                self._counters['dropped'] += len(batch)
+            elif error:
+                self._counters['errors'] += len(batch)
+            else:
+                self._counters['sent'] += len(batch)
+                self._counters['batches'] += 1
+            self._counters['throttled_ms'] += waited * 1000
+            self._pending -= len(batch)
+            if self._pending <= 0:
+                self._idle.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Attend que toutes les notifications en file soient traitées.
+
+        Args:
+            timeout (float, optional): Attente maximale en secondes
+
+        Returns:
+            bool: True si la file est vide
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending <= 0, timeout)
+
+    def close(self, timeout=1.0):
+        """
+        Arrête le thread du sink. Les notifications déjà en file sont
+        envoyées si le débit le permet avant `timeout`, les autres perdues.
+
+        Args:
+            timeout (float): Attente maximale en secondes
+        """
+        with self._lock:
+            thread, stop_event = self._thread, self._stop_event
+            self._thread = None
+        if thread is None:
+            return
+        started = time.monotonic()
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(max(0.0, timeout - (time.monotonic() - started)))
+        # Interrompt l'attente d'un jeton : le reste de la file est abandonné
+        stop_event.set()
+        thread.join(0.1)
+
+    def stats(self):
+        """
+        Compteurs d'envoi du sink.
+
+        Returns:
+            dict: Notifications soumises, envoyées, en erreur, perdues,
+                  nombre de lots et temps d'attente dû à la limitation
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['pending'] = self._pending
+        stats['throttled_ms'] = round(stats['throttled_ms'], 3)
+        return stats
+
+class PlyerSink(NotificationSink):
+    """
+    Notifications desktop via plyer (importé au premier envoi).
+    Un lot de plusieurs notifications devient une seule notification
+    récapitulative : une rafale n'inonde pas le bureau.
+    """
+
+    name = 'plyer'
+    # Longueur maximale du texte (Windows tronque les toasts vers 256 caractères)
+    MAX_MESSAGE_LENGTH = 250
+
+    def __init__(self, app_name="📚 Learning Planner", **options):
+        super().__init__(**options)
+        self.app_name = app_name
+
+    def send(self, notifications):
+        from plyer import notification
+        if len(notifications) == 1:
+            title = notifications[0]['title']
+            message = notifications[0]['message']
+        else:
+            # Première ligne de chaque message (type et matière) : les titres
+            # ("Dans 15 minutes") sont souvent identiques
+            title = f"🔔 {len(notifications)} rappels"
+            message = "\n".join(
+                (item['message'].splitlines() or [item['title']])[0]
+                for item in notifications
+            )
+        if len(message) > self.MAX_MESSAGE_LENGTH:
+            message = message[:self.MAX_MESSAGE_LENGTH - 1].rstrip() + "…"
+        notification.notify(
+            title=title,
+            message=message,
+            app_name=self.app_name,
+            timeout=max(item['timeout'] for item in notifications)
+        )
+
+class JsonLinesSink(NotificationSink):
+    """Journal des notifications dans un fichier JSON Lines (une ligne par notification)"""
+
+    name = 'jsonl'
+
+    def __init__(self, path='notifications.jsonl', **options):
+        super().__init__(**options)
+        self.path = path
+
+    def send(self, notifications):
+        sent_at = time.time()
+        with open(self.path, 'a', encoding='utf-8') as output:
+            for item in notifications:
+                output.write(json.dumps(dict(item, sent_at=sent_at), ensure_ascii=False, default=str))
+                output.write('\n')
+
+class HttpSink(NotificationSink):
+    """
+    Envoie chaque lot en une requête HTTP POST (corps JSON :
+    {"notifications": [...]}) vers un point d'accès configurable, par
+    exemple un serveur local de test.
+    """
+
+    name = 'http'
+
+    def __init__(self, url='http://127.0.0.1:8765/notifications', timeout=2, **options):
+        super().__init__(**options)
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, notifications):
+        body = json.dumps(
+            {'sent_at': time.time(), 'notifications': notifications},
+            ensure_ascii=False, default=str
+        ).encode('utf-8')
+        request = urllib.request.Request(
+            self.url, data=body, method='POST',
+            headers={'Content-Type': 'application/json; charset=utf-8'}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+class CallbackSink(NotificationSink):
+    """Transmet chaque notification à une fonction (titre, message, durée)"""
+
+    name = 'callback'
+
+    def __init__(self, callback, **options):
+        super().__init__(**options)
+        self.callback = callback
+
+    def send(self, notifications):
+        for item in notifications:
+            self.callback(item['title'], item['message'], item['timeout'])
+
+SINK_TYPES = {
+    'plyer': PlyerSink,
+    'jsonl': JsonLinesSink,
+    'http': HttpSink
+}
+
+def create_sinks(configs):
+    """
+    Instancie les sinks décrits dans NOTIFICATION_CONFIG['sinks'].
+
+    Args:
+        configs (list): Dicts avec 'type' ('plyer', 'jsonl', 'http') et
+                        les options du sink (rate, burst, batch_size, ...)
+
+    Returns:
+        list: Sinks prêts à recevoir des notifications
+    """
+    sinks = []
+    for config in configs:
+        options = dict(config)
+        sink_type = options.pop('type')
+        if sink_type not in SINK_TYPES:
+            raise ValueError(f"Type de sink de notification inconnu: {sink_type}")
+        sinks.append(SINK_TYPES[sink_type](**options))
+    return sinks
+
+def make_notification(title, message, timeout, activity_ids=()):
+    """
+    Construit une notification au format attendu par les sinks.
+
+    Args:
+        title (str): Titre
+        message (str): Texte
+        timeout (int): Durée d'affichage en secondes
+        activity_ids (iterable): Créneaux concernés
+
+    Returns:
+        dict: Notification
+    """
+    return {
+        'title': title,
+        'message': message,
+        'timeout': timeout,
+        'activity_ids': list(activity_ids),
+        'created_at': time.time(),
+        'created': datetime.now().isoformat(timespec='milliseconds')
+    }
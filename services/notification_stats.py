@@ -0,0 +1,242 @@
+"""Instrumentation des rappels : retard d'envoi, rappels manqués et échecs"""
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from database.query_stats import percentile
+
+# Bornes supérieures des classes d'histogramme (ms)
+HISTOGRAM_BOUNDS_MS = (10, 50, 100, 250, 500, 1000, 2000, 5000, 15000, 60000)
+
+class RollingHistogram:
+    """
+    Mesures des `window_seconds` dernières secondes (au plus `samples`
+    valeurs) : percentiles et histogramme par classes de durée.
+    """
+
+    def __init__(self, window_seconds=3600, samples=1000):
+        self.window_seconds = window_seconds
+        self._values = deque(maxlen=samples)
+
+    def add(self, value_ms, now=None):
+        """Ajoute une mesure en millisecondes"""
+        self._values.append((now or time.time(), value_ms))
+
+    def snapshot(self, now=None):
+        """
+        Résumé des mesures de la fenêtre.
+
+        Returns:
+            dict: Nombre, p50/p95/p99/max (ms) et histogramme {'<=X ms': n}
+        """
+        limit = (now or time.time()) - self.window_seconds
+        values = sorted(value for at, value in self._values if at >= limit)
+        histogram = OrderedDict((f"<={bound}ms", 0) for bound in HISTOGRAM_BOUNDS_MS)
+        histogram[f">{HISTOGRAM_BOUNDS_MS[-1]}ms"] = 0
+        labels = list(histogram)
+        for value in values:
+            for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+                if value <= bound:
+                    histogram[labels[index]] += 1
+                    break
+            else:
+                histogram[labels[-1]] += 1
+        return {
+            'count': len(values),
+            'p50_ms': round(percentile(values, 0.50), 3),
+            'p95_ms': round(percentile(values, 0.95), 3),
+            'p99_ms': round(percentile(values, 0.99), 3),
+            'max_ms': round(values[-1], 3) if values else 0.0,
+            'histogram': dict(histogram)
+        }
+
+class NotificationStats:
+    """
+    Suit chaque créneau rappelé : heure de rappel prévue, heure de
+    détection (chargement en mémoire), heure de remise aux sinks et
+    résultat de chaque sink.
+
+    - retard d'envoi (lateness) : remise - max(prévue, détection), pour
+      ne mesurer que le service (un créneau ajouté après son heure de
+      rappel part dès sa détection) ;
+    - délai de livraison : envoi par le sink - remise ;
+    - rappels manqués : créneaux commencés sans avoir été notifiés ;
+    - échecs : file d'envoi pleine, erreur ou perte dans un sink.
+    """
+
+    def __init__(self, window_seconds=3600, samples=1000, traces=200):
+        """
+        Args:
+            window_seconds (int): Fenêtre glissante des histogrammes
+            samples (int): Mesures conservées au maximum par histogramme
+            traces (int): Créneaux récents dont le détail est conservé (et
+                          créneaux manqués mémorisés pour ne les compter
+                          qu'une fois)
+        """
+        self.window_seconds = window_seconds
+        self.samples = samples
+        self.traces_size = traces
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Efface toutes les mesures"""
+        with getattr(self, '_lock', threading.Lock()):
+            self._started_at = datetime.now()
+            self._lateness = RollingHistogram(self.window_seconds, self.samples)
+            self._delivery = RollingHistogram(self.window_seconds, self.samples)
+            self._traces = OrderedDict()
+            # Créneaux déjà comptés comme manqués (les plus anciens sont oubliés)
+            self._missed = OrderedDict()
+            self._counters = {
+                'detected': 0, 'late_detected': 0, 'dispatched': 0,
+                'delivered': 0, 'missed': 0
+            }
+            self._failures = {'queue_full': 0, 'sink_error': 0, 'sink_dropped': 0}
+
+    def _trace(self, slot_id):
+        """Détail d'un créneau (créé si absent, les plus anciens sont oubliés)"""
+        trace = self._traces.get(slot_id)
+        if trace is None:
+            trace = {'slot_id': slot_id, 'scheduled': None, 'detected': None,
+                     'dispatched': None, 'results': {}}
+            self._traces[slot_id] = trace
+            while len(self._traces) > self.traces_size:
+                self._traces.popitem(last=False)
+        return trace
+
+    def record_detected(self, slot_id, subject, scheduled, detected):
+        """
+        Un créneau à rappeler a été chargé (une seule fois par créneau).
+
+        Args:
+            slot_id (int): ID du créneau
+            subject (str): Matière
+            scheduled (datetime): Heure de rappel prévue
+            detected (datetime): Heure du chargement
+        """
+        with self._lock:
+            trace = self._trace(slot_id)
+            if trace['detected'] is not None:
+                return
+            trace.update(subject=subject, scheduled=scheduled, detected=detected)
+            self._counters['detected'] += 1
+            if detected > scheduled:
+                self._counters['late_detected'] += 1
+
+    def record_dispatched(self, slot_id, scheduled, dispatched):
+        """
+        Un rappel a été remis aux sinks.
+
+        Args:
+            slot_id (int): ID du créneau
+            scheduled (datetime): Heure de rappel prévue
+            dispatched (datetime): Heure de remise
+        """
+        with self._lock:
+            trace = self._trace(slot_id)
+            if trace['scheduled'] is None:
+                trace['scheduled'] = scheduled
+            trace['dispatched'] = dispatched
+            reference = max(scheduled, trace['detected'] or scheduled)
+            lateness_ms = max(0.0, (dispatched - reference).total_seconds() * 1000)
+            self._lateness.add(lateness_ms)
+            self._counters['dispatched'] += 1
+
+    def record_delivery(self, notification, sink_name, status, sent_at):
+        """
+        Résultat d'un sink pour une notification (abonnement des sinks).
+
+        Args:
+            notification (dict): Notification (activity_ids, created_at)
+            sink_name (str): Nom du sink
+            status (str): 'sent', 'error' ou 'dropped'
+            sent_at (float): time.time() du traitement
+        """
+        with self._lock:
+            if status == 'sent':
+                self._counters['delivered'] += 1
+                self._delivery.add(max(0.0, (sent_at - notification['created_at']) * 1000))
+            elif status == 'error':
+                self._failures['sink_error'] += 1
+            else:
+                self._failures['sink_dropped'] += 1
+            for slot_id in notification.get('activity_ids', ()):
+                if slot_id in self._traces:
+                    self._traces[slot_id]['results'][sink_name] = {
+                        'status': status,
+                        'at': datetime.fromtimestamp(sent_at)
+                    }
+
+    def record_missed(self, slot_id):
+        """
+        Un créneau a commencé sans avoir été notifié (compté une fois).
+
+        Args:
+            slot_id (int): ID du créneau
+        """
+        with self._lock:
+            if slot_id in self._missed:
+                return
+            self._missed[slot_id] = True
+            while len(self._missed) > self.traces_size:
+                self._missed.popitem(last=False)
+            self._counters['missed'] += 1
+
+    def record_failure(self, kind, count=1):
+        """
+        Échec de remise côté service.
+
+        Args:
+            kind (str): Type d'échec (ex: 'queue_full')
+            count (int): Nombre de rappels concernés
+        """
+        with self._lock:
+            self._failures[kind] = self._failures.get(kind, 0) + count
+
+    def snapshot(self):
+        """
+        Statistiques des rappels depuis le démarrage (histogrammes sur la
+        fenêtre glissante).
+
+        Returns:
+            dict: Compteurs, taux de rappels manqués, retard d'envoi et délai
+                  de livraison (ms), échecs et détail des créneaux récents
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            failures = dict(self._failures)
+            lateness = self._lateness.snapshot()
+            delivery = self._delivery.snapshot()
+            traces = [
+                dict(trace, results=dict(trace['results']))
+                for trace in self._traces.values()
+            ]
+
+        expected = counters['dispatched'] + counters['missed']
+        return {
+            'since': self._started_at.isoformat(' ', 'seconds'),
+            'window_seconds': self.window_seconds,
+            **counters,
+            'miss_rate': round(counters['missed'] / expected, 4) if expected else 0.0,
+            'failures': failures,
+            'lateness': lateness,
+            'delivery': delivery,
+            'recent': traces[-20:]
+        }
+
+    def dump_json(self, path, extra=None):
+        """
+        Écrit les statistiques dans un fichier JSON.
+
+        Args:
+            path (str): Chemin du fichier à écrire
+            extra (dict, optional): Données ajoutées au fichier (ex: sinks)
+        """
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
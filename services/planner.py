@@ -0,0 +1,662 @@
+"""
+Cœur de planification pur : aucune requête, aucun affichage.
+Reçoit des données déjà chargées et renvoie le planning et les mises à jour
+à appliquer, ce qui permet de le mesurer, le profiler ou l'exécuter dans
+un autre processus.
+"""
+
+import heapq
+from collections import deque
+from datetime import datetime, timedelta, time
+
+DAY_NAMES = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
+
+def parse_time(time_str):
+    """Convertit une chaîne HH:MM en objet time"""
+    return datetime.strptime(time_str, '%H:%M').time()
+
+def time_to_minutes(t):
+    """
+    Convertit une heure en minutes depuis minuit.
+    Accepte un objet time, une chaîne HH:MM[:SS] ou un timedelta
+    (type renvoyé par pymysql pour les colonnes TIME).
+    """
+    if isinstance(t, timedelta):
+        return int(t.total_seconds()) // 60
+    if isinstance(t, str):
+        t = parse_time(t[:5])
+    return t.hour * 60 + t.minute
+
+def minutes_to_time(minutes):
+    """Convertit des minutes depuis minuit en objet time"""
+    hours = minutes // 60
+    mins = minutes % 60
+    return time(hour=min(hours, 23), minute=min(mins, 59))
+
+def get_day_name(date_obj):
+    """Retourne le nom du jour en français"""
+    return DAY_NAMES[date_obj.weekday()]
+
+def to_date(value):
+    """Accepte une date ou une chaîne YYYY-MM-DD"""
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+class CourseIndex:
+    """
+    Index des cours par date, construit une seule fois par planification.
+    Chaque date donne la liste des cours triés par heure de début, avec
+    leurs bornes déjà converties en minutes.
+
+    La date réelle d'un cours est déduite de week_date et day_of_week :
+    un cours saisi avec le lundi de la semaine et le jour "Mercredi"
+    tombe bien le mercredi.
+    """
+
+    def __init__(self, courses):
+        """
+        Args:
+            courses (list): Cours tels que renvoyés par le modèle Course
+        """
+        self._by_date = {}
+        for course in courses:
+            course_date = CourseIndex.course_date(course)
+            start = time_to_minutes(course['start_time'])
+            end = time_to_minutes(course['end_time'])
+            self._by_date.setdefault(course_date, []).append((start, end, course))
+
+        for day_courses in self._by_date.values():
+            day_courses.sort(key=lambda item: (item[0], item[1]))
+
+    @staticmethod
+    def course_date(course):
+        """
+        Date effective d'un cours.
+
+        Args:
+            course (dict): Cours avec week_date et day_of_week
+
+        Returns:
+            date: week_date si elle correspond déjà au jour indiqué,
+                  sinon le jour indiqué dans la semaine de week_date
+        """
+        week_date = to_date(course['week_date'])
+        day_name = course.get('day_of_week')
+        if day_name not in DAY_NAMES:
+            return week_date
+        day_index = DAY_NAMES.index(day_name)
+        if week_date.weekday() == day_index:
+            return week_date
+        return week_date + timedelta(days=day_index - week_date.weekday())
+
+    def for_date(self, date_obj):
+        """
+        Cours d'une date.
+
+        Returns:
+            list: Tuples (début_minutes, fin_minutes, cours) triés
+        """
+        return self._by_date.get(date_obj, [])
+
+    def busy(self, date_obj):
+        """
+        Intervalles occupés par des cours à une date.
+
+        Returns:
+            list: Tuples (début_minutes, fin_minutes) triés
+        """
+        return [(start, end) for start, end, _ in self.for_date(date_obj)]
+
+    def dates(self):
+        """Dates ayant au moins un cours"""
+        return sorted(self._by_date)
+
+def preparation_start(homework, preparation_days):
+    """
+    Premier jour de la fenêtre de préparation d'un devoir.
+
+    Args:
+        homework (dict): Devoir avec due_date et preparation_days
+        preparation_days (int): Fenêtre du profil, si le devoir n'en a pas
+
+    Returns:
+        date: Échéance moins les jours de préparation du devoir
+    """
+    days = homework.get('preparation_days')
+    if days is None:
+        days = preparation_days
+    return to_date(homework['due_date']) - timedelta(days=int(days))
+
+class HomeworkQueue:
+    """
+    File de priorité des devoirs, échéance la plus proche en premier
+    (Earliest Deadline First).
+
+    Clé de tri : (date limite, heure limite, -sessions restantes, ordre
+    d'arrivée). À échéance égale, le devoir qui demande le plus d'effort
+    passe d'abord. Un devoir estimé à N sessions reste dans la file
+    jusqu'à ce que ses N sessions soient planifiées.
+
+    Chaque devoir n'entre dans la file qu'au début de sa propre fenêtre
+    de préparation (preparation_days du devoir, sinon celle du profil) :
+    les devoirs en attente sont rangés par début de fenêtre.
+    """
+
+    def __init__(self, homework, preparation_days):
+        """
+        Args:
+            homework (list): Devoirs (estimated_sessions vaut 1 si absent)
+            preparation_days (int): Fenêtre des devoirs sans preparation_days
+        """
+        self._heap = []
+        self._waiting = []
+        for order, hw in enumerate(homework):
+            sessions = max(1, int(hw.get('estimated_sessions') or 1))
+            due_time = hw.get('due_time')
+            self._waiting.append((
+                preparation_start(hw, preparation_days),
+                order,
+                [
+                    to_date(hw['due_date']),
+                    time_to_minutes(due_time) if due_time is not None else 0,
+                    -sessions,
+                    order,
+                    hw,
+                    sessions
+                ]
+            ))
+        heapq.heapify(self._waiting)
+
+    def __len__(self):
+        return len(self._heap) + len(self._waiting)
+
+    def allocate(self, current_date):
+        """
+        Attribue une session au devoir le plus urgent parmi ceux dont la
+        fenêtre de préparation est ouverte. O(log n) par allocation. Les
+        jours doivent être demandés dans l'ordre.
+
+        Args:
+            current_date (date): Jour de la session
+
+        Returns:
+            tuple: (devoir, numéro de session, total de sessions) ou None
+        """
+        heap = self._heap
+
+        # Faire entrer les devoirs dont la fenêtre commence
+        waiting = self._waiting
+        while waiting and waiting[0][0] <= current_date:
+            heapq.heappush(heap, heapq.heappop(waiting)[2])
+
+        # Écarter les devoirs dont l'échéance est passée
+        while heap and heap[0][0] < current_date:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+
+        top = heap[0]
+        hw, total = top[4], top[5]
+        remaining = -top[2] - 1
+        if remaining > 0:
+            top[2] = -remaining
+            heapq.heapreplace(heap, top)
+        else:
+            heapq.heappop(heap)
+        return hw, total - remaining, total
+
+def assign_placed_sessions(sessions, homework, preparation_days):
+    """
+    Retrouve le devoir de chaque session de devoir déjà placée (le
+    planning ne garde que la matière), dans l'ordre où HomeworkQueue les
+    a attribuées : chaque session revient au devoir de la même matière
+    dont la fenêtre de préparation est ouverte, dont l'échéance est la
+    plus proche sans être passée et qui n'a pas encore toutes ses sessions. Deux devoirs d'une même matière ne sont
+    donc pas confondus. Les sessions doivent toutes être fournies (y
+    compris celles qui vont être replanifiées) pour refaire le même
+    ordre d'attribution.
+
+    Args:
+        sessions (list): Tuples (date, matière) triés par date et heure
+        homework (list): Devoirs (avec id, subject, due_date)
+        preparation_days (int): Fenêtre des devoirs sans preparation_days
+
+    Returns:
+        list: Id du devoir de chaque session (None si aucun ne correspond)
+    """
+    by_subject = {}
+    for order, hw in enumerate(homework):
+        due_time = hw.get('due_time')
+        by_subject.setdefault(hw['subject'], []).append((
+            to_date(hw['due_date']),
+            time_to_minutes(due_time) if due_time is not None else 0,
+            -max(1, int(hw.get('estimated_sessions') or 1)),
+            order,
+            hw,
+            preparation_start(hw, preparation_days)
+        ))
+    for candidates in by_subject.values():
+        candidates.sort(key=lambda candidate: candidate[:4])
+
+    counts = {}
+    owners = []
+    for day, subject in sessions:
+        day = to_date(day)
+        owner = None
+        for due_date, _, sessions_needed, _, hw, opens in by_subject.get(subject, ()):
+            if (due_date < day or day < opens
+                    or counts.get(hw['id'], 0) >= -sessions_needed):
+                continue
+            counts[hw['id']] = counts.get(hw['id'], 0) + 1
+            owner = hw['id']
+            break
+        owners.append(owner)
+    return owners
+
+class SubjectAllocator:
+    """
+    Répartition équitable pondérée des sessions d'apprentissage.
+
+    Chaque matière avance sur une horloge virtuelle égale à
+    total_hours / priority : une matière de priorité 2 reçoit deux fois
+    plus de temps qu'une matière de priorité 1 avant de repasser
+    derrière elle. La matière la plus en retard (horloge la plus basse)
+    est choisie en O(log n) ; à égalité, celle étudiée le moins
+    récemment, les matières jamais étudiées d'abord.
+
+    L'état étant dérivé de total_hours et last_studied, il se prolonge
+    naturellement d'une semaine à l'autre.
+    """
+
+    def __init__(self, subjects):
+        """
+        Args:
+            subjects (list): Matières avec name, priority, total_hours, last_studied
+        """
+        self._heap = []
+        for order, subject in enumerate(subjects):
+            weight = max(1, int(subject.get('priority') or 1))
+            last_studied = subject.get('last_studied') or datetime.min
+            if isinstance(last_studied, str):
+                last_studied = datetime.fromisoformat(last_studied)
+            self._heap.append([
+                float(subject.get('total_hours') or 0) / weight,
+                last_studied,
+                order,
+                subject,
+                weight
+            ])
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def allocate(self, hours, studied_at):
+        """
+        Attribue une session à la matière la plus en retard.
+
+        Args:
+            hours (float): Durée de la session en heures
+            studied_at (datetime): Moment de la session (départage les égalités)
+
+        Returns:
+            dict: Matière choisie, ou None s'il n'y en a aucune
+        """
+        if not self._heap:
+            return None
+        top = self._heap[0]
+        top[0] += hours / top[4]
+        top[1] = studied_at
+        heapq.heapreplace(self._heap, top)
+        return top[3]
+
+class RevisionQueue:
+    """
+    File des cours à réviser, dans l'ordre de priorité.
+
+    Un cours portant une clé 'not_before' (révision déjà planifiée que
+    l'on replanifie) n'est disponible qu'à partir de cette date, et passe
+    alors en tête de file : une replanification à l'identique le remet
+    à sa place.
+    """
+
+    def __init__(self, revisions=()):
+        """
+        Args:
+            revisions (list): Cours à réviser (avec éventuellement 'not_before')
+        """
+        self._ready = deque()
+        self._pending = []
+        for course in revisions:
+            self.add(course)
+
+    def add(self, course):
+        """Ajoute un cours en fin de file (ou en attente de sa date)"""
+        not_before = course.get('not_before')
+        if not_before is None:
+            self._ready.append(course)
+        else:
+            heapq.heappush(self._pending, (to_date(not_before), len(self._pending), course))
+
+    def release(self, current_date):
+        """Rend disponibles les révisions dont la date est atteinte"""
+        released = []
+        while self._pending and self._pending[0][0] <= current_date:
+            released.append(heapq.heappop(self._pending)[2])
+        self._ready.extendleft(reversed(released))
+
+    def pop(self):
+        """Retire le prochain cours à réviser"""
+        return self._ready.popleft()
+
+    def __bool__(self):
+        return bool(self._ready)
+
+def get_free_slots(date_obj, courses, profile):
+    """
+    Calcule les créneaux horaires libres pour une journée donnée.
+
+    Args:
+        date_obj (date): Date pour laquelle calculer les créneaux
+        courses (CourseIndex | list): Index des cours, ou liste des cours
+        profile (PlanningProfile): Profil de planification compilé
+
+    Returns:
+        list: Liste de tuples (start_minutes, end_minutes) représentant les créneaux libres
+    """
+    if not isinstance(courses, CourseIndex):
+        courses = CourseIndex(courses)
+
+    day = profile.day(date_obj)
+    day_start = day.day_start
+    day_end = day.day_end
+
+    # Créneaux occupés : cours du jour et pauses repas
+    occupied = courses.busy(date_obj)
+    occupied.extend(day.breaks)
+    occupied.sort()
+
+    # Fusionner les créneaux qui se chevauchent
+    merged = []
+    for start, end in occupied:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    # Calculer les créneaux libres
+    free_slots = []
+    current = day_start
+
+    for start, end in merged:
+        if current < start:
+            free_slots.append((current, start))
+        current = max(current, end)
+
+    if current < day_end:
+        free_slots.append((current, day_end))
+
+    return free_slots
+
+class PlanResult:
+    """
+    Résultat d'une planification.
+
+    Attributes:
+        entries (list): Tuples (date, début, fin, type, matière, description)
+                        prêts pour l'insertion dans schedule_slots
+        revised_course_ids (list): Cours à marquer comme révisés
+        study_hours (dict): Heures d'apprentissage à ajouter par matière
+        days (list): Résumé par jour {'date', 'courses', 'activities', 'free'}
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.revised_course_ids = []
+        self.study_hours = {}
+        self.days = []
+
+def plan_week(week_start_date, courses, homework, revisions, subjects, profile):
+    """
+    Planifie une semaine à partir de données déjà chargées.
+
+    Ordre de priorité dans chaque créneau libre:
+        a) Devoirs urgents (à N jours ou moins de l'échéance)
+        b) Révisions de cours anciens (en début de semaine)
+        c) Apprentissage des matières, au prorata de leur priorité
+
+    Args:
+        week_start_date (date): Lundi de la semaine à planifier
+        courses (CourseIndex | list): Cours de la semaine
+        homework (list): Devoirs urgents (ordre indifférent)
+        revisions (list): Cours à réviser, par ordre de priorité
+        subjects (list | SubjectAllocator): Matières d'apprentissage (ordre
+                                            indifférent), ou répartiteur déjà
+                                            initialisé à poursuivre
+        profile (PlanningProfile): Profil de planification compilé
+
+    Returns:
+        PlanResult: Créneaux planifiés et mises à jour à appliquer
+    """
+    return plan_range(week_start_date, 1, courses, homework, revisions, subjects, profile)
+
+def plan_range(start_date, weeks, courses, homework, revisions, subjects, profile,
+               on_day=None):
+    """
+    Planifie plusieurs semaines consécutives en une seule passe.
+
+    Les devoirs, les révisions et la répartition des matières sont
+    partagés par toutes les semaines : un devoir dû en début de semaine
+    est préparé à la fin de la précédente, et l'équilibre entre matières
+    continue d'une semaine à l'autre. Un cours de l'horizon devient
+    candidat à la révision revision_threshold_days jours après sa date.
+
+    Args:
+        start_date (date): Lundi de la première semaine
+        weeks (int): Nombre de semaines à planifier
+        courses (CourseIndex | list): Cours de tout l'horizon
+        homework (list): Devoirs à préparer sur l'horizon (ordre indifférent)
+        revisions (list): Cours déjà à réviser, par ordre de priorité
+        subjects (list | SubjectAllocator): Matières d'apprentissage
+        profile (PlanningProfile): Profil de planification compilé
+        on_day (callable, optional): Appelée avec chaque jour planifié
+                                     (voir plan_days)
+
+    Returns:
+        PlanResult: Créneaux planifiés et mises à jour à appliquer
+    """
+    return plan_runs(
+        [(start_date, weeks)], courses, homework, revisions, subjects, profile, on_day
+    )[0]
+
+def plan_runs(runs, courses, homework, revisions, subjects, profile, on_day=None):
+    """
+    Planifie plusieurs suites de semaines consécutives, dans l'ordre, avec
+    un seul état : une suite reprend les devoirs, les révisions et
+    l'équilibre des matières là où la précédente les a laissés (aucun
+    devoir n'est préparé deux fois).
+
+    Args:
+        runs (list): Tuples (lundi, nombre de semaines), dans l'ordre des dates
+        courses, homework, revisions, subjects, profile, on_day: voir plan_range
+
+    Returns:
+        list: Un PlanResult par suite
+    """
+    results = []
+
+    homework_queue = HomeworkQueue(homework, profile.homework_preparation_days)
+    courses_to_revise = RevisionQueue(revisions)
+    revision_ids = set(course['id'] for course in revisions if course['id'] is not None)
+    revision_delay = timedelta(days=profile.revision_threshold_days)
+    subject_allocator = (
+        subjects if isinstance(subjects, SubjectAllocator) else SubjectAllocator(subjects)
+    )
+    course_index = courses if isinstance(courses, CourseIndex) else CourseIndex(courses)
+    course_dates = course_index.dates()
+    next_course_date = 0
+
+    for start_date, weeks in runs:
+        result = PlanResult()
+        results.append(result)
+
+        for week in range(weeks):
+            week_start = start_date + timedelta(days=7 * week)
+
+            # En début de semaine : les cours devenus assez anciens
+            # rejoignent la file des révisions
+            while (next_course_date < len(course_dates)
+                   and course_dates[next_course_date] + revision_delay <= week_start):
+                for _, _, course in course_index.for_date(course_dates[next_course_date]):
+                    if not course.get('needs_revision') and course['id'] not in revision_ids:
+                        revision_ids.add(course['id'])
+                        courses_to_revise.add(course)
+                next_course_date += 1
+
+            plan_days(
+                [week_start + timedelta(days=offset) for offset in range(7)],
+                course_index, homework_queue, courses_to_revise,
+                subject_allocator, profile, result, on_day
+            )
+
+    return results
+
+def plan_days(dates, courses, homework, revisions, subjects, profile, result=None,
+              on_day=None):
+    """
+    Planifie une liste de jours, consécutifs ou non.
+
+    Cœur commun à plan_range et à la re-planification partielle : les
+    devoirs, révisions et matières peuvent être passés déjà initialisés
+    (HomeworkQueue, RevisionQueue, SubjectAllocator) pour être partagés entre
+    plusieurs appels. Les révisions ne sont placées que du lundi au jeudi.
+
+    Args:
+        dates (list): Jours à planifier, dans l'ordre
+        courses (CourseIndex | list): Cours couvrant ces jours
+        homework (HomeworkQueue | list): Devoirs à préparer
+        revisions (RevisionQueue | list): Cours à réviser, par ordre de priorité
+        subjects (SubjectAllocator | list): Matières d'apprentissage
+        profile (PlanningProfile): Profil de planification compilé
+        result (PlanResult, optional): Résultat à compléter
+        on_day (callable, optional): Appelée avec chaque jour une fois
+                                     planifié (progression) ; une exception
+                                     levée par elle interrompt la
+                                     planification (annulation)
+
+    Returns:
+        PlanResult: Créneaux planifiés et mises à jour à appliquer
+    """
+    if result is None:
+        result = PlanResult()
+
+    homework_queue = (
+        homework if isinstance(homework, HomeworkQueue)
+        else HomeworkQueue(homework, profile.homework_preparation_days)
+    )
+    courses_to_revise = (
+        revisions if isinstance(revisions, RevisionQueue) else RevisionQueue(revisions)
+    )
+    subject_allocator = (
+        subjects if isinstance(subjects, SubjectAllocator) else SubjectAllocator(subjects)
+    )
+    course_index = courses if isinstance(courses, CourseIndex) else CourseIndex(courses)
+    session_duration = profile.session_duration
+    session_step = profile.session_step
+
+    for current_date in dates:
+        week_day = current_date.weekday()
+        courses_to_revise.release(current_date)
+
+        # Ajouter les cours du jour
+        day_courses = course_index.for_date(current_date)
+        for _, _, course in day_courses:
+            result.entries.append((
+                current_date,
+                course['start_time'],
+                course['end_time'],
+                'course',
+                course['name'],
+                f"Cours: {course['name']}"
+            ))
+        daily_courses = len(day_courses)
+
+        free_slots = get_free_slots(current_date, course_index, profile)
+        daily_activities = 0
+
+        for slot_start, slot_end in free_slots:
+            # Si créneau trop court (moins de 1h), ignorer
+            if slot_end - slot_start < 60:
+                continue
+
+            current_time = slot_start
+
+            # Remplir le créneau avec des sessions
+            while current_time + session_duration <= slot_end:
+                session_start = minutes_to_time(current_time)
+                session_end = minutes_to_time(current_time + session_duration)
+                current_time += session_step
+
+                # PRIORITÉ 1: Devoirs urgents (échéance la plus proche)
+                allocation = homework_queue.allocate(current_date)
+                if allocation is not None:
+                    hw, session_number, total_sessions = allocation
+                    description = f"Préparation devoir: {hw['subject']}"
+                    if total_sessions > 1:
+                        description += f" ({session_number}/{total_sessions})"
+                    result.entries.append((
+                        current_date,
+                        session_start,
+                        session_end,
+                        'homework',
+                        hw['subject'],
+                        description
+                    ))
+                    daily_activities += 1
+                    continue
+
+                # PRIORITÉ 2: Révisions (en début de semaine)
+                if courses_to_revise and week_day < 4:
+                    course_to_revise = courses_to_revise.pop()
+                    result.entries.append((
+                        current_date,
+                        session_start,
+                        session_end,
+                        'revision',
+                        course_to_revise['name'],
+                        f"Révision: {course_to_revise['name']}"
+                    ))
+                    result.revised_course_ids.append(course_to_revise['id'])
+                    daily_activities += 1
+                    continue
+
+                # PRIORITÉ 3: Apprentissage (répartition équitable pondérée)
+                subject = subject_allocator.allocate(
+                    session_duration / 60,
+                    datetime.combine(current_date, session_start)
+                )
+                if subject is not None:
+                    result.entries.append((
+                        current_date,
+                        session_start,
+                        session_end,
+                        'learning',
+                        subject['name'],
+                        f"Apprentissage: {subject['name']}"
+                    ))
+                    result.study_hours[subject['name']] = (
+                        result.study_hours.get(subject['name'], 0) + session_duration / 60
+                    )
+                    daily_activities += 1
+
+        result.days.append({
+            'date': current_date,
+            'courses': daily_courses,
+            'activities': daily_activities,
+            'free': bool(free_slots)
+        })
+        if on_day is not None:
+            on_day(current_date)
+
+    return result
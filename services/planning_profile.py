@@ -0,0 +1,166 @@
+"""Profil de planification compilé une seule fois à partir de config.py"""
+
+from datetime import date, datetime
+from config import PLANNING_CONFIG
+
+DAY_NAMES = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
+BREAK_NAMES = ('lunch_break', 'dinner_break')
+
+def _minutes(value, field):
+    """Convertit 'HH:MM' en minutes depuis minuit, avec un message clair"""
+    try:
+        parsed = datetime.strptime(value, '%H:%M')
+    except (TypeError, ValueError):
+        raise ValueError(f"PLANNING_CONFIG['{field}'] invalide: {value!r} (format HH:MM attendu)")
+    return parsed.hour * 60 + parsed.minute
+
+class _Frozen:
+    """Interdit toute modification après construction"""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        # Nécessaire pour copier/transmettre le profil à un autre processus
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+class DayProfile(_Frozen):
+    """
+    Bornes d'une journée type en minutes depuis minuit.
+
+    Attributes:
+        day_start (int): Début de journée
+        day_end (int): Fin de journée
+        breaks (tuple): Pauses fixes (début, fin), triées
+    """
+
+    __slots__ = ('day_start', 'day_end', 'breaks')
+
+    def __init__(self, day_start, day_end, breaks):
+        object.__setattr__(self, 'day_start', day_start)
+        object.__setattr__(self, 'day_end', day_end)
+        object.__setattr__(self, 'breaks', tuple(sorted(breaks)))
+
+    def __repr__(self):
+        return f"DayProfile({self.day_start}-{self.day_end}, breaks={self.breaks})"
+
+class PlanningProfile(_Frozen):
+    """
+    Paramètres de planification validés et pré-calculés : heures en
+    minutes entières, pauses fixes par jour et pas entre deux sessions.
+    Supporte des surcharges par jour de la semaine
+    (PLANNING_CONFIG['weekday_overrides']).
+
+    Utilisation:
+        profile = PlanningProfile.default()
+        day = profile.day(date_obj)
+        day.day_start, day.day_end, day.breaks
+    """
+
+    __slots__ = (
+        'session_duration', 'break_duration', 'session_step',
+        'homework_preparation_days', 'revision_threshold_days', 'days'
+    )
+
+    _default = None
+
+    def __init__(self, planning_config):
+        """
+        Args:
+            planning_config (dict): Paramètres au format de PLANNING_CONFIG
+
+        Raises:
+            ValueError: Si un paramètre est invalide
+        """
+        session_duration = int(planning_config['session_duration'])
+        break_duration = int(planning_config['break_duration'])
+        if session_duration <= 0:
+            raise ValueError("PLANNING_CONFIG['session_duration'] doit être positif")
+        if break_duration < 0:
+            raise ValueError("PLANNING_CONFIG['break_duration'] ne peut pas être négatif")
+
+        overrides = planning_config.get('weekday_overrides') or {}
+        unknown = set(overrides) - set(DAY_NAMES)
+        if unknown:
+            raise ValueError(f"Jours inconnus dans weekday_overrides: {', '.join(sorted(unknown))}")
+
+        days = []
+        for day_name in DAY_NAMES:
+            settings = dict(planning_config)
+            settings.update(overrides.get(day_name, {}))
+            days.append(PlanningProfile._compile_day(settings, day_name))
+
+        object.__setattr__(self, 'session_duration', session_duration)
+        object.__setattr__(self, 'break_duration', break_duration)
+        object.__setattr__(self, 'session_step', session_duration + break_duration)
+        object.__setattr__(self, 'homework_preparation_days',
+                           int(planning_config['homework_preparation_days']))
+        object.__setattr__(self, 'revision_threshold_days',
+                           int(planning_config['revision_threshold_days']))
+        object.__setattr__(self, 'days', tuple(days))
+
+    @staticmethod
+    def _compile_day(settings, day_name):
+        """Valide et convertit les bornes d'une journée"""
+        day_start = _minutes(settings['day_start'], f'{day_name}.day_start')
+        day_end = _minutes(settings['day_end'], f'{day_name}.day_end')
+        if day_start >= day_end:
+            raise ValueError(f"{day_name}: day_start doit précéder day_end")
+
+        breaks = []
+        for break_name in BREAK_NAMES:
+            interval = settings.get(break_name)
+            if not interval:  # None : pas de pause ce jour-là
+                continue
+            start = _minutes(interval[0], f'{day_name}.{break_name}')
+            end = _minutes(interval[1], f'{day_name}.{break_name}')
+            if start >= end:
+                raise ValueError(f"{day_name}: {break_name} doit avoir un début avant la fin")
+            breaks.append((start, end))
+
+        return DayProfile(day_start, day_end, breaks)
+
+    @staticmethod
+    def default():
+        """
+        Profil compilé depuis config.PLANNING_CONFIG (une seule fois).
+
+        Returns:
+            PlanningProfile: Profil partagé par toute l'application
+        """
+        if PlanningProfile._default is None:
+            PlanningProfile._default = PlanningProfile(PLANNING_CONFIG)
+        return PlanningProfile._default
+
+    def day(self, day):
+        """
+        Bornes d'une journée.
+
+        Args:
+            day (date | int): Date ou index du jour (0 = lundi)
+
+        Returns:
+            DayProfile: Bornes et pauses du jour
+        """
+        if isinstance(day, date):
+            day = day.weekday()
+        return self.days[day]
+
+    def __repr__(self):
+        return (f"PlanningProfile(session={self.session_duration}min, "
+                f"break={self.break_duration}min, days={self.days})")
+
+    @staticmethod
+    def format_minutes(minutes):
+        """Affiche des minutes depuis minuit au format 12h ou 12h30"""
+        hours, mins = divmod(minutes, 60)
+        return f"{hours}h{mins:02d}" if mins else f"{hours}h"
@@ -1,11 +1,19 @@
 """Service de planification intelligente des activités"""
 
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta, time, date
+from services import planner
 from models.course import Course
 from models.homework import Homework
 from models.learning import LearningSubject
+from models.plan_cache import PlanCache
 from database.db_manager import DatabaseManager
-from config import PLANNING_CONFIG
+from services.planning_profile import PlanningProfile
+from services.slot_writer import SlotWriter
+
+class GenerationCancelled(Exception):
+    """Levée quand une génération est annulée (rien n'a été écrit)"""
 
 class Scheduler:
     """
@@ -13,30 +21,98 @@ class Scheduler:
     Génère automatiquement un planning équilibré pour la semaine.
     """
     
+    # Fonctions prévenues après chaque écriture du planning (subscribe)
+    _listeners = []
+    _listeners_lock = threading.Lock()
+    
+    # Une seule écriture du planning à la fois dans le processus
+    # (génération de l'interface, tâche nocturne, formulaires)
+    _write_lock = threading.RLock()
+    
+    @staticmethod
+    @contextmanager
+    def exclusive(blocking=True):
+        """
+        Réserve l'écriture du planning (generate_schedule_range et
+        regenerate_days la prennent eux-mêmes ; réentrant).
+        
+        Args:
+            blocking (bool): Attendre la fin d'une écriture en cours
+        
+        Yields:
+            bool: False si une écriture est en cours et blocking=False
+        """
+        acquired = Scheduler._write_lock.acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                Scheduler._write_lock.release()
+    
+    @staticmethod
+    def subscribe(callback):
+        """
+        Enregistre une fonction appelée après chaque modification du
+        planning, une fois la transaction validée.
+        
+        La fonction est appelée dans le thread qui a écrit le planning :
+        elle doit rendre la main rapidement (par exemple positionner un
+        threading.Event).
+        
+        Args:
+            callback (callable): Fonction (premier jour, fin exclue)
+        """
+        with Scheduler._listeners_lock:
+            if callback not in Scheduler._listeners:
+                Scheduler._listeners.append(callback)
+    
+    @staticmethod
+    def unsubscribe(callback):
+        """
+        Retire une fonction enregistrée par subscribe.
+        
+        Args:
+            callback (callable): Fonction à retirer
+        """
+        with Scheduler._listeners_lock:
+            if callback in Scheduler._listeners:
+                Scheduler._listeners.remove(callback)
+    
+    @staticmethod
+    def _notify_changed(start_date, end_date):
+        """Prévient les abonnés qu'une période du planning a changé"""
+        with Scheduler._listeners_lock:
+            listeners = list(Scheduler._listeners)
+        for callback in listeners:
+            try:
+                callback(start_date, end_date)
+            except Exception as e:
+                print(f"⚠️  Erreur d'un abonné au planning: {e}")
+    
+    @staticmethod
+    def _changed(report):
+        """Indique si SlotWriter a modifié au moins une ligne"""
+        return bool(report['inserted'] or report['updated'] or report['deleted'])
+    
     @staticmethod
     def parse_time(time_str):
         """Convertit une chaîne HH:MM en objet time"""
-        return datetime.strptime(time_str, '%H:%M').time()
+        return planner.parse_time(time_str)
     
     @staticmethod
     def time_to_minutes(t):
         """Convertit un objet time en minutes depuis minuit"""
-        if isinstance(t, str):
-            t = Scheduler.parse_time(t)
-        return t.hour * 60 + t.minute
+        return planner.time_to_minutes(t)
     
     @staticmethod
     def minutes_to_time(minutes):
         """Convertit des minutes depuis minuit en objet time"""
-        hours = minutes // 60
-        mins = minutes % 60
-        return time(hour=min(hours, 23), minute=min(mins, 59))
+        return planner.minutes_to_time(minutes)
     
     @staticmethod
     def get_day_name(date_obj):
         """Retourne le nom du jour en français"""
-        days = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
-        return days[date_obj.weekday()]
+        return planner.get_day_name(date_obj)
     
     @staticmethod
     def get_free_slots(date_obj, courses):
@@ -50,73 +126,25 @@ class Scheduler:
         Returns:
             list: Liste de tuples (start_minutes, end_minutes) représentant les créneaux libres
         """
-        day_start = Scheduler.time_to_minutes(PLANNING_CONFIG['day_start'])
-        day_end = Scheduler.time_to_minutes(PLANNING_CONFIG['day_end'])
-        
-        # Créneaux occupés
-        occupied = []
-        
-        # Ajouter les cours du jour
-        day_name = Scheduler.get_day_name(date_obj)
-        for course in courses:
-            course_date = course['week_date']
-            if isinstance(course_date, str):
-                course_date = datetime.strptime(course_date, '%Y-%m-%d').date()
-            
-            if course_date == date_obj:
-                start = Scheduler.time_to_minutes(course['start_time'])
-                end = Scheduler.time_to_minutes(course['end_time'])
-                occupied.append((start, end))
-        
-        # Ajouter les pauses repas
-        lunch_start = Scheduler.time_to_minutes(PLANNING_CONFIG['lunch_break'][0])
-        lunch_end = Scheduler.time_to_minutes(PLANNING_CONFIG['lunch_break'][1])
-        occupied.append((lunch_start, lunch_end))
-        
-        dinner_start = Scheduler.time_to_minutes(PLANNING_CONFIG['dinner_break'][0])
-        dinner_end = Scheduler.time_to_minutes(PLANNING_CONFIG['dinner_break'][1])
-        occupied.append((dinner_start, dinner_end))
-        
-        # Trier les créneaux occupés
-        occupied.sort()
-        
-        # Fusionner les créneaux qui se chevauchent
-        merged = []
-        for start, end in occupied:
-            if merged and start <= merged[-1][1]:
-                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
-            else:
-                merged.append((start, end))
-        
-        # Calculer les créneaux libres
-        free_slots = []
-        current = day_start
-        
-        for start, end in merged:
-            if current < start:
-                free_slots.append((current, start))
-            current = max(current, end)
-        
-        if current < day_end:
-            free_slots.append((current, day_end))
-        
-        return free_slots
+        return planner.get_free_slots(date_obj, courses, PlanningProfile.default())
     
     @staticmethod
     def generate_weekly_schedule(week_start_date):
         """
         Génère le planning complet pour une semaine.
         
-        Algorithme:
+        Algorithme (exécuté dans une seule transaction):
         1. Supprimer l'ancien planning de la semaine
         2. Récupérer tous les cours, devoirs et matières
-        3. Pour chaque jour:
+        3. Planifier la semaine (services.planner.plan_week, sans E/S):
            - Ajouter les cours
            - Calculer les créneaux libres
            - Allouer dans l'ordre de priorité:
-             a) Devoirs urgents (≤3 jours)
+             a) Devoirs urgents (≤3 jours), échéance la plus proche d'abord
              b) Révisions de cours anciens (>7 jours)
-             c) Apprentissage rotatif des 8 matières
+             c) Apprentissage des matières au prorata de leur priorité
+        4. Appliquer en une fois les révisions, le temps d'étude et
+           l'insertion des créneaux
         
         Args:
             week_start_date (date): Date du lundi de la semaine à planifier
@@ -124,167 +152,425 @@ class Scheduler:
         Returns:
             int: Nombre total d'activités planifiées
         """
-        if isinstance(week_start_date, str):
-            week_start_date = datetime.strptime(week_start_date, '%Y-%m-%d').date()
+        return Scheduler.generate_schedule_range(week_start_date, weeks=1)
+    
+    @staticmethod
+    def generate_schedule_range(start_date, weeks=1, progress=None, cancel=None):
+        """
+        Génère le planning de plusieurs semaines consécutives en une passe.
         
-        # Supprimer l'ancien planning de cette semaine
-        query = """
-            DELETE FROM schedule_slots 
-            WHERE date >= %s AND date < DATE_ADD(%s, INTERVAL 7 DAY)
+        Une requête par table pour tout l'horizon, une planification
+        continue (devoirs et équilibre des matières passent d'une semaine
+        à l'autre), puis l'écriture des seules différences avec le
+        planning existant (SlotWriter), le tout dans une transaction.
+        Les créneaux inchangés gardent leur id et leur état de
+        notification, les révisions déjà planifiées sont conservées et le
+        temps d'étude n'est corrigé que de la différence.
+        
+        Si les données d'entrée sont identiques à celles de la dernière
+        génération de la même période (PlanCache), la génération s'arrête
+        après les lectures, sans aucune écriture.
+        
+        Args:
+            start_date (date): Date du lundi de la première semaine
+            weeks (int): Nombre de semaines à planifier (défaut: 1)
+            progress (callable, optional): Appelée avec (étape, total, libellé)
+                                           après la lecture, chaque jour
+                                           planifié et l'écriture
+            cancel (threading.Event, optional): Annule la génération entre
+                                                deux jours s'il est positionné
+        
+        Returns:
+            int: Nombre total d'activités planifiées
+        
+        Raises:
+            GenerationCancelled: Si cancel a été positionné avant l'écriture
+                                 (la transaction est annulée)
         """
-        DatabaseManager.execute_query(query, (week_start_date, week_start_date))
+        with Scheduler.exclusive():
+            return Scheduler._generate_schedule_range(start_date, weeks, progress, cancel)
+    
+    @staticmethod
+    def _generate_schedule_range(start_date, weeks, progress, cancel):
+        """Corps de generate_schedule_range (appelé sous Scheduler.exclusive)"""
+        if isinstance(start_date, str):
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        if weeks < 1:
+            raise ValueError("Le nombre de semaines doit être au moins 1")
+        
+        profile = PlanningProfile.default()
+        end_date = start_date + timedelta(days=7 * weeks)
+        
+        # Étapes : lecture (2), un jour par jour planifié, écriture
+        total_steps = 7 * weeks + 3
         
-        # Récupérer les données
-        courses = Course.get_courses_by_week(week_start_date)
-        homework_list = list(Homework.get_urgent_homework())
-        courses_to_revise = list(Course.get_courses_for_revision())
-        subjects = LearningSubject.get_least_studied()
+        def report(step, label):
+            if cancel is not None and cancel.is_set():
+                raise GenerationCancelled("Génération annulée")
+            if progress is not None:
+                progress(step, total_steps, label)
         
-        schedule_entries = []
-        subject_index = 0
+        def on_day(day):
+            label = f"{Scheduler.get_day_name(day)} {day.strftime('%d/%m')}"
+            report(2 + (day - start_date).days, label)
         
-        print(f"\n📅 Génération du planning pour la semaine du {week_start_date}")
-        print(f"   📚 {len(courses)} cours")
-        print(f"   ✏️  {len(homework_list)} devoirs urgents")
-        print(f"   🔄 {len(courses_to_revise)} cours à réviser")
-        print(f"   📖 {len(subjects)} matières d'apprentissage\n")
+        report(0, "Lecture des données")
         
-        # Planifier pour chaque jour de la semaine
-        for day_offset in range(7):
-            current_date = week_start_date + timedelta(days=day_offset)
-            day_name = Scheduler.get_day_name(current_date)
+        # Une seule connexion et un seul commit pour toute la génération :
+        # la lecture et la réécriture de l'horizon sont atomiques
+        with DatabaseManager.transaction():
+            inputs = Scheduler.load_inputs(start_date, end_date, profile)
+            existing, courses, homework_list, courses_to_revise, subjects = inputs
             
-            print(f"📌 {day_name} {current_date.strftime('%d/%m/%Y')}")
+            # Mêmes données que lors de la dernière génération : rien à refaire
+            fingerprint = Scheduler._fingerprint(start_date, weeks, profile, inputs)
+            cached = PlanCache.lookup(start_date, weeks, fingerprint)
+            if cached is not None:
+                print(f"\n♻️  Planning du {start_date} inchangé ({cached} activités), "
+                      "aucune écriture nécessaire\n")
+                if progress is not None:
+                    progress(total_steps, total_steps, "Planning inchangé")
+                return cached
+            report(1, "Planification")
             
-            # Ajouter les cours du jour
-            daily_courses = 0
-            for course in courses:
-                course_date = course['week_date']
-                if isinstance(course_date, str):
-                    course_date = datetime.strptime(course_date, '%Y-%m-%d').date()
-                
-                if course_date == current_date:
-                    schedule_entries.append((
-                        current_date, 
-                        course['start_time'], 
-                        course['end_time'],
-                        'course', 
-                        course['name'], 
-                        f"Cours: {course['name']}"
-                    ))
-                    daily_courses += 1
+            if weeks == 1:
+                print(f"\n📅 Génération du planning pour la semaine du {start_date}")
+            else:
+                print(f"\n📅 Génération du planning sur {weeks} semaines à partir du {start_date}")
+            print(f"   📚 {len(courses)} cours")
+            print(f"   ✏️  {len(homework_list)} devoirs urgents")
+            print(f"   🔄 {len(courses_to_revise)} cours à réviser")
+            print(f"   📖 {len(subjects)} matières d'apprentissage\n")
             
-            if daily_courses > 0:
-                print(f"   🎓 {daily_courses} cours planifiés")
+            # Planifier (calcul pur, aucune requête)
+            plan = planner.plan_range(
+                start_date, weeks, courses, homework_list,
+                courses_to_revise, subjects, profile, on_day
+            )
+            Scheduler._print_plan(plan)
             
-            # Obtenir les créneaux libres
-            free_slots = Scheduler.get_free_slots(current_date, courses)
+            # Dernier point d'annulation : rien n'est encore écrit
+            report(total_steps - 1, "Écriture du planning")
             
-            if not free_slots:
-                print(f"   ⚠️  Aucun créneau libre\n")
-                continue
+            # Appliquer les mises à jour
+            write_report = Scheduler.apply_plan(plan, existing)
+            
+            # Mémoriser l'empreinte de l'état obtenu : c'est lui que verra
+            # la prochaine génération
+            inputs = Scheduler.load_inputs(start_date, end_date, profile)
+            PlanCache.store(
+                start_date, weeks,
+                Scheduler._fingerprint(start_date, weeks, profile, inputs),
+                len(plan.entries)
+            )
+        
+        # Après le commit : les abonnés relisent des données validées
+        if Scheduler._changed(write_report):
+            Scheduler._notify_changed(start_date, end_date)
+        
+        print(f"✅ Planning généré: {len(plan.entries)} activités au total")
+        Scheduler._print_report(write_report)
+        if progress is not None:
+            progress(total_steps, total_steps, "Planning généré")
+        
+        return len(plan.entries)
+    
+    @staticmethod
+    def load_inputs(start_date, end_date, profile):
+        """
+        Charge tout ce dont dépend le planning d'une période. Un devoir dû
+        après la période se prépare pendant celle-ci si sa fenêtre de
+        préparation y commence.
+        
+        Args:
+            start_date (date): Premier jour de la période
+            end_date (date): Fin de la période (exclue)
+            profile (PlanningProfile): Profil (fenêtre de préparation par défaut)
+        
+        Returns:
+            tuple: (créneaux existants, cours, devoirs, révisions, matières)
+        """
+        existing = SlotWriter.load_range(start_date, end_date)
+        courses = Course.get_courses_between(start_date, end_date)
+        homework_list = Homework.get_homework_to_prepare_between(
+            start_date, end_date, profile.homework_preparation_days
+        )
+        courses_to_revise = Scheduler.planned_revisions(existing)
+        courses_to_revise.extend(Course.get_courses_for_revision())
+        subjects = Scheduler._subjects_before(existing)
+        return existing, courses, homework_list, courses_to_revise, subjects
+    
+    @staticmethod
+    def _fingerprint(start_date, weeks, profile, inputs):
+        """
+        Empreinte des données d'entrée d'une génération : si elle ne change
+        pas, le planning produit serait identique. Les créneaux existants
+        en font partie, donc toute modification du planning (même
+        partielle, via regenerate_days) invalide l'empreinte.
+        
+        Returns:
+            str: Empreinte SHA-256
+        """
+        existing, courses, homework_list, courses_to_revise, subjects = inputs
+        slots = [
+            (slot['date'], slot['start_time'], slot['end_time'],
+             slot['activity_type'], slot['subject'], slot['description'])
+            for slot in existing
+        ]
+        subject_state = [
+            (subject['name'], subject['priority'],
+             round(float(subject['total_hours'] or 0), 6), subject['last_studied'])
+            for subject in subjects
+        ]
+        return PlanCache.fingerprint(
+            start_date, weeks, sorted(profile.__getstate__().items()), slots,
+            courses, homework_list, courses_to_revise, subject_state
+        )
+    
+    @staticmethod
+    def affected_dates_for_course(course):
+        """
+        Dates dont le planning dépend d'un cours (ajout, suppression ou
+        modification).
+        
+        Args:
+            course (dict): Cours avec week_date et day_of_week
+        
+        Returns:
+            list: Date effective du cours
+        """
+        return [planner.CourseIndex.course_date(course)]
+    
+    @staticmethod
+    def affected_dates_for_homework(homework):
+        """
+        Dates dont le planning dépend d'un devoir : sa fenêtre de
+        préparation (preparation_days du devoir, sinon celle du profil,
+        comme planner.HomeworkQueue), jusqu'à l'échéance incluse.
+        
+        Args:
+            homework (dict): Devoir avec due_date et preparation_days
+        
+        Returns:
+            list: Dates de la fenêtre de préparation
+        """
+        due_date = planner.to_date(homework['due_date'])
+        start = planner.preparation_start(
+            homework, PlanningProfile.default().homework_preparation_days
+        )
+        return [start + timedelta(days=offset) for offset in range((due_date - start).days + 1)]
+    
+    @staticmethod
+    def regenerate_days(dates):
+        """
+        Re-planifie uniquement les jours donnés, à partir de l'état actuel.
+        
+        Seuls les jours à venir déjà planifiés sont concernés (un jour
+        jamais généré le sera avec sa semaine). Les révisions déjà
+        placées sur ces jours sont conservées, les sessions de devoirs
+        planifiées sur d'autres jours sont décomptées, le temps d'étude
+        des matières est corrigé de la différence et seuls les créneaux
+        modifiés sont réécrits.
+        
+        Args:
+            dates (iterable): Dates touchées par une modification
+        
+        Returns:
+            int: Nombre d'activités réécrites
+        """
+        with Scheduler.exclusive():
+            return Scheduler._regenerate_days(dates)
+    
+    @staticmethod
+    def _regenerate_days(dates):
+        """Corps de regenerate_days (appelé sous Scheduler.exclusive)"""
+        today = date.today()
+        dates = sorted(set(
+            datetime.strptime(d, '%Y-%m-%d').date() if isinstance(d, str) else d
+            for d in dates
+        ))
+        dates = [d for d in dates if d >= today]
+        if not dates:
+            return 0
+        
+        profile = PlanningProfile.default()
+        
+        with DatabaseManager.transaction():
+            existing = SlotWriter.load_dates(dates)
+            planned_dates = sorted(set(row['date'] for row in existing))
+            if not planned_dates:
+                return 0
+            
+            first, last = planned_dates[0], planned_dates[-1]
+            
+            # Données couvrant les jours à re-planifier. Un cours tombe dans
+            # la semaine (lundi-dimanche) de sa week_date, qui n'est pas
+            # forcément un lundi : lire les semaines entières
+            courses = Course.get_courses_between(
+                first - timedelta(days=first.weekday()),
+                last + timedelta(days=7 - last.weekday())
+            )
+            homework_list = Homework.get_homework_to_prepare_between(
+                first, last + timedelta(days=1), profile.homework_preparation_days
+            )
+            subjects = Scheduler._subjects_before(existing)
             
-            # Planifier dans les créneaux libres
-            daily_activities = 0
+            # Sessions de devoirs déjà placées sur les autres jours de leurs
+            # fenêtres, rattachées à leur devoir (pas seulement à leur matière)
+            rows = []
+            if homework_list:
+                query = """
+                    SELECT date, subject FROM schedule_slots 
+                    WHERE activity_type = 'homework' AND date >= %s AND date <= %s
+                    ORDER BY date, start_time
+                """
+                window_start = min(
+                    planner.preparation_start(hw, profile.homework_preparation_days)
+                    for hw in homework_list
+                )
+                window_end = max(planner.to_date(hw['due_date']) for hw in homework_list)
+                rows = DatabaseManager.execute_query(
+                    query, (window_start, window_end), fetch=True, cache=False
+                )
+            owners = planner.assign_placed_sessions(
+                [(row['date'], row['subject']) for row in rows], homework_list,
+                profile.homework_preparation_days
+            )
+            placed = {}
+            for row, homework_id in zip(rows, owners):
+                if homework_id is not None and planner.to_date(row['date']) not in planned_dates:
+                    placed[homework_id] = placed.get(homework_id, 0) + 1
             
-            for slot_start, slot_end in free_slots:
-                available_minutes = slot_end - slot_start
-                
-                # Si créneau trop court (moins de 1h), ignorer
-                if available_minutes < 60:
-                    continue
-                
-                current_time = slot_start
-                
-                # Remplir le créneau avec des sessions
-                while current_time + PLANNING_CONFIG['session_duration'] <= slot_end:
-                    session_start = Scheduler.minutes_to_time(current_time)
-                    session_end = Scheduler.minutes_to_time(
-                        current_time + PLANNING_CONFIG['session_duration']
-                    )
-                    
-                    activity_added = False
-                    
-                    # PRIORITÉ 1: Devoirs urgents
-                    for hw in homework_list[:]:  # Copie pour pouvoir modifier
-                        due_date = hw['due_date']
-                        if isinstance(due_date, str):
-                            due_date = datetime.strptime(due_date, '%Y-%m-%d').date()
-                        
-                        days_until_due = (due_date - current_date).days
-                        
-                        if 0 <= days_until_due <= PLANNING_CONFIG['homework_preparation_days']:
-                            schedule_entries.append((
-                                current_date, 
-                                session_start, 
-                                session_end,
-                                'homework', 
-                                hw['subject'], 
-                                f"Préparation devoir: {hw['subject']}"
-                            ))
-                            homework_list.remove(hw)
-                            activity_added = True
-                            daily_activities += 1
-                            break
-                    
-                    if activity_added:
-                        current_time += PLANNING_CONFIG['session_duration'] + PLANNING_CONFIG['break_duration']
-                        continue
-                    
-                    # PRIORITÉ 2: Révisions (en début de semaine)
-                    if courses_to_revise and day_offset < 4:
-                        course_to_revise = courses_to_revise.pop(0)
-                        schedule_entries.append((
-                            current_date, 
-                            session_start, 
-                            session_end,
-                            'revision', 
-                            course_to_revise['name'],
-                            f"Révision: {course_to_revise['name']}"
-                        ))
-                        Course.mark_as_revised(course_to_revise['id'])
-                        activity_added = True
-                        daily_activities += 1
-                        current_time += PLANNING_CONFIG['session_duration'] + PLANNING_CONFIG['break_duration']
-                        continue
-                    
-                    # PRIORITÉ 3: Apprentissage rotatif
-                    if subjects:
-                        subject = subjects[subject_index % len(subjects)]
-                        schedule_entries.append((
-                            current_date, 
-                            session_start, 
-                            session_end,
-                            'learning', 
-                            subject['name'],
-                            f"Apprentissage: {subject['name']}"
-                        ))
-                        
-                        # Mettre à jour le temps d'étude
-                        hours_studied = PLANNING_CONFIG['session_duration'] / 60
-                        LearningSubject.update_study_time(subject['name'], hours_studied)
-                        
-                        subject_index += 1
-                        daily_activities += 1
-                    
-                    current_time += PLANNING_CONFIG['session_duration'] + PLANNING_CONFIG['break_duration']
+            remaining_homework = []
+            for hw in homework_list:
+                sessions = max(1, int(hw.get('estimated_sessions') or 1))
+                already = placed.get(hw['id'], 0)
+                if sessions > already:
+                    remaining_homework.append(dict(hw, estimated_sessions=sessions - already))
             
-            if daily_activities > 0:
-                print(f"   ✅ {daily_activities} activités d'apprentissage planifiées")
+            # Révisions déjà planifiées sur ces jours : conservées
+            revisions = Scheduler.planned_revisions(existing)
+            
+            plan = planner.plan_days(
+                planned_dates, courses, remaining_homework,
+                revisions, subjects, profile
+            )
+            report = Scheduler.apply_plan(plan, existing)
+        
+        if Scheduler._changed(report):
+            Scheduler._notify_changed(first, last + timedelta(days=1))
+        
+        print(f"🔁 Planning mis à jour: {len(planned_dates)} jour(s), {len(plan.entries)} activités")
+        Scheduler._print_report(report)
+        
+        return len(plan.entries)
+    
+    @staticmethod
+    def _print_plan(plan):
+        """
+        Affiche le résumé d'un planning calculé : jour par jour pour une
+        semaine, semaine par semaine au-delà.
+        """
+        if len(plan.days) > 7:
+            for index in range(0, len(plan.days), 7):
+                week = plan.days[index:index + 7]
+                courses = sum(day['courses'] for day in week)
+                activities = sum(day['activities'] for day in week)
+                print(f"📌 Semaine du {week[0]['date'].strftime('%d/%m/%Y')}: "
+                      f"🎓 {courses} cours, ✅ {activities} activités")
+            print()
+            return
+        
+        for day in plan.days:
+            current_date = day['date']
+            print(f"📌 {Scheduler.get_day_name(current_date)} {current_date.strftime('%d/%m/%Y')}")
+            
+            if day['courses'] > 0:
+                print(f"   🎓 {day['courses']} cours planifiés")
+            
+            if not day['free']:
+                print(f"   ⚠️  Aucun créneau libre\n")
+                continue
+            
+            if day['activities'] > 0:
+                print(f"   ✅ {day['activities']} activités d'apprentissage planifiées")
             print()
+    
+    @staticmethod
+    def _subjects_before(existing):
+        """
+        État des matières sans les heures des créneaux qui vont être
+        replanifiés : une régénération à l'identique redonne alors la
+        même répartition (et n'écrit presque rien).
+        
+        Args:
+            existing (list): Créneaux chargés par SlotWriter
+        
+        Returns:
+            list: Matières avec total_hours corrigé
+        """
+        old_hours = SlotWriter.learning_hours(existing)
+        subjects = LearningSubject.get_subject_states()
+        if not old_hours:
+            return subjects
+        return [
+            dict(subject, total_hours=max(
+                0.0, float(subject['total_hours'] or 0) - old_hours.get(subject['name'], 0)
+            ))
+            for subject in subjects
+        ]
+    
+    @staticmethod
+    def planned_revisions(existing):
+        """
+        Révisions déjà présentes dans des créneaux existants, à replanifier
+        à partir de leur date (leurs cours sont déjà marqués comme révisés).
+        
+        Args:
+            existing (list): Créneaux chargés par SlotWriter
+        
+        Returns:
+            list: Révisions {'id': None, 'name', 'not_before'} dans l'ordre du planning
+        """
+        return [
+            {'id': None, 'name': slot['subject'], 'not_before': slot['date']}
+            for slot in existing if slot['activity_type'] == 'revision'
+        ]
+    
+    @staticmethod
+    def apply_plan(plan, existing):
+        """
+        Écrit un planning calculé : révisions, temps d'étude et créneaux.
+        À appeler dans une transaction : au plus une requête par table et
+        par type d'écriture.
         
-        # Insérer tous les créneaux dans la base de données
-        if schedule_entries:
-            query = """
-                INSERT INTO schedule_slots 
-                (date, start_time, end_time, activity_type, subject, description)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            DatabaseManager.execute_many(query, schedule_entries)
+        Args:
+            plan (PlanResult): Résultat de planner.plan_range ou plan_days
+            existing (list): Créneaux actuels de la période replanifiée
         
-        print(f"✅ Planning généré: {len(schedule_entries)} activités au total\n")
+        Returns:
+            dict: Lignes de schedule_slots insérées, modifiées, supprimées, inchangées
+        """
+        Course.mark_many_as_revised([
+            course_id for course_id in plan.revised_course_ids if course_id is not None
+        ])
+        
+        # Ne corriger que la différence de temps d'étude
+        old_hours = SlotWriter.learning_hours(existing)
+        study_hours = {}
+        for name in set(plan.study_hours) | set(old_hours):
+            delta = plan.study_hours.get(name, 0) - old_hours.get(name, 0)
+            if abs(delta) > 1e-9:
+                study_hours[name] = delta
+        LearningSubject.add_study_time_bulk(study_hours)
         
-        return len(schedule_entries)
+        return SlotWriter.apply(existing, plan.entries)
+    
+    @staticmethod
+    def _print_report(report):
+        """Affiche le nombre de lignes écrites par SlotWriter"""
+        print(f"   ✍️  {report['inserted']} ajoutées, {report['updated']} modifiées, "
+              f"{report['deleted']} supprimées, {report['unchanged']} inchangées\n")
     
     @staticmethod
     def get_weekly_summary(week_start_date):
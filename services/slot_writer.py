@@ -0,0 +1,156 @@
+"""Écriture différentielle des créneaux de planning (schedule_slots)"""
+
+from database.db_manager import DatabaseManager
+from services import planner
+
+class SlotWriter:
+    """
+    Applique un planning calculé en ne touchant que les lignes qui changent.
+
+    Les créneaux existants et les nouveaux sont comparés par
+    (date, heure de début, type d'activité, matière) :
+    - absent de la base : INSERT
+    - présent avec une fin ou une description différente : UPDATE
+    - présent en base mais plus dans le planning : DELETE
+    Un créneau inchangé garde son id et son état de notification.
+
+    Utilisation (dans une transaction):
+        existing = SlotWriter.load_range(start_date, end_date)
+        report = SlotWriter.apply(existing, plan.entries)
+    """
+
+    COLUMNS = "id, date, start_time, end_time, activity_type, subject, description, notified"
+
+    @staticmethod
+    def load_range(start_date, end_date):
+        """
+        Charge les créneaux d'une période.
+
+        Args:
+            start_date (date): Premier jour (inclus)
+            end_date (date): Fin de la période (exclue)
+
+        Returns:
+            list: Créneaux existants
+        """
+        query = f"""
+            SELECT {SlotWriter.COLUMNS} FROM schedule_slots
+            WHERE date >= %s AND date < %s
+            ORDER BY date, start_time
+        """
+        return DatabaseManager.execute_query(
+            query, (start_date, end_date), fetch=True, cache=False
+        )
+
+    @staticmethod
+    def load_dates(dates):
+        """
+        Charge les créneaux de jours donnés.
+
+        Args:
+            dates (list): Jours à charger
+
+        Returns:
+            list: Créneaux existants
+        """
+        if not dates:
+            return []
+        placeholders = ", ".join(["%s"] * len(dates))
+        query = f"""
+            SELECT {SlotWriter.COLUMNS} FROM schedule_slots
+            WHERE date IN ({placeholders})
+            ORDER BY date, start_time
+        """
+        return DatabaseManager.execute_query(query, tuple(dates), fetch=True, cache=False)
+
+    @staticmethod
+    def _key(slot_date, start_time, activity_type, subject):
+        """Clé de comparaison d'un créneau (heures normalisées en minutes)"""
+        return (slot_date, planner.time_to_minutes(start_time), activity_type, subject)
+
+    @staticmethod
+    def apply(existing, entries):
+        """
+        Écrit la différence entre les créneaux existants et le planning.
+        À appeler dans une transaction : au plus une requête par type
+        d'écriture.
+
+        Args:
+            existing (list): Créneaux chargés par load_range ou load_dates
+            entries (list): Tuples (date, début, fin, type, matière, description)
+
+        Returns:
+            dict: Nombre de lignes insérées, modifiées, supprimées et inchangées
+        """
+        current = {}
+        duplicates = []
+        for row in existing:
+            key = SlotWriter._key(row['date'], row['start_time'], row['activity_type'], row['subject'])
+            if key in current:
+                duplicates.append(row['id'])
+            else:
+                current[key] = row
+
+        inserts = []
+        updates = []
+        unchanged = 0
+        for entry in entries:
+            slot_date, start_time, end_time, activity_type, subject, description = entry
+            row = current.pop(SlotWriter._key(slot_date, start_time, activity_type, subject), None)
+            if row is None:
+                inserts.append(entry)
+            elif (planner.time_to_minutes(row['end_time']) != planner.time_to_minutes(end_time)
+                  or row['description'] != description):
+                updates.append((end_time, description, row['id']))
+            else:
+                unchanged += 1
+
+        deletes = [row['id'] for row in current.values()] + duplicates
+
+        if deletes:
+            placeholders = ", ".join(["%s"] * len(deletes))
+            query = f"DELETE FROM schedule_slots WHERE id IN ({placeholders})"
+            DatabaseManager.execute_query(query, tuple(deletes))
+
+        if updates:
+            query = """
+                UPDATE schedule_slots
+                SET end_time = %s, description = %s
+                WHERE id = %s
+            """
+            DatabaseManager.execute_many(query, updates)
+
+        if inserts:
+            query = """
+                INSERT INTO schedule_slots
+                (date, start_time, end_time, activity_type, subject, description)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """
+            DatabaseManager.execute_many(query, inserts)
+
+        return {
+            'inserted': len(inserts),
+            'updated': len(updates),
+            'deleted': len(deletes),
+            'unchanged': unchanged
+        }
+
+    @staticmethod
+    def learning_hours(slots):
+        """
+        Heures d'apprentissage par matière dans des créneaux existants
+        (pour ne corriger total_hours que de la différence).
+
+        Args:
+            slots (list): Créneaux chargés par load_range ou load_dates
+
+        Returns:
+            dict: Heures par nom de matière
+        """
+        hours = {}
+        for slot in slots:
+            if slot['activity_type'] == 'learning':
+                minutes = (planner.time_to_minutes(slot['end_time'])
+                           - planner.time_to_minutes(slot['start_time']))
+                hours[slot['subject']] = hours.get(slot['subject'], 0) + minutes / 60
+        return hours
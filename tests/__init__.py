@@ -0,0 +1,19 @@
+"""
+Tests du Learning Planner : python -m pytest, ou
+python -m unittest discover -s tests -t .
+
+Les tests utilisent le backend SQLite en mémoire : ni MySQL, ni pymysql,
+plyer ou customtkinter ne sont nécessaires. La configuration est
+modifiée ici, avant tout import de DatabaseManager.
+"""
+
+import config
+
+config.DB_BACKEND = 'sqlite'
+config.SQLITE_CONFIG['path'] = ':memory:'
+
+def reset_database():
+    """Repart d'une base en mémoire neuve (schéma et matières par défaut)"""
+    from database.db_manager import DatabaseManager
+    DatabaseManager.close_pool()
+    DatabaseManager.clear_cache()
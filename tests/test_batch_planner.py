@@ -0,0 +1,130 @@
+"""Tests de la planification par lots (services/batch_planner.py, SQLite)"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+import config
+from tests import reset_database
+from database.db_manager import DatabaseManager
+from models.course import Course
+from models.homework import Homework
+from services import planner
+from services.batch_planner import BatchPlanner
+from services.planning_profile import PlanningProfile
+from services.scheduler import Scheduler
+
+# Lundi de référence (calcul pur)
+MONDAY = date(2030, 1, 7)
+
+def next_monday():
+    """Lundi à venir"""
+    today = date.today()
+    return today + timedelta(days=7 - today.weekday())
+
+def homework(homework_id, subject, due_date, sessions=1):
+    """Devoir au format du modèle Homework"""
+    return {
+        'id': homework_id, 'subject': subject, 'due_date': due_date,
+        'due_time': '08:00', 'estimated_sessions': sessions
+    }
+
+class PlanRunsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = PlanningProfile.default()
+        self.courses = [{
+            'id': 1, 'name': 'Algo', 'day_of_week': 'Lundi', 'start_time': '09:00',
+            'end_time': '12:00', 'week_date': MONDAY, 'needs_revision': False
+        }]
+        self.subjects = [{'name': 'Python', 'priority': 1, 'total_hours': 0,
+                          'last_studied': None}]
+
+    def test_multi_week_matches_chained_runs(self):
+        homework_list = [homework(1, 'TP IP', MONDAY + timedelta(days=8), 2)]
+        whole = planner.plan_range(
+            MONDAY, 2, self.courses, homework_list, [], self.subjects, self.profile
+        )
+        runs = planner.plan_runs(
+            [(MONDAY, 1), (MONDAY + timedelta(days=7), 1)], self.courses,
+            homework_list, [], self.subjects, self.profile
+        )
+        self.assertEqual(runs[0].entries + runs[1].entries, whole.entries)
+        # Le devoir n'est préparé qu'une fois sur l'ensemble des suites
+        sessions = [entry for run in runs for entry in run.entries if entry[3] == 'homework']
+        self.assertEqual(len(sessions), 2)
+
+class BatchPlannerTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+        self.directory = tempfile.mkdtemp()
+        patcher = mock.patch.dict(
+            config.LEARNER_CONFIG, sqlite_path=os.path.join(self.directory, '{learner}.db')
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.addCleanup(DatabaseManager.close_pool)
+
+        self.monday = next_monday()
+        for learner in ('alice', 'bob'):
+            with DatabaseManager.use_learner(learner):
+                DatabaseManager.initialize_database()
+                Course.add_course('Algo', 'Mardi', '09:00', '12:00', self.monday.isoformat())
+                Homework.add_homework('TP IP', 'Rendu', (self.monday + timedelta(days=3)).isoformat(),
+                                      '10:00', 3, 2)
+
+        self.changes = []
+        Scheduler.subscribe(self.on_change)
+        self.addCleanup(Scheduler.unsubscribe, self.on_change)
+
+    def on_change(self, start_date, end_date):
+        self.changes.append((start_date, end_date))
+
+    def run_batch(self, jobs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return BatchPlanner.run(jobs, workers=1)
+
+    def slots(self, learner):
+        with DatabaseManager.use_learner(learner):
+            return DatabaseManager.execute_query(
+                "SELECT * FROM schedule_slots", fetch=True, cache=False
+            )
+
+    def test_each_learner_written_to_own_database(self):
+        report = self.run_batch([('alice', self.monday), ('bob', self.monday)])
+        self.assertEqual({job['learner'] for job in report['results']}, {'alice', 'bob'})
+        for learner in ('alice', 'bob'):
+            sessions = [slot for slot in self.slots(learner)
+                        if slot['activity_type'] == 'homework']
+            self.assertEqual(len(sessions), 2)
+        # La base par défaut n'est pas touchée
+        self.assertEqual(
+            DatabaseManager.execute_query("SELECT * FROM schedule_slots", fetch=True, cache=False),
+            []
+        )
+
+    def test_no_notification_for_other_learner_database(self):
+        self.run_batch([('alice', self.monday)])
+        self.assertEqual(self.changes, [])
+
+    def test_notification_for_default_database(self):
+        path = os.path.join(self.directory, 'alice.db')
+        with mock.patch.dict(config.SQLITE_CONFIG, path=path):
+            self.assertTrue(DatabaseManager.is_default_database('alice'))
+            self.assertFalse(DatabaseManager.is_default_database('bob'))
+            self.run_batch([('alice', self.monday), ('bob', self.monday)])
+        self.assertEqual(self.changes, [(self.monday, self.monday + timedelta(days=7))])
+
+    def test_invalid_learner_rejected(self):
+        with self.assertRaises(ValueError):
+            DatabaseManager.is_default_database('../alice')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Tests de la ligne de commande (cli.py, SQLite en mémoire)"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from tests import reset_database
+import cli
+from database.db_manager import DatabaseManager
+from models.course import Course
+from models.homework import Homework
+
+def run_cli(*argv):
+    """
+    Exécute la ligne de commande.
+
+    Returns:
+        tuple: (code de sortie, sortie standard, sortie d'erreur)
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    # main() ferme les connexions en sortant : la base en mémoire serait perdue
+    with mock.patch.object(DatabaseManager, 'close_pool'), \
+            contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        code = cli.main(list(argv))
+    return code, stdout.getvalue(), stderr.getvalue()
+
+class CliTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_generate_json(self):
+        monday = date.today() - timedelta(days=date.today().weekday()) + timedelta(days=7)
+        Course.add_course('Algo', 'Mardi', '09:00', '12:00', monday.isoformat())
+        code, stdout, _ = run_cli('generate', '--week', monday.isoformat(), '--weeks', '2', '--json')
+        self.assertEqual(code, 0)
+        result = json.loads(stdout)
+        self.assertEqual(result['start_date'], monday.isoformat())
+        self.assertEqual(result['weeks'], 2)
+        self.assertGreater(result['entries'], 0)
+        slots = DatabaseManager.execute_query(
+            "SELECT COUNT(*) AS total FROM schedule_slots", fetch=True, cache=False
+        )
+        self.assertEqual(slots[0]['total'], result['entries'])
+
+    def test_generate_range_rounds_to_whole_weeks(self):
+        code, stdout, _ = run_cli('generate', '--range', '2030-01-09', '2030-01-22', '--json')
+        self.assertEqual(code, 0)
+        result = json.loads(stdout)
+        self.assertEqual(result['start_date'], '2030-01-07')
+        self.assertEqual(result['weeks'], 3)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(SystemExit):
+            run_cli('generate', '--week', '25/03/2030')
+        code, _, stderr = run_cli('generate', '--weeks', '0')
+        self.assertEqual(code, 1)
+        self.assertIn('1 et 520', stderr)
+        code, _, _ = run_cli('stats', '--learner', 'alice', '--learner', 'bob')
+        self.assertEqual(code, 1)
+
+    def test_stats_json(self):
+        Homework.add_homework('Maths', 'Exercices', '2030-01-10', '08:00')
+        code, stdout, _ = run_cli('stats', '--json', '--queries')
+        self.assertEqual(code, 0)
+        stats = json.loads(stdout)
+        self.assertEqual(stats['homework']['total'], 1)
+        self.assertGreater(stats['learning']['total_subjects'], 0)
+        self.assertIn('queries', stats)
+
+    def test_export_import_round_trip(self):
+        Course.add_course('Algo', 'Lundi', '09:00', '12:00', '2030-01-07')
+        Homework.add_homework('Maths', 'Exercices', '2030-01-10', '08:00', 3, 2)
+        path = os.path.join(self.directory.name, 'sauvegarde.jsonl')
+        code, _, _ = run_cli('export', '--output', path, '--json')
+        self.assertEqual(code, 0)
+        with open(path, encoding='utf-8') as export_file:
+            records = [json.loads(line) for line in export_file]
+        self.assertEqual(
+            [record['row']['name'] for record in records if record['table'] == 'courses'], ['Algo']
+        )
+        subjects = sum(record['table'] == 'learning_subjects' for record in records)
+
+        # Sans --replace : les matières existantes sont ignorées, le reste est ajouté
+        code, stdout, _ = run_cli('import', path, '--json')
+        self.assertEqual(code, 0)
+        result = json.loads(stdout)
+        self.assertEqual(result['skipped'], {'learning_subjects': subjects})
+        self.assertEqual(result['imported'], {'courses': 1, 'homework': 1})
+        self.assertEqual(len(Course.get_all_courses()), 2)
+
+        # Avec --replace : les tables sont vidées et les id conservés
+        code, _, _ = run_cli('import', path, '--replace')
+        self.assertEqual(code, 0)
+        homework = Homework.get_all_homework()
+        self.assertEqual(len(homework), 1)
+        self.assertEqual(homework[0]['estimated_sessions'], 2)
+
+    def test_import_rejects_unknown_table(self):
+        path = os.path.join(self.directory.name, 'invalide.jsonl')
+        with open(path, 'w', encoding='utf-8') as import_file:
+            import_file.write(json.dumps({'table': 'courses', 'row': {
+                'name': 'Algo', 'day_of_week': 'Lundi', 'start_time': '09:00',
+                'end_time': '12:00', 'week_date': '2030-01-07'
+            }}) + '\n')
+            import_file.write(json.dumps({'table': 'users', 'row': {}}) + '\n')
+        code, _, stderr = run_cli('import', path)
+        self.assertEqual(code, 1)
+        self.assertIn('Ligne 2', stderr)
+        # Une seule transaction : rien n'est importé
+        self.assertEqual(Course.get_all_courses(), [])
+
+    def test_notify_once_marks_reminders(self):
+        start = (datetime.now() + timedelta(minutes=5)).replace(second=0, microsecond=0)
+        DatabaseManager.execute_query(
+            """INSERT INTO schedule_slots (date, start_time, end_time, activity_type, subject, description)
+               VALUES (%s, %s, %s, %s, %s, %s)""",
+            (start.date(), start.time(), (start + timedelta(hours=1)).time(),
+             'learning', 'Python', 'Apprentissage: Python')
+        )
+        code, stdout, _ = run_cli('notify-once', '--json')
+        self.assertEqual(code, 0)
+        result = json.loads(stdout)
+        self.assertEqual([reminder['subject'] for reminder in result['reminders']], ['Python'])
+        self.assertEqual(len(result['notifications']), 1)
+
+        # Déjà notifié : plus de rappel
+        code, stdout, _ = run_cli('notify-once', '--json')
+        self.assertEqual(json.loads(stdout)['reminders'], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests des devoirs : file EDF (services/planner.py) et colonne estimated_sessions"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from tests import reset_database
+import config
+from database.db_manager import DatabaseManager
+from models.homework import Homework
+from services import planner
+
+# Lundi de référence
+MONDAY = date(2030, 1, 7)
+
+def homework(homework_id, subject, due_date, sessions=1):
+    """Devoir au format du modèle Homework"""
+    return {
+        'id': homework_id, 'subject': subject, 'due_date': due_date,
+        'due_time': '08:00', 'estimated_sessions': sessions
+    }
+
+class HomeworkQueueTest(unittest.TestCase):
+
+    def test_earliest_deadline_first(self):
+        queue = planner.HomeworkQueue([
+            homework(1, 'Maths', MONDAY + timedelta(days=3)),
+            homework(2, 'Réseaux', MONDAY + timedelta(days=1))
+        ], 3)
+        self.assertEqual(queue.allocate(MONDAY)[0]['id'], 2)
+        self.assertEqual(queue.allocate(MONDAY)[0]['id'], 1)
+        self.assertIsNone(queue.allocate(MONDAY))
+
+    def test_same_deadline_most_effort_first(self):
+        due = MONDAY + timedelta(days=2)
+        queue = planner.HomeworkQueue([homework(1, 'Maths', due, 1), homework(2, 'SQL', due, 2)], 3)
+        self.assertEqual(queue.allocate(MONDAY)[0]['id'], 2)
+
+    def test_multi_session_homework_stays_queued(self):
+        queue = planner.HomeworkQueue([homework(1, 'Maths', MONDAY + timedelta(days=2), 3)], 3)
+        allocations = [queue.allocate(MONDAY) for _ in range(4)]
+        self.assertEqual([a[1:] for a in allocations[:3]], [(1, 3), (2, 3), (3, 3)])
+        self.assertIsNone(allocations[3])
+
+    def test_outside_preparation_window(self):
+        queue = planner.HomeworkQueue([homework(1, 'Maths', MONDAY + timedelta(days=10))], 3)
+        self.assertIsNone(queue.allocate(MONDAY))
+        self.assertEqual(len(queue), 1)
+
+    def test_own_preparation_window(self):
+        due = MONDAY + timedelta(days=6)
+        long_window = dict(homework(1, 'Maths', due), preparation_days=6)
+        short_window = dict(homework(2, 'SQL', MONDAY + timedelta(days=5)), preparation_days=1)
+        queue = planner.HomeworkQueue([short_window, long_window], 3)
+        # Fenêtre de 6 jours ouverte dès lundi, celle de 1 jour seulement samedi
+        self.assertEqual(queue.allocate(MONDAY)[0]['id'], 1)
+        self.assertIsNone(queue.allocate(MONDAY + timedelta(days=3)))
+        self.assertEqual(queue.allocate(MONDAY + timedelta(days=4))[0]['id'], 2)
+
+    def test_past_due_homework_dropped(self):
+        queue = planner.HomeworkQueue([homework(1, 'Maths', MONDAY - timedelta(days=1))], 3)
+        self.assertIsNone(queue.allocate(MONDAY))
+        self.assertEqual(len(queue), 0)
+
+class EstimatedSessionsColumnTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        self.path = os.path.join(directory, 'old.db')
+        previous = config.SQLITE_CONFIG['path']
+        config.SQLITE_CONFIG['path'] = self.path
+        self.addCleanup(config.SQLITE_CONFIG.__setitem__, 'path', previous)
+        self.addCleanup(DatabaseManager.close_pool)
+
+    def test_existing_database_is_upgraded(self):
+        # Base créée avant l'ajout de la colonne
+        conn = sqlite3.connect(self.path)
+        conn.execute("""
+            CREATE TABLE homework (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, subject VARCHAR(255) NOT NULL,
+                description TEXT, due_date DATE NOT NULL, due_time TIME NOT NULL,
+                preparation_days INT DEFAULT 3, status VARCHAR(20) DEFAULT 'pending',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("INSERT INTO homework (subject, due_date, due_time) "
+                     "VALUES ('Maths', '2030-01-09', '08:00')")
+        conn.commit()
+        conn.close()
+
+        Homework.add_homework('SQL', 'desc', '2030-01-10', '08:00', 3, 2)
+        rows = DatabaseManager.execute_query(
+            "SELECT subject, estimated_sessions FROM homework ORDER BY id", fetch=True, cache=False
+        )
+        self.assertEqual(rows, [{'subject': 'Maths', 'estimated_sessions': 1},
+                                {'subject': 'SQL', 'estimated_sessions': 2}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Tests des tâches de fond (services/jobs.py)"""
+
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from services.jobs import CronSchedule, Job, JobScheduler, MaintenanceJobs
+
+class CronScheduleTest(unittest.TestCase):
+
+    def test_invalid_expressions(self):
+        for expression in ('* * * *', '60 * * * *', '* 24 * * *', '5-1 * * * *', '*/0 * * * *'):
+            with self.assertRaises(ValueError, msg=expression):
+                CronSchedule(expression)
+
+    def test_fields(self):
+        cron = CronSchedule('0-30/10 7,19 * * 1-5')
+        self.assertEqual(cron.minutes, {0, 10, 20, 30})
+        self.assertEqual(cron.hours, {7, 19})
+        # Cron 1-5 (lundi-vendredi) devient 0-4 côté Python
+        self.assertEqual(cron.weekdays, {0, 1, 2, 3, 4})
+
+    def test_next_after_same_day(self):
+        cron = CronSchedule('30 7 * * *')
+        self.assertEqual(cron.next_after(datetime(2030, 1, 7, 6, 0)), datetime(2030, 1, 7, 7, 30))
+
+    def test_next_after_is_strict(self):
+        cron = CronSchedule('30 7 * * *')
+        self.assertEqual(cron.next_after(datetime(2030, 1, 7, 7, 30)), datetime(2030, 1, 8, 7, 30))
+
+    def test_weekdays_skip_weekend(self):
+        cron = CronSchedule('30 7 * * 1-5')
+        # Vendredi 11/01/2030 après 7h30 -> lundi 14/01/2030
+        self.assertEqual(cron.next_after(datetime(2030, 1, 11, 8, 0)), datetime(2030, 1, 14, 7, 30))
+
+    def test_sunday_as_zero_or_seven(self):
+        expected = datetime(2030, 1, 13, 0, 0)
+        self.assertEqual(CronSchedule('0 0 * * 0').next_after(datetime(2030, 1, 7)), expected)
+        self.assertEqual(CronSchedule('0 0 * * 7').next_after(datetime(2030, 1, 7)), expected)
+
+    def test_day_of_month_or_weekday(self):
+        # Jour du mois et jour de semaine restreints : l'un OU l'autre
+        cron = CronSchedule('0 12 15 * 1')
+        self.assertEqual(cron.next_after(datetime(2030, 1, 8)), datetime(2030, 1, 14, 12, 0))
+        self.assertEqual(cron.next_after(datetime(2030, 1, 14, 13)), datetime(2030, 1, 15, 12, 0))
+
+    def test_impossible_date(self):
+        with self.assertRaises(ValueError):
+            CronSchedule('0 0 31 2 *').next_after(datetime(2030, 1, 1))
+
+class JobTest(unittest.TestCase):
+
+    def test_interval_or_cron_required(self):
+        with self.assertRaises(ValueError):
+            Job('tâche', lambda: None)
+        with self.assertRaises(ValueError):
+            Job('tâche', lambda: None, interval=60, cron='* * * * *')
+        with self.assertRaises(ValueError):
+            Job('tâche', lambda: None, interval=0)
+
+    def test_schedule_next(self):
+        now = datetime(2030, 1, 7, 12, 0)
+        job = Job('tâche', lambda: None, interval=60, initial_delay=5)
+        self.assertEqual(job.schedule_next(now, first=True), now + timedelta(seconds=5))
+        self.assertEqual(job.schedule_next(now), now + timedelta(seconds=60))
+        cron_job = Job('cron', lambda: None, cron='0 13 * * *')
+        self.assertEqual(cron_job.schedule_next(now), datetime(2030, 1, 7, 13, 0))
+
+    def test_jitter_stays_in_range(self):
+        now = datetime(2030, 1, 7, 12, 0)
+        job = Job('tâche', lambda: None, interval=60, jitter=10)
+        for _ in range(20):
+            due = job.schedule_next(now)
+            self.assertTrue(now + timedelta(seconds=60) <= due <= now + timedelta(seconds=70))
+
+class JobSchedulerTest(unittest.TestCase):
+
+    def test_run_now_records_failures(self):
+        def fail():
+            raise RuntimeError("boom")
+        jobs = JobScheduler()
+        jobs.add(Job('échec', fail, interval=60))
+        self.assertTrue(jobs.run_now('échec'))
+        stats = jobs.stats()['échec']
+        self.assertEqual((stats['runs'], stats['failures'], stats['last_error']), (1, 1, 'boom'))
+
+    def test_single_flight(self):
+        started, release = threading.Event(), threading.Event()
+        def slow():
+            started.set()
+            release.wait(2)
+        jobs = JobScheduler()
+        jobs.add(Job('lente', slow, interval=60))
+        worker = threading.Thread(target=jobs.run_now, args=('lente',))
+        worker.start()
+        started.wait(2)
+        self.assertFalse(jobs.run_now('lente'))
+        release.set()
+        worker.join(2)
+        self.assertEqual(jobs.stats()['lente']['skipped'], 1)
+
+    def test_duplicate_name(self):
+        jobs = JobScheduler()
+        jobs.add(Job('tâche', lambda: None, interval=60))
+        with self.assertRaises(ValueError):
+            jobs.add(Job('tâche', lambda: None, interval=60))
+
+    def test_started_scheduler_runs_due_job(self):
+        ran = threading.Event()
+        jobs = JobScheduler()
+        jobs.add(Job('immédiate', ran.set, interval=60, initial_delay=0))
+        jobs.start()
+        try:
+            self.assertTrue(ran.wait(2))
+        finally:
+            jobs.stop()
+
+class RecordingWeekCache:
+    """Cache des semaines minimal (l'interface et customtkinter ne sont pas importés)"""
+
+    def __init__(self):
+        self.entries = {}
+        self.loaded = []
+
+    def get(self, week_start):
+        if week_start not in self.entries:
+            self.loaded.append(week_start)
+            self.entries[week_start] = week_start
+        return self.entries[week_start]
+
+class CacheWarmupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = RecordingWeekCache()
+
+    def test_current_and_next_week_loaded_once(self):
+        today = datetime.now().date()
+        monday = today - timedelta(days=today.weekday())
+        MaintenanceJobs.cache_warmup(self.cache)
+        self.assertEqual(self.cache.loaded, [monday, monday + timedelta(days=7)])
+        MaintenanceJobs.cache_warmup(self.cache)
+        self.assertEqual(len(self.cache.loaded), 2)
+
+    def test_without_interface(self):
+        MaintenanceJobs.cache_warmup(None)
+
+    def test_registered_job_warms_cache(self):
+        jobs = MaintenanceJobs.create_scheduler(None, week_cache=self.cache)
+        self.assertTrue(jobs.run_now('cache_warmup'))
+        self.assertEqual(jobs.stats()['cache_warmup']['failures'], 0)
+        self.assertEqual(len(self.cache.entries), 2)
+
+if __name__ == '__main__':
+    unittest.main()
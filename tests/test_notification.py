@@ -0,0 +1,185 @@
+"""Tests du service de notifications (services/notification.py, SQLite en mémoire)"""
+
+import contextlib
+import io
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from tests import reset_database
+from config import NOTIFICATION_CONFIG
+from database.db_manager import DatabaseManager
+from services.notification import NotificationService
+from services.notification_sinks import CallbackSink, NotificationSink
+from services.scheduler import Scheduler
+
+ADVANCE = timedelta(minutes=NOTIFICATION_CONFIG['advance_minutes'])
+
+def add_slot(start, subject='Python', activity_type='learning'):
+    """Ajoute un créneau d'une heure commençant à `start`"""
+    DatabaseManager.execute_query(
+        """INSERT INTO schedule_slots (date, start_time, end_time, activity_type, subject, description)
+           VALUES (%s, %s, %s, %s, %s, %s)""",
+        (start.date(), start.time(), (start + timedelta(hours=1)).time(),
+         activity_type, subject, f"Apprentissage: {subject}")
+    )
+
+def update_calls():
+    """Requêtes UPDATE de schedule_slots exécutées depuis le démarrage"""
+    return sum(
+        entry['calls'] for entry in DatabaseManager.stats()['queries']
+        if entry['query'].lower().startswith('update schedule_slots')
+    )
+
+class FailingSink(NotificationSink):
+    """Sink dont tous les envois échouent"""
+
+    name = 'failing'
+
+    def send(self, notifications):
+        raise OSError("hors service")
+
+def notified_subjects():
+    """Matières des créneaux marqués notifiés"""
+    return sorted(
+        slot['subject'] for slot in DatabaseManager.execute_query(
+            "SELECT subject FROM schedule_slots WHERE notified = TRUE", fetch=True, cache=False
+        )
+    )
+
+class NotificationLoopTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+        self.toasts = []
+        self.received = threading.Event()
+        self.service = NotificationService(notifier=self.notify)
+        self.addCleanup(self.service.stop)
+
+    def notify(self, title, message, timeout):
+        self.toasts.append((title, message, time.monotonic()))
+        self.received.set()
+
+    def test_reminder_fires_on_time(self):
+        start = (datetime.now() + ADVANCE + timedelta(seconds=2)).replace(microsecond=0)
+        add_slot(start)
+        delay = (start - ADVANCE - datetime.now()).total_seconds()
+        started = time.monotonic()
+        self.service.start()
+        self.assertTrue(self.received.wait(5))
+        self.service.flush()
+        # Ni en avance, ni avec le retard d'une scrutation périodique
+        self.assertGreaterEqual(self.toasts[0][2] - started, delay - 0.05)
+        self.assertLess(self.toasts[0][2] - started, delay + 1.0)
+        self.assertIn('Python', self.toasts[0][1])
+        self.assertEqual(notified_subjects(), ['Python'])
+
+    def test_overdue_reminder_fires_at_start(self):
+        add_slot(datetime.now() + timedelta(minutes=5))
+        self.service.start()
+        self.assertTrue(self.received.wait(2))
+
+    def test_schedule_change_reloads_timers(self):
+        self.service.start()
+        time.sleep(0.1)
+        self.assertEqual(self.toasts, [])
+        add_slot(datetime.now() + timedelta(minutes=5))
+        today = datetime.now().date()
+        Scheduler._notify_changed(today, today + timedelta(days=1))
+        self.assertTrue(self.received.wait(2))
+
+    def test_change_outside_window_ignored(self):
+        today = datetime.now().date()
+        self.service._reload = False
+        self.service.schedule_changed(today + timedelta(days=2), today + timedelta(days=9))
+        self.service.schedule_changed(today - timedelta(days=7), today)
+        self.assertFalse(self.service._reload)
+        self.service.schedule_changed(today + timedelta(days=1), today + timedelta(days=2))
+        self.assertTrue(self.service._reload)
+
+    def test_stop_is_immediate(self):
+        add_slot(datetime.now() + timedelta(hours=3))
+        self.service.start()
+        time.sleep(0.1)
+        started = time.monotonic()
+        self.service.stop()
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertFalse(self.service.running)
+
+    def test_no_query_while_idle(self):
+        add_slot(datetime.now() + timedelta(hours=3))
+        self.service.start()
+        time.sleep(0.2)
+        executed = DatabaseManager.stats()['total_calls']
+        time.sleep(0.5)
+        self.assertEqual(DatabaseManager.stats()['total_calls'], executed)
+
+class NotificationDispatchTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+        self.toasts = []
+        self.start = (datetime.now() + timedelta(minutes=5)).replace(second=0, microsecond=0)
+
+    def notify(self, title, message, timeout):
+        self.toasts.append((title, message))
+
+    def test_same_minute_coalesced_and_acked_in_one_update(self):
+        for second, subject in enumerate(('Python', 'SQL', 'Docker')):
+            add_slot(self.start.replace(second=10 * second), subject)
+        add_slot(self.start + timedelta(minutes=1), 'Anglais')
+        service = NotificationService(notifier=self.notify)
+        updates = update_calls()
+        activities = service.check_once()
+        self.assertEqual(len(activities), 4)
+        self.assertEqual(len(self.toasts), 2)
+        self.assertIn('(3 activités)', self.toasts[0][0])
+        self.assertEqual(self.toasts[0][1].splitlines()[:3],
+                         ['Apprentissage: Python', 'Apprentissage: SQL', 'Apprentissage: Docker'])
+        # Une requête par notification, pas par activité
+        self.assertEqual(update_calls() - updates, 2)
+        self.assertEqual(notified_subjects(), ['Anglais', 'Docker', 'Python', 'SQL'])
+
+    def test_acked_on_first_successful_sink(self):
+        add_slot(self.start)
+        service = NotificationService(sinks=[FailingSink(), CallbackSink(self.notify)])
+        service.check_once()
+        self.assertEqual(notified_subjects(), ['Python'])
+        self.assertEqual(service._retry_at, {})
+
+    def test_failed_reminder_retried_later_and_wakes_loop(self):
+        add_slot(self.start)
+        service = NotificationService(sinks=[FailingSink()])
+        service._reload = False
+        with contextlib.redirect_stdout(io.StringIO()):
+            service.check_once()
+        self.assertEqual(notified_subjects(), [])
+        self.assertTrue(service._reload)
+        self.assertTrue(service._wakeup.is_set())
+
+        # Replacé dans le tas à l'heure du nouvel essai, pas tout de suite
+        now = datetime.now()
+        service._load_timers(now)
+        remind_at = service._timers[0][0]
+        self.assertGreater(remind_at, now + timedelta(seconds=service.SEND_RETRY_DELAY - 5))
+        self.assertEqual(service._fire_due(now), [])
+
+    def test_failed_update_rewritten_before_reload(self):
+        add_slot(self.start)
+        service = NotificationService(notifier=self.notify)
+        with mock.patch.object(service, '_mark_many_as_notified', side_effect=OSError("verrou")), \
+                contextlib.redirect_stdout(io.StringIO()):
+            service.check_once()
+        self.assertEqual(len(self.toasts), 1)
+        self.assertTrue(service._wakeup.is_set())
+        self.assertEqual(notified_subjects(), [])
+
+        # Le rechargement écrit l'acquittement au lieu de renvoyer le rappel
+        service._load_timers(datetime.now())
+        self.assertEqual(service._timers, [])
+        self.assertEqual(notified_subjects(), ['Python'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""Tests des destinations de notifications (services/notification_sinks.py)"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+from services.notification_sinks import (
+    CallbackSink, HttpSink, JsonLinesSink, NotificationSink, PlyerSink, TokenBucket,
+    create_sinks, make_notification
+)
+
+class RecordingSink(NotificationSink):
+    """Sink qui mémorise les lots reçus"""
+
+    name = 'recording'
+
+    def __init__(self, delay=0, **options):
+        super().__init__(**options)
+        self.delay = delay
+        self.batches = []
+
+    def send(self, notifications):
+        time.sleep(self.delay)
+        self.batches.append([item['title'] for item in notifications])
+
+def notification(title, activity_ids=()):
+    """Notification de test"""
+    return make_notification(title, f"Apprentissage: {title}\ncommence dans 15 minutes", 10,
+                             activity_ids)
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_unlimited(self):
+        bucket = TokenBucket(None, 1)
+        stop = threading.Event()
+        self.assertEqual([bucket.acquire(stop) for _ in range(100)], [0.0] * 100)
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(20, 3)
+        stop = threading.Event()
+        self.assertEqual([bucket.acquire(stop) for _ in range(3)], [0.0] * 3)
+        started = time.monotonic()
+        waited = bucket.acquire(stop)
+        self.assertGreater(waited, 0)
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+    def test_wait_interrupted(self):
+        bucket = TokenBucket(0.01, 1)
+        stop = threading.Event()
+        bucket.acquire(stop)
+        stop.set()
+        self.assertIsNone(bucket.acquire(stop))
+
+class NotificationSinkTest(unittest.TestCase):
+
+    def test_batches_within_window(self):
+        sink = RecordingSink(batch_size=3, batch_window_ms=200)
+        self.addCleanup(sink.close)
+        for title in 'ABCDE':
+            sink.submit(notification(title))
+        self.assertTrue(sink.flush(2))
+        self.assertEqual(sink.batches, [['A', 'B', 'C'], ['D', 'E']])
+        stats = sink.stats()
+        self.assertEqual((stats['sent'], stats['batches'], stats['pending']), (5, 2, 0))
+
+    def test_rate_limit_one_token_per_batch(self):
+        sink = RecordingSink(rate=10, burst=1)
+        self.addCleanup(sink.close)
+        started = time.monotonic()
+        for title in 'ABC':
+            sink.submit(notification(title))
+        self.assertTrue(sink.flush(2))
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+        self.assertGreater(sink.stats()['throttled_ms'], 0)
+
+    def test_full_queue_drops_and_reports(self):
+        results = []
+        sink = RecordingSink(delay=0.2, queue_size=1)
+        sink.listener = lambda items, name, status, at: results.append((len(items), status))
+        self.addCleanup(sink.close)
+        accepted = [sink.submit(notification(title)) for title in 'ABC']
+        # A est en cours d'envoi ou en file, la file d'une place refuse la suite
+        self.assertIn(False, accepted)
+        self.assertTrue(sink.flush(2))
+        self.assertIn((1, 'dropped'), results)
+        self.assertIn((1, 'sent'), results)
+        self.assertEqual(sink.stats()['dropped'], accepted.count(False))
+
+    def test_error_reported_to_listener(self):
+        results = []
+        sink = CallbackSink(mock.Mock(side_effect=OSError("hors service")))
+        sink.listener = lambda items, name, status, at: results.append((name, status))
+        self.addCleanup(sink.close)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sink.submit(notification('A'))
+            self.assertTrue(sink.flush(2))
+        self.assertEqual(results, [('callback', 'error')])
+        self.assertEqual(sink.stats()['errors'], 1)
+
+    def test_slow_sink_does_not_delay_others(self):
+        slow, fast = RecordingSink(delay=0.5), RecordingSink()
+        self.addCleanup(slow.close)
+        self.addCleanup(fast.close)
+        for sink in (slow, fast):
+            sink.submit(notification('A'))
+        self.assertTrue(fast.flush(0.2))
+        self.assertFalse(slow.flush(0))
+
+    def test_close_abandons_throttled_queue(self):
+        results = []
+        sink = RecordingSink(rate=0.01, burst=1)
+        sink.listener = lambda items, name, status, at: results.append(status)
+        for title in 'AB':
+            sink.submit(notification(title))
+        started = time.monotonic()
+        sink.close(timeout=0.2)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(results, ['sent', 'dropped'])
+
+class SinkImplementationsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_jsonl_one_line_per_notification(self):
+        path = os.path.join(self.directory.name, 'notifications.jsonl')
+        sink = JsonLinesSink(path=path, batch_size=10)
+        sink.send([notification('A', [1]), notification('B', [2, 3])])
+        with open(path, encoding='utf-8') as log:
+            lines = [json.loads(line) for line in log]
+        self.assertEqual([line['activity_ids'] for line in lines], [[1], [2, 3]])
+        self.assertIn('sent_at', lines[0])
+
+    def test_http_posts_each_batch(self):
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers['Content-Length'])
+                received.append(json.loads(self.rfile.read(length)))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        sink = HttpSink(url=f"http://127.0.0.1:{server.server_port}/notifications",
+                        batch_size=2, batch_window_ms=200)
+        self.addCleanup(sink.close)
+        for title in 'ABC':
+            sink.submit(notification(title))
+        self.assertTrue(sink.flush(5))
+        self.assertEqual(
+            [[item['title'] for item in body['notifications']] for body in received],
+            [['A', 'B'], ['C']]
+        )
+
+    def test_plyer_batch_becomes_one_summary(self):
+        plyer = types.ModuleType('plyer')
+        plyer.notification = mock.Mock()
+        with mock.patch.dict(sys.modules, plyer=plyer):
+            PlyerSink().send([notification(f"Matière {index}") for index in range(40)])
+        self.assertEqual(plyer.notification.notify.call_count, 1)
+        options = plyer.notification.notify.call_args.kwargs
+        self.assertEqual(options['title'], "🔔 40 rappels")
+        self.assertTrue(options['message'].startswith("Apprentissage: Matière 0\n"))
+        self.assertLessEqual(len(options['message']), PlyerSink.MAX_MESSAGE_LENGTH)
+        self.assertTrue(options['message'].endswith("…"))
+
+    def test_create_sinks(self):
+        sinks = create_sinks([
+            {'type': 'jsonl', 'path': 'log.jsonl', 'batch_size': 5},
+            {'type': 'http', 'url': 'http://127.0.0.1:1/', 'rate': 2, 'burst': 4}
+        ])
+        self.assertEqual([sink.name for sink in sinks], ['jsonl', 'http'])
+        self.assertEqual(sinks[0].batch_size, 5)
+        self.assertEqual(sinks[1].bucket.burst, 4)
+        with self.assertRaises(ValueError):
+            create_sinks([{'type': 'pigeon'}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Tests du suivi des rappels (services/notification_stats.py)"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from tests import reset_database
+from database.db_manager import DatabaseManager
+from services.notification import NotificationService
+from services.notification_stats import NotificationStats, RollingHistogram
+
+# Heure de rappel de référence
+SCHEDULED = datetime(2030, 1, 7, 8, 45)
+
+class RollingHistogramTest(unittest.TestCase):
+
+    def test_percentiles_and_buckets(self):
+        histogram = RollingHistogram()
+        for value in (5, 20, 20, 400, 70000):
+            histogram.add(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 5)
+        self.assertEqual(snapshot['p50_ms'], 20)
+        self.assertEqual(snapshot['max_ms'], 70000)
+        self.assertEqual(snapshot['histogram']['<=10ms'], 1)
+        self.assertEqual(snapshot['histogram']['<=50ms'], 2)
+        self.assertEqual(snapshot['histogram']['<=500ms'], 1)
+        self.assertEqual(snapshot['histogram']['>60000ms'], 1)
+
+    def test_window_and_sample_limit(self):
+        histogram = RollingHistogram(window_seconds=60, samples=3)
+        now = time.time()
+        histogram.add(1, now - 120)
+        histogram.add(2, now)
+        self.assertEqual(histogram.snapshot(now)['count'], 1)
+        for value in range(10):
+            histogram.add(value, now)
+        self.assertEqual(histogram.snapshot(now)['count'], 3)
+
+    def test_empty(self):
+        snapshot = RollingHistogram().snapshot()
+        self.assertEqual((snapshot['count'], snapshot['p99_ms'], snapshot['max_ms']), (0, 0, 0))
+
+class NotificationStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = NotificationStats(traces=3)
+
+    def test_lateness_from_scheduled_time(self):
+        self.stats.record_detected(1, 'Python', SCHEDULED, SCHEDULED - timedelta(hours=1))
+        self.stats.record_dispatched(1, SCHEDULED, SCHEDULED + timedelta(milliseconds=300))
+        snapshot = self.stats.snapshot()
+        self.assertEqual(snapshot['lateness']['max_ms'], 300)
+        self.assertEqual(snapshot['late_detected'], 0)
+
+    def test_late_detection_not_counted_as_lateness(self):
+        # Créneau ajouté après son heure de rappel : parti dès sa détection
+        detected = SCHEDULED + timedelta(minutes=5)
+        self.stats.record_detected(1, 'Python', SCHEDULED, detected)
+        self.stats.record_dispatched(1, SCHEDULED, detected + timedelta(milliseconds=20))
+        snapshot = self.stats.snapshot()
+        self.assertEqual(snapshot['lateness']['max_ms'], 20)
+        self.assertEqual(snapshot['late_detected'], 1)
+
+    def test_detected_once(self):
+        for _ in range(3):
+            self.stats.record_detected(1, 'Python', SCHEDULED, SCHEDULED)
+        self.assertEqual(self.stats.snapshot()['detected'], 1)
+
+    def test_missed_counted_once_and_rate(self):
+        self.stats.record_dispatched(1, SCHEDULED, SCHEDULED)
+        for _ in range(2):
+            self.stats.record_missed(2)
+        snapshot = self.stats.snapshot()
+        self.assertEqual(snapshot['missed'], 1)
+        self.assertEqual(snapshot['miss_rate'], 0.5)
+
+    def test_delivery_and_failures(self):
+        self.stats.record_detected(1, 'Python', SCHEDULED, SCHEDULED)
+        notification = {'activity_ids': [1], 'created_at': time.time() - 0.1}
+        self.stats.record_delivery(notification, 'jsonl', 'sent', time.time())
+        self.stats.record_delivery(notification, 'http', 'error', time.time())
+        self.stats.record_delivery(notification, 'plyer', 'dropped', time.time())
+        self.stats.record_failure('queue_full', 4)
+        snapshot = self.stats.snapshot()
+        self.assertEqual(snapshot['delivered'], 1)
+        self.assertGreaterEqual(snapshot['delivery']['max_ms'], 100)
+        self.assertEqual(snapshot['failures'],
+                         {'queue_full': 4, 'sink_error': 1, 'sink_dropped': 1})
+        results = snapshot['recent'][0]['results']
+        self.assertEqual({name: result['status'] for name, result in results.items()},
+                         {'jsonl': 'sent', 'http': 'error', 'plyer': 'dropped'})
+
+    def test_memory_bounded(self):
+        for slot_id in range(10):
+            self.stats.record_detected(slot_id, 'Python', SCHEDULED, SCHEDULED)
+            self.stats.record_missed(100 + slot_id)
+        snapshot = self.stats.snapshot()
+        self.assertEqual([trace['slot_id'] for trace in snapshot['recent']], [7, 8, 9])
+        self.assertEqual(len(self.stats._missed), 3)
+        self.assertEqual(snapshot['missed'], 10)
+
+    def test_dump_json(self):
+        self.stats.record_missed(1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stats.json')
+            self.stats.dump_json(path, extra={'sinks': {'jsonl': {'sent': 0}}})
+            with open(path, encoding='utf-8') as dump:
+                data = json.load(dump)
+        self.assertEqual(data['missed'], 1)
+        self.assertEqual(data['sinks'], {'jsonl': {'sent': 0}})
+
+class NotificationServiceStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+
+    def add_slot(self, start, subject):
+        DatabaseManager.execute_query(
+            """INSERT INTO schedule_slots (date, start_time, end_time, activity_type, subject, description)
+               VALUES (%s, %s, %s, %s, %s, %s)""",
+            (start.date(), start.time(), (start + timedelta(hours=1)).time(),
+             'learning', subject, f"Apprentissage: {subject}")
+        )
+
+    def test_service_records_dispatch_delivery_and_missed(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        self.add_slot(now + timedelta(minutes=5), 'Python')
+        # Commencé aujourd'hui sans rappel (sauf juste après minuit)
+        started = now - timedelta(minutes=30)
+        missed = int(started.date() == now.date())
+        if missed:
+            self.add_slot(started, 'SQL')
+        service = NotificationService(notifier=lambda title, message, timeout: None)
+        service.check_once()
+        stats = service.stats()
+        self.assertEqual((stats['detected'], stats['dispatched'], stats['delivered']), (1, 1, 1))
+        self.assertEqual(stats['missed'], missed)
+        self.assertEqual(stats['lateness']['count'], 1)
+        self.assertEqual(stats['sinks']['callback']['sent'], 1)
+        self.assertEqual(stats['recent'][-1]['results']['callback']['status'], 'sent')
+
+        service.reset_stats()
+        self.assertEqual(service.stats()['dispatched'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
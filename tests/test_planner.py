@@ -0,0 +1,112 @@
+"""Tests de la planification sur plusieurs semaines (services/planner.py), sans base de données"""
+
+import unittest
+from datetime import date, timedelta
+
+from services import planner
+from services.planning_profile import PlanningProfile
+
+# Lundi de référence
+MONDAY = date(2030, 1, 7)
+
+def course(course_id, name, day, start, end):
+    """Cours au format du modèle Course"""
+    return {
+        'id': course_id, 'name': name, 'day_of_week': day,
+        'start_time': start, 'end_time': end, 'week_date': MONDAY,
+        'needs_revision': False
+    }
+
+def homework(homework_id, subject, due_date, sessions=1):
+    """Devoir au format du modèle Homework"""
+    return {
+        'id': homework_id, 'subject': subject, 'due_date': due_date,
+        'due_time': '08:00', 'estimated_sessions': sessions
+    }
+
+def subject(name, priority=1, total_hours=0):
+    """Matière d'apprentissage au format du modèle LearningSubject"""
+    return {'name': name, 'priority': priority, 'total_hours': total_hours,
+            'last_studied': None}
+
+def of_type(result, activity_type):
+    """Créneaux d'un type donné"""
+    return [entry for entry in result.entries if entry[3] == activity_type]
+
+class PlanRangeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = PlanningProfile.default()
+        self.courses = [
+            course(1, 'Archi', 'Lundi', '14:00', '18:00'),
+            course(2, 'Réseaux', 'Mercredi', '08:00', '10:00')
+        ]
+        self.subjects = [subject('Python', 2), subject('Anglais', 1)]
+
+    def plan(self, weeks=1, homework_list=(), revisions=()):
+        return planner.plan_range(
+            MONDAY, weeks, self.courses, list(homework_list), list(revisions),
+            self.subjects, self.profile
+        )
+
+    def test_courses_are_placed_on_their_day(self):
+        result = self.plan()
+        self.assertEqual(
+            sorted((entry[0], entry[4]) for entry in of_type(result, 'course')),
+            [(MONDAY, 'Archi'), (MONDAY + timedelta(days=2), 'Réseaux')]
+        )
+        self.assertEqual(len(result.days), 7)
+
+    def test_no_activity_overlaps_a_course(self):
+        result = self.plan()
+        busy = planner.CourseIndex(self.courses)
+        for entry in result.entries:
+            if entry[3] == 'course':
+                continue
+            start = planner.time_to_minutes(entry[1])
+            end = planner.time_to_minutes(entry[2])
+            for course_start, course_end in busy.busy(entry[0]):
+                self.assertFalse(start < course_end and course_start < end, entry)
+
+    def test_homework_sessions_before_due_date(self):
+        due = MONDAY + timedelta(days=3)
+        result = self.plan(homework_list=[homework(1, 'TP IP', due, 3)])
+        sessions = of_type(result, 'homework')
+        self.assertEqual(len(sessions), 3)
+        self.assertTrue(all(entry[0] <= due for entry in sessions))
+        self.assertEqual(sessions[-1][5], "Préparation devoir: TP IP (3/3)")
+
+    def test_revisions_placed_monday_to_thursday(self):
+        old = dict(course(9, 'Ancien', 'Lundi', '08:00', '10:00'), week_date=MONDAY - timedelta(days=21))
+        result = self.plan(revisions=[old])
+        revisions = of_type(result, 'revision')
+        self.assertEqual(len(revisions), 1)
+        self.assertLess(revisions[0][0].weekday(), 4)
+        self.assertEqual(result.revised_course_ids, [9])
+
+    def test_learning_follows_priorities(self):
+        result = self.plan()
+        hours = result.study_hours
+        self.assertAlmostEqual(sum(hours.values()), len(of_type(result, 'learning'))
+                               * self.profile.session_duration / 60)
+        self.assertGreater(hours['Python'], hours['Anglais'])
+
+    def test_homework_due_next_week_prepared_this_week(self):
+        due = MONDAY + timedelta(days=7)
+        result = self.plan(weeks=2, homework_list=[homework(1, 'TP IP', due, 2)])
+        sessions = of_type(result, 'homework')
+        self.assertEqual(len(sessions), 2)
+        self.assertTrue(all(MONDAY + timedelta(days=4) <= entry[0] < due for entry in sessions))
+
+    def test_week_course_becomes_revision_later(self):
+        result = self.plan(weeks=3)
+        revisions = of_type(result, 'revision')
+        self.assertEqual(sorted(set(result.revised_course_ids)), [1, 2])
+        threshold = timedelta(days=self.profile.revision_threshold_days)
+        self.assertTrue(all(entry[0] >= MONDAY + threshold for entry in revisions))
+
+    def test_deterministic(self):
+        self.assertEqual(self.plan(weeks=2).entries, self.plan(weeks=2).entries)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests du pool de connexions (database/pool.py)"""
+
+import threading
+import time
+import unittest
+
+from database.pool import ConnectionPool, PoolTimeout
+
+class FakeConnection:
+    """Connexion factice : ne fait que mémoriser sa fermeture"""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.created = []
+
+    def factory(self):
+        conn = FakeConnection(len(self.created))
+        self.created.append(conn)
+        return conn
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool(self.factory, min_size=3, max_size=2)
+        with self.assertRaises(ValueError):
+            ConnectionPool(self.factory, min_size=0, max_size=0)
+
+    def test_min_size_opened_upfront(self):
+        pool = ConnectionPool(self.factory, min_size=2, max_size=4)
+        self.assertEqual(len(self.created), 2)
+        self.assertEqual(pool.stats()['idle'], 2)
+
+    def test_connections_are_reused(self):
+        pool = ConnectionPool(self.factory, min_size=0, max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(len(self.created), 1)
+
+    def test_timeout_when_exhausted(self):
+        pool = ConnectionPool(self.factory, min_size=0, max_size=1, acquire_timeout=0.05)
+        pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_waiter_gets_released_connection(self):
+        pool = ConnectionPool(self.factory, min_size=0, max_size=1, acquire_timeout=2)
+        conn = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        time.sleep(0.05)
+        pool.release(conn)
+        waiter.join(2)
+        self.assertEqual(acquired, [conn])
+        self.assertEqual(pool.stats()['waits'], 1)
+
+    def test_discard_closes_and_frees_a_place(self):
+        pool = ConnectionPool(self.factory, min_size=0, max_size=1, acquire_timeout=0.05)
+        conn = pool.acquire()
+        pool.release(conn, discard=True)
+        self.assertTrue(conn.closed)
+        self.assertIsNot(pool.acquire(), conn)
+
+    def test_idle_connections_closed_above_min_size(self):
+        pool = ConnectionPool(self.factory, min_size=1, max_size=3, idle_timeout=0)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        pool.acquire()
+        self.assertEqual(sum(conn.closed for conn in self.created), 1)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_validate_after_ping_interval(self):
+        validated = []
+        pool = ConnectionPool(self.factory, min_size=0, max_size=1, ping_interval=0,
+                              validate=lambda conn: validated.append(conn) or True)
+        conn = pool.acquire()
+        pool.release(conn)
+        pool.acquire()
+        self.assertEqual(validated, [conn])
+        self.assertEqual(pool.stats()['reconnects'], 1)
+
+    def test_closed_pool_refuses_acquire(self):
+        pool = ConnectionPool(self.factory, min_size=1, max_size=1)
+        pool.close_all()
+        self.assertTrue(self.created[0].closed)
+        with self.assertRaises(Exception):
+            pool.acquire()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests du cache de requêtes (database/query_cache.py et DatabaseManager)"""
+
+import time
+import unittest
+
+from tests import reset_database
+from database.db_manager import DatabaseManager
+from database.query_cache import QueryCache, is_select, tables_read, tables_written
+
+SUBJECTS = "SELECT name FROM learning_subjects WHERE priority = %s ORDER BY name"
+
+class TableParsingTest(unittest.TestCase):
+
+    def test_tables(self):
+        self.assertEqual(
+            tables_read("SELECT * FROM homework h JOIN `courses` c ON c.id = h.id"),
+            frozenset(['homework', 'courses'])
+        )
+        self.assertEqual(tables_written("UPDATE schedule_slots SET notified = 1"),
+                         frozenset(['schedule_slots']))
+        self.assertEqual(tables_written("INSERT IGNORE INTO plan_cache VALUES (1)"),
+                         frozenset(['plan_cache']))
+        self.assertEqual(tables_written("SELECT 1"), frozenset())
+        self.assertTrue(is_select("  select * from courses"))
+
+class QueryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = QueryCache(max_entries=2, ttl=30)
+        self.tables = frozenset(['courses'])
+
+    def test_hit_returns_copy(self):
+        key = QueryCache.make_key("SELECT * FROM courses", None)
+        self.cache.put(key, [{'id': 1}], self.tables)
+        rows = self.cache.get(key)
+        rows[0]['id'] = 99
+        self.assertEqual(self.cache.get(key), [{'id': 1}])
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_invalidation_by_table(self):
+        key = QueryCache.make_key("SELECT * FROM courses", None)
+        self.cache.put(key, [{'id': 1}], self.tables)
+        self.cache.invalidate(['homework'])
+        self.assertIsNotNone(self.cache.get(key))
+        self.cache.invalidate(['courses'])
+        self.assertIsNone(self.cache.get(key))
+
+    def test_stale_generation_not_stored(self):
+        key = QueryCache.make_key("SELECT * FROM courses", None)
+        generation = self.cache.generation()
+        self.cache.invalidate(['courses'])
+        self.cache.put(key, [{'id': 1}], self.tables, generation)
+        self.assertIsNone(self.cache.get(key))
+
+    def test_lru_eviction(self):
+        keys = [QueryCache.make_key("SELECT * FROM courses", (n,)) for n in range(3)]
+        self.cache.put(keys[0], [], self.tables)
+        self.cache.put(keys[1], [], self.tables)
+        self.cache.get(keys[0])
+        self.cache.put(keys[2], [], self.tables)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_expiration(self):
+        cache = QueryCache(ttl=0.01)
+        key = QueryCache.make_key("SELECT * FROM courses", None)
+        cache.put(key, [], self.tables)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+class DatabaseManagerCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+
+    def test_read_through_and_invalidation_on_write(self):
+        hits = DatabaseManager.cache_stats()['hits']
+        first = DatabaseManager.execute_query(SUBJECTS, (1,), fetch=True)
+        DatabaseManager.execute_query(SUBJECTS, (1,), fetch=True)
+        self.assertEqual(DatabaseManager.cache_stats()['hits'], hits + 1)
+
+        DatabaseManager.execute_query("UPDATE learning_subjects SET priority = 2 WHERE name = %s",
+                                      ('PHP',))
+        after = DatabaseManager.execute_query(SUBJECTS, (1,), fetch=True)
+        self.assertEqual(len(after), len(first) - 1)
+
+    def test_transaction_bypasses_cache(self):
+        DatabaseManager.execute_query(SUBJECTS, (1,), fetch=True)
+        with DatabaseManager.transaction():
+            DatabaseManager.execute_query("DELETE FROM learning_subjects WHERE name = %s", ('PHP',))
+            inside = DatabaseManager.execute_query(SUBJECTS, (1,), fetch=True)
+        self.assertNotIn('PHP', [row['name'] for row in inside])
+        after = DatabaseManager.execute_query(SUBJECTS, (1,), fetch=True)
+        self.assertNotIn('PHP', [row['name'] for row in after])
+
+    def test_cache_false_skips_cache(self):
+        DatabaseManager.execute_query(SUBJECTS, (1,), fetch=True, cache=False)
+        DatabaseManager.execute_query(SUBJECTS, (1,), fetch=True, cache=False)
+        self.assertEqual(DatabaseManager.cache_stats()['entries'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
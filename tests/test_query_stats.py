@@ -0,0 +1,103 @@
+"""Tests de l'instrumentation des requêtes (database/query_stats.py, database/memo.py)"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from tests import reset_database
+from database.db_manager import DatabaseManager
+from database.memo import BoundedMemo
+from database.query_stats import QueryStats, fingerprint, percentile
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_literals_and_placeholders(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM homework  WHERE id = 12 AND subject = 'Maths' -- x\n"),
+            fingerprint("SELECT * FROM homework WHERE id = %s AND subject = %s")
+        )
+
+    def test_lists_are_folded(self):
+        self.assertEqual(
+            fingerprint("DELETE FROM schedule_slots WHERE id IN (%s, %s, %s)"),
+            "DELETE FROM schedule_slots WHERE id IN (...)"
+        )
+        self.assertEqual(
+            fingerprint("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)"),
+            fingerprint("INSERT INTO t (a, b) VALUES (%s, %s)")
+        )
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile([], 0.95), 0.0)
+
+class BoundedMemoTest(unittest.TestCase):
+
+    def test_computed_once_and_bounded(self):
+        calls = []
+        memo = BoundedMemo(lambda key: calls.append(key) or key.upper(), max_entries=2)
+        self.assertEqual(memo('a'), 'A')
+        self.assertEqual(memo('a'), 'A')
+        self.assertEqual(calls, ['a'])
+        memo('b')
+        memo('c')
+        self.assertLessEqual(len(memo), 2)
+
+class QueryStatsTest(unittest.TestCase):
+
+    def test_aggregates_by_fingerprint(self):
+        stats = QueryStats(slow_query_ms=1000)
+        stats.record("SELECT * FROM courses WHERE id = 1", None, 0.010, rows=1, acquire=0.001)
+        stats.record("SELECT * FROM courses WHERE id = 2", None, 0.030, rows=1)
+        stats.record("SELECT * FROM courses WHERE id = 3", None, 0.020, error=True)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['total_calls'], 3)
+        query = snapshot['queries'][0]
+        self.assertEqual((query['calls'], query['errors'], query['rows']), (3, 1, 2))
+        self.assertEqual(query['max_ms'], 30.0)
+        self.assertEqual(query['p50_ms'], 20.0)
+        self.assertEqual(query['acquire_max_ms'], 1.0)
+
+    def test_slow_queries_are_logged(self):
+        stats = QueryStats(slow_query_ms=5, log_params=True)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            stats.record("SELECT * FROM homework WHERE id = %s", (4,), 0.001)
+            stats.record("SELECT * FROM homework WHERE id = %s", (7,), 0.050)
+        self.assertEqual(stats.snapshot()['slow_queries'], 1)
+        self.assertIn("Requête lente", output.getvalue())
+        self.assertIn("(7,)", output.getvalue())
+
+    def test_reset(self):
+        stats = QueryStats()
+        stats.record("SELECT 1 FROM courses", None, 0.001)
+        stats.reset()
+        self.assertEqual(stats.snapshot()['queries'], [])
+
+class DatabaseManagerStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+        DatabaseManager.reset_stats()
+
+    def test_queries_are_recorded(self):
+        for _ in range(3):
+            DatabaseManager.execute_query(
+                "SELECT name FROM learning_subjects WHERE priority = %s", (1,),
+                fetch=True, cache=False
+            )
+        queries = {q['query']: q for q in DatabaseManager.stats()['queries']}
+        entry = queries["SELECT name FROM learning_subjects WHERE priority = ?"]
+        self.assertEqual(entry['calls'], 3)
+        self.assertEqual(entry['rows'], 3 * 8)
+
+    def test_failed_query_is_counted(self):
+        with self.assertRaises(Exception):
+            DatabaseManager.execute_query("SELECT * FROM missing_table", fetch=True)
+        entry = DatabaseManager.stats()['queries'][0]
+        self.assertEqual(entry['errors'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Tests de la re-planification partielle (Scheduler.regenerate_days, SQLite en mémoire)"""
+
+import unittest
+from datetime import date, timedelta
+
+from tests import reset_database
+from database.db_manager import DatabaseManager
+from models.course import Course
+from models.homework import Homework
+from models.learning import LearningSubject
+from services import planner
+from services.scheduler import Scheduler
+from services.slot_writer import SlotWriter
+
+# Lundi de référence (calcul pur)
+MONDAY = date(2030, 1, 7)
+
+def next_monday():
+    """Lundi à venir (regenerate_days ignore les jours passés)"""
+    today = date.today()
+    return today + timedelta(days=7 - today.weekday())
+
+def all_slots():
+    """Tous les créneaux, par date et heure"""
+    return DatabaseManager.execute_query(
+        "SELECT * FROM schedule_slots ORDER BY date, start_time", fetch=True, cache=False
+    )
+
+def homework(homework_id, subject, due_date, sessions=1):
+    """Devoir au format du modèle Homework"""
+    return {
+        'id': homework_id, 'subject': subject, 'due_date': due_date,
+        'due_time': '08:00', 'estimated_sessions': sessions
+    }
+
+class AssignPlacedSessionsTest(unittest.TestCase):
+
+    def test_same_subject_homework_not_confused(self):
+        first = homework(1, 'Maths', MONDAY + timedelta(days=2), 2)
+        second = homework(2, 'Maths', MONDAY + timedelta(days=4), 2)
+        sessions = [
+            (MONDAY, 'Maths'), (MONDAY, 'Maths'),
+            (MONDAY + timedelta(days=1), 'Maths'), (MONDAY + timedelta(days=3), 'Maths'),
+            (MONDAY, 'Anglais')
+        ]
+        self.assertEqual(
+            planner.assign_placed_sessions(sessions, [second, first], 3),
+            [1, 1, 2, 2, None]
+        )
+
+    def test_past_due_homework_is_skipped(self):
+        late = homework(1, 'Maths', MONDAY)
+        sessions = [(MONDAY + timedelta(days=1), 'Maths')]
+        self.assertEqual(planner.assign_placed_sessions(sessions, [late], 3), [None])
+
+class RegenerateDaysTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+        self.monday = next_monday()
+        Course.add_course('Archi', 'Lundi', '14:00', '18:00', self.monday.isoformat())
+        Scheduler.generate_schedule_range(self.monday, 2)
+
+    def test_unchanged_inputs_keep_other_slots(self):
+        days = [self.monday, self.monday + timedelta(days=1)]
+        before = all_slots()
+        Scheduler.regenerate_days(days)
+        after = all_slots()
+        self.assertEqual(
+            [row for row in after if row['date'] not in days],
+            [row for row in before if row['date'] not in days]
+        )
+        # Seule la répartition des matières peut changer sur ces jours
+        self.assertEqual(
+            [row for row in after if row['activity_type'] != 'learning'],
+            [row for row in before if row['activity_type'] != 'learning']
+        )
+
+    def test_study_time_matches_learning_slots(self):
+        Scheduler.regenerate_days([self.monday + timedelta(days=2)])
+        hours = SlotWriter.learning_hours(all_slots())
+        for subject in LearningSubject.get_subject_states():
+            self.assertAlmostEqual(
+                float(subject['total_hours'] or 0), hours.get(subject['name'], 0)
+            )
+
+    def test_new_homework_only_touches_affected_days(self):
+        due = self.monday + timedelta(days=9)
+        Homework.add_homework('TP IP', 'desc', due.isoformat(), '08:00', 3, 2)
+        affected = Scheduler.affected_dates_for_homework(
+            {'due_date': due, 'preparation_days': 3}
+        )
+        untouched = [
+            row for row in all_slots() if row['date'] not in affected
+        ]
+
+        Scheduler.regenerate_days(affected)
+
+        slots = all_slots()
+        sessions = [row for row in slots if row['activity_type'] == 'homework']
+        self.assertEqual(len(sessions), 2)
+        self.assertTrue(all(row['date'] in affected and row['date'] <= due for row in sessions))
+        self.assertEqual([row for row in slots if row['date'] not in affected], untouched)
+
+    def test_homework_own_preparation_window(self):
+        for days in (6, 1):
+            due = self.monday + timedelta(days=9)
+            homework_id = Homework.add_homework(f'TP {days}', 'desc', due.isoformat(), '08:00', days)
+            affected = Scheduler.affected_dates_for_homework(
+                {'due_date': due, 'preparation_days': days}
+            )
+            self.assertEqual(affected[0], due - timedelta(days=days))
+            Scheduler.regenerate_days(affected)
+            sessions = [row for row in all_slots() if row['subject'] == f'TP {days}']
+            # Première session au premier jour de la fenêtre du devoir
+            self.assertEqual([row['date'] for row in sessions], [affected[0]])
+            Homework.delete_homework(homework_id)
+
+    def test_homework_sessions_are_not_planned_twice(self):
+        due = self.monday + timedelta(days=9)
+        Homework.add_homework('TP IP', 'desc', due.isoformat(), '08:00', 3, 2)
+        Scheduler.regenerate_days([due - timedelta(days=3), due - timedelta(days=2)])
+        Scheduler.regenerate_days([due - timedelta(days=1), due])
+        sessions = [row for row in all_slots() if row['activity_type'] == 'homework']
+        self.assertEqual(len(sessions), 2)
+
+    def test_course_entered_with_a_later_week_date(self):
+        # week_date n'est pas forcément le lundi : cours du lundi saisi avec le mercredi
+        Course.add_course('Maths', 'Lundi', '08:00', '10:00',
+                          (self.monday + timedelta(days=2)).isoformat())
+        Scheduler.generate_schedule_range(self.monday, 2)
+        Scheduler.regenerate_days([self.monday])
+
+        day = [row for row in all_slots() if row['date'] == self.monday]
+        self.assertIn('Maths', [row['subject'] for row in day if row['activity_type'] == 'course'])
+        for row in day:
+            if row['activity_type'] != 'course':
+                start = planner.time_to_minutes(row['start_time'])
+                end = planner.time_to_minutes(row['end_time'])
+                self.assertFalse(start < 10 * 60 and 8 * 60 < end, row)
+
+    def test_ignores_past_and_unplanned_days(self):
+        self.assertEqual(Scheduler.regenerate_days([date.today() - timedelta(days=1)]), 0)
+        self.assertEqual(Scheduler.regenerate_days([self.monday + timedelta(days=30)]), 0)
+
+if __name__ == '__main__':
+    unittest.main()
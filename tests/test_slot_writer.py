@@ -0,0 +1,81 @@
+"""Tests de l'écriture différentielle des créneaux (services/slot_writer.py, SQLite en mémoire)"""
+
+import unittest
+from datetime import date, time, timedelta
+
+from tests import reset_database
+from database.db_manager import DatabaseManager
+from services.slot_writer import SlotWriter
+
+def next_monday():
+    """Lundi à venir"""
+    today = date.today()
+    return today + timedelta(days=7 - today.weekday())
+
+def all_slots():
+    """Tous les créneaux, par date et heure"""
+    return DatabaseManager.execute_query(
+        "SELECT * FROM schedule_slots ORDER BY date, start_time", fetch=True, cache=False
+    )
+
+class SlotWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+        self.day = next_monday()
+
+    def test_apply_writes_only_differences(self):
+        with DatabaseManager.transaction():
+            SlotWriter.apply([], [
+                (self.day, time(8), time(9), 'learning', 'Python', 'Apprentissage: Python'),
+                (self.day, time(10), time(11), 'learning', 'Anglais', 'Apprentissage: Anglais'),
+                (self.day, time(12), time(13), 'learning', 'SQL', 'Apprentissage: SQL')
+            ])
+        before = {row['subject']: row['id'] for row in all_slots()}
+
+        with DatabaseManager.transaction():
+            existing = SlotWriter.load_dates([self.day])
+            report = SlotWriter.apply(existing, [
+                (self.day, time(8), time(9), 'learning', 'Python', 'Apprentissage: Python'),
+                (self.day, time(10), time(11, 30), 'learning', 'Anglais', 'Apprentissage: Anglais'),
+                (self.day, time(14), time(15), 'learning', 'Docker', 'Apprentissage: Docker')
+            ])
+
+        self.assertEqual(report, {'inserted': 1, 'updated': 1, 'deleted': 1, 'unchanged': 1})
+        after = {row['subject']: row for row in all_slots()}
+        self.assertEqual(sorted(after), ['Anglais', 'Docker', 'Python'])
+        # Les créneaux conservés gardent leur id
+        self.assertEqual(after['Python']['id'], before['Python'])
+        self.assertEqual(after['Anglais']['id'], before['Anglais'])
+
+    def test_notified_state_kept_for_unchanged_slots(self):
+        entry = (self.day, time(8), time(9), 'learning', 'Python', 'Apprentissage: Python')
+        with DatabaseManager.transaction():
+            SlotWriter.apply([], [entry])
+        DatabaseManager.execute_query("UPDATE schedule_slots SET notified = TRUE")
+        with DatabaseManager.transaction():
+            report = SlotWriter.apply(SlotWriter.load_dates([self.day]), [entry])
+        self.assertEqual(report['unchanged'], 1)
+        self.assertTrue(all_slots()[0]['notified'])
+
+    def test_learning_hours(self):
+        slots = [
+            {'activity_type': 'learning', 'subject': 'Python', 'start_time': time(8), 'end_time': time(9, 30)},
+            {'activity_type': 'learning', 'subject': 'Python', 'start_time': time(10), 'end_time': time(11)},
+            {'activity_type': 'course', 'subject': 'Archi', 'start_time': time(14), 'end_time': time(18)}
+        ]
+        self.assertEqual(SlotWriter.learning_hours(slots), {'Python': 2.5})
+
+    def test_apply_removes_duplicates(self):
+        entry = (self.day, time(8), time(9), 'learning', 'Python', 'Apprentissage: Python')
+        with DatabaseManager.transaction():
+            SlotWriter.apply([], [entry, entry])
+        self.assertEqual(len(all_slots()), 2)
+
+        with DatabaseManager.transaction():
+            report = SlotWriter.apply(SlotWriter.load_dates([self.day]), [entry])
+        self.assertEqual(report['deleted'], 1)
+        self.assertEqual(len(all_slots()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests du backend SQLite embarqué (database/backends/sqlite.py)"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, time
+
+from tests import reset_database
+import config
+from database.db_manager import DatabaseManager
+from models.learning import LearningSubject
+
+class SQLiteBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+
+    def test_new_database_has_default_subjects(self):
+        names = sorted(subject['name'] for subject in LearningSubject.get_all_subjects())
+        self.assertEqual(names, sorted(config.LEARNING_SUBJECTS))
+
+    def test_schema_replay_keeps_subject_changes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        path = os.path.join(directory, 'planner.db')
+        previous = config.SQLITE_CONFIG['path']
+        config.SQLITE_CONFIG['path'] = path
+        self.addCleanup(config.SQLITE_CONFIG.__setitem__, 'path', previous)
+
+        DatabaseManager.close_pool()
+        DatabaseManager.execute_query("DELETE FROM learning_subjects WHERE name = %s", ('PHP',))
+        # Redémarrage : le schéma est rejoué sur la base existante
+        DatabaseManager.close_pool()
+        DatabaseManager.clear_cache()
+        names = [subject['name'] for subject in LearningSubject.get_all_subjects()]
+        self.assertEqual(len(names), len(config.LEARNING_SUBJECTS) - 1)
+        self.assertNotIn('PHP', names)
+        DatabaseManager.close_pool()
+
+    def test_learner_database_has_default_subjects(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        previous = config.LEARNER_CONFIG['sqlite_path']
+        config.LEARNER_CONFIG['sqlite_path'] = os.path.join(directory, '{learner}.db')
+        self.addCleanup(config.LEARNER_CONFIG.__setitem__, 'sqlite_path', previous)
+
+        with DatabaseManager.use_learner('alice'):
+            self.assertEqual(len(LearningSubject.get_subject_states()),
+                             len(config.LEARNING_SUBJECTS))
+
+    def test_types_and_translated_functions(self):
+        DatabaseManager.execute_query(
+            "INSERT INTO schedule_slots (date, start_time, end_time, activity_type, subject) "
+            "VALUES (%s, %s, %s, 'learning', 'Python')",
+            (date(2030, 1, 7), time(8), time(9, 30))
+        )
+        row = DatabaseManager.execute_query(
+            "SELECT date, start_time, TIMESTAMPDIFF(MINUTE, start_time, end_time) AS minutes, "
+            "DATE_ADD(date, INTERVAL 7 DAY) AS next_week FROM schedule_slots",
+            fetch=True, cache=False
+        )[0]
+        self.assertEqual(row['date'], date(2030, 1, 7))
+        self.assertEqual(row['minutes'], 90)
+        self.assertEqual(str(row['next_week']), '2030-01-14')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Tests de la lecture en flux (DatabaseManager.stream_query)"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests import reset_database
+import config
+from database.db_manager import DatabaseManager
+from models.learning import LearningSubject
+
+SUBJECTS = "SELECT name FROM learning_subjects ORDER BY id"
+
+class StreamQueryTest(unittest.TestCase):
+
+    def setUp(self):
+        reset_database()
+
+    def test_rows_in_batches(self):
+        names = [row['name'] for row in DatabaseManager.stream_query(SUBJECTS, batch_size=3)]
+        self.assertEqual(names, config.LEARNING_SUBJECTS)
+
+    def test_no_transaction_while_suspended(self):
+        stream = LearningSubject.stream_all_subjects(batch_size=2)
+        next(stream)
+        self.assertFalse(DatabaseManager.in_transaction())
+        # Les requêtes du consommateur passent par le cache, hors transaction
+        DatabaseManager.execute_query(SUBJECTS, fetch=True)
+        DatabaseManager.execute_query(SUBJECTS, fetch=True)
+        self.assertGreaterEqual(DatabaseManager.cache_stats().get('hits', 0), 1)
+        self.assertEqual(len(list(stream)), len(config.LEARNING_SUBJECTS) - 1)
+
+    def test_writes_during_iteration_are_committed(self):
+        for row in DatabaseManager.stream_query(SUBJECTS, batch_size=1):
+            with DatabaseManager.transaction():
+                DatabaseManager.execute_query(
+                    "UPDATE learning_subjects SET priority = 2 WHERE name = %s", (row['name'],)
+                )
+        priorities = DatabaseManager.execute_query(
+            "SELECT DISTINCT priority FROM learning_subjects", fetch=True, cache=False
+        )
+        self.assertEqual(priorities, [{'priority': 2}])
+
+    def test_abandoned_stream_leaves_no_transaction(self):
+        stream = DatabaseManager.stream_query(SUBJECTS, batch_size=1)
+        next(stream)
+        stream.close()
+        self.assertFalse(DatabaseManager.in_transaction())
+
+    def test_use_learner_during_iteration(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        previous = config.LEARNER_CONFIG['sqlite_path']
+        config.LEARNER_CONFIG['sqlite_path'] = os.path.join(directory, '{learner}.db')
+        self.addCleanup(config.LEARNER_CONFIG.__setitem__, 'sqlite_path', previous)
+
+        counts = []
+        for _ in DatabaseManager.stream_query(SUBJECTS, batch_size=4):
+            with DatabaseManager.use_learner('alice'):
+                counts.append(len(LearningSubject.get_subject_states()))
+        self.assertEqual(counts, [len(config.LEARNING_SUBJECTS)] * len(config.LEARNING_SUBJECTS))
+
+    def test_errors_are_reported(self):
+        with self.assertRaises(Exception):
+            list(DatabaseManager.stream_query("SELECT * FROM missing_table"))
+        self.assertFalse(DatabaseManager.in_transaction())
+
+if __name__ == '__main__':
+    unittest.main()
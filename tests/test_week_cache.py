@@ -0,0 +1,139 @@
+"""Tests du cache des semaines affichées (gui/week_cache.py)"""
+
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+
+try:
+    from gui.week_cache import WeekCache
+except ImportError:
+    # Le paquet gui importe customtkinter
+    WeekCache = None
+
+# Lundi de référence
+MONDAY = date(2030, 1, 7)
+
+def week(offset):
+    """Lundi à `offset` semaines de MONDAY"""
+    return MONDAY + timedelta(days=7 * offset)
+
+@unittest.skipIf(WeekCache is None, "customtkinter n'est pas installé (paquet gui)")
+class WeekCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loaded = []
+        self.lock = threading.Lock()
+
+    def loader(self, week_start):
+        with self.lock:
+            self.loaded.append(week_start)
+        return {'week': week_start, 'count': len(self.loaded)}
+
+    def wait_prefetched(self, cache, count):
+        """Attend que le thread de préchargement ait rangé `count` semaines"""
+        deadline = time.monotonic() + 2
+        while cache.stats()['prefetched'] < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache.stats()['prefetched'], count)
+
+    def test_get_loads_once(self):
+        cache = WeekCache(self.loader)
+        first = cache.get(MONDAY)
+        self.assertIs(cache.get(MONDAY), first)
+        self.assertEqual(self.loaded, [MONDAY])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_put_replaces(self):
+        cache = WeekCache(self.loader)
+        cache.get(MONDAY)
+        cache.put(MONDAY, {'week': MONDAY, 'count': 0})
+        self.assertEqual(cache.get(MONDAY)['count'], 0)
+        self.assertEqual(self.loaded, [MONDAY])
+
+    def test_least_recently_used_evicted(self):
+        cache = WeekCache(self.loader, capacity=2)
+        cache.get(week(0))
+        cache.get(week(1))
+        cache.get(week(0))
+        cache.get(week(2))
+        self.assertEqual(cache.stats()['entries'], 2)
+        cache.get(week(0))
+        cache.get(week(1))
+        self.assertEqual(self.loaded, [week(0), week(1), week(2), week(1)])
+
+    def test_prefetch_neighbours(self):
+        cache = WeekCache(self.loader, prefetch_weeks=2)
+        cache.get(MONDAY)
+        cache.prefetch(MONDAY)
+        self.wait_prefetched(cache, 4)
+        self.assertEqual(sorted(self.loaded),
+                         [week(-2), week(-1), week(0), week(1), week(2)])
+        # La semaine suivante est servie sans chargement
+        cache.get(week(1))
+        self.assertEqual(len(self.loaded), 5)
+
+    def test_prefetch_skips_cached_weeks(self):
+        cache = WeekCache(self.loader)
+        for offset in (-1, 0, 1):
+            cache.get(week(offset))
+        cache.prefetch(MONDAY)
+        self.assertEqual(len(self.loaded), 3)
+
+    def test_invalidate_period(self):
+        cache = WeekCache(self.loader)
+        for offset in range(3):
+            cache.get(week(offset))
+        # Du mercredi de la semaine 1 au lundi de la semaine 2 (exclu)
+        cache.invalidate(week(1) + timedelta(days=2), week(2))
+        self.assertEqual(cache.stats()['invalidated'], 1)
+        cache.get(week(0))
+        cache.get(week(2))
+        self.assertEqual(len(self.loaded), 3)
+        cache.get(week(1))
+        self.assertEqual(len(self.loaded), 4)
+
+    def test_invalidate_all(self):
+        cache = WeekCache(self.loader)
+        cache.get(week(0))
+        cache.get(week(1))
+        cache.invalidate()
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_load_started_before_invalidation_not_stored(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_loader(week_start):
+            if not started.is_set():
+                started.set()
+                release.wait(2)
+                return {'week': week_start, 'stale': True}
+            return {'week': week_start, 'stale': False}
+
+        cache = WeekCache(slow_loader)
+        cache.prefetch(MONDAY)
+        self.assertTrue(started.wait(2))
+        # Planning regénéré pendant le chargement de la semaine suivante
+        cache.invalidate(week(-1), week(2))
+        release.set()
+        deadline = time.monotonic() + 2
+        while cache._queued and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(cache.get(week(1))['stale'])
+        self.assertFalse(cache.get(week(-1))['stale'])
+
+    def test_prefetch_error_does_not_stop_thread(self):
+        def flaky_loader(week_start):
+            if week_start == week(-1):
+                raise OSError("base indisponible")
+            return self.loader(week_start)
+
+        cache = WeekCache(flaky_loader)
+        cache.prefetch(MONDAY)
+        self.wait_prefetched(cache, 1)
+        cache.prefetch(week(3))
+        self.wait_prefetched(cache, 3)
+
+if __name__ == '__main__':
+    unittest.main()